@@ -0,0 +1,86 @@
+"""
+Benchmark EGA REST API clients against a local `MockEGAServer`, with
+injected latency and errors, comparing the thread-pooled RESTClient with
+the asyncio AsyncRESTClient at increasing concurrency. Usage:
+
+    python bench/client_retries.py [--lookups N] [--latency S]
+        [--error-rate P]
+"""
+import asyncio
+import logging
+import time
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+
+from graflipy.ega.aioclient import AsyncRESTClient
+from graflipy.ega.client import RESTClient
+from graflipy.ega.mockserver import MockEGAServer
+from graflipy.ega.schema_1_5_0 import AddSchema
+
+CONCURRENCY = (1, 4, 16, 64)
+USER = 'ega-box-bench'
+
+
+def threaded(server, accessions, concurrency, backoff):
+    """
+    Returns (seconds, RequestStats) of RESTClient lookups from a thread pool
+    """
+    client = RESTClient(USER, password='x', endpoint=server.url,
+                        pool_size=concurrency, backoff=backoff)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(
+            lambda accession: client.retrieve_metadata(
+                AddSchema.ANALYSIS, accession),
+            accessions))
+    return time.perf_counter() - start, client.stats
+
+
+async def concurrent(server, accessions, concurrency, backoff):
+    """
+    Returns (seconds, RequestStats) of AsyncRESTClient lookups
+    """
+    async with AsyncRESTClient(USER, password='x', endpoint=server.url,
+                               concurrency=concurrency,
+                               backoff=backoff) as client:
+        start = time.perf_counter()
+        async for _ in client.retrieve_many(AddSchema.ANALYSIS, accessions):
+            pass
+        return time.perf_counter() - start, client.stats
+
+
+def main():
+    """
+    Print a table of lookup throughput and retries per client and
+    concurrency
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    parser.add_argument('--backoff', type=float, default=0.01)
+    args = parser.parse_args()
+    # silence per-retry warnings
+    logging.basicConfig(level=logging.ERROR)
+    with MockEGAServer(latency=args.latency, error_rate=args.error_rate,
+                       error_routes={'lookup'}, seed=0) as server:
+        accessions = [server.register('ANALYSIS', f'bench-{i}')
+                      for i in range(args.lookups)]
+        print(f'{"client":8} {"concurrency":>11} {"lookups/s":>10} '
+              f'{"requests":>9} {"retries":>8} {"max (ms)":>9}')
+        for concurrency in CONCURRENCY:
+            for name, (seconds, stats) in (
+                    ('threads', threaded(server, accessions, concurrency,
+                                         args.backoff)),
+                    ('asyncio', asyncio.run(concurrent(
+                        server, accessions, concurrency, args.backoff)))):
+                print(f'{name:8} {concurrency:11} '
+                      f'{len(accessions) / seconds:10.1f} '
+                      f'{stats.requests:9} {stats.retries:8} '
+                      f'{stats.max_seconds * 1000:9.1f}')
+        print(server.stats.summary())
+
+
+if __name__ == '__main__':
+    main()
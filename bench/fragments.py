@@ -0,0 +1,131 @@
+"""
+Benchmark writing a synthetic ANALYSIS.xml with `SetWriter`, with and
+without a `FragmentCache` for the REFERENCE_ALIGNMENT shared by every
+analysis on the same reference assembly, checking that the output is
+identical. Reports the CPU seconds of writing. Usage:
+
+    python bench/fragments.py [--analyses N] [--sequences N] [--repeat N]
+"""
+import io
+import time
+
+from argparse import ArgumentParser
+
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+
+from graflipy.ega.schema_1_5_0 import (ANALYSISXSD,
+                                       AnalysisFileType,
+                                       AnalysisFileTypeChecksumMethod,
+                                       AnalysisFileTypeFiletype,
+                                       AnalysisSet,
+                                       AnalysisType,
+                                       AttributeType,
+                                       ReferenceAssemblyType,
+                                       ReferenceSequenceType)
+from graflipy.ega.serialize import FragmentCache, SetWriter
+
+XMLCONF = SerializerConfig(pretty_print=True,
+                           no_namespace_schema_location=ANALYSISXSD)
+
+
+def reference_alignment(sequences):
+    """
+    Returns ReferenceSequenceType shared by every analysis, as
+    `metadata.reference_index` builds it
+    """
+    return ReferenceSequenceType(
+        assembly=ReferenceAssemblyType(
+            standard=ReferenceAssemblyType.Standard(
+                accession='GCA_000001405.1')),
+        sequence=[ReferenceSequenceType.Sequence(
+            accession=f'CM{663 + i:06d}.1', label=f'chr{i + 1}')
+                  for i in range(sequences)])
+
+
+def analysis(serial, refalign):
+    """
+    Returns AnalysisType shaped like those of `metadata.analysis_refalign`
+    """
+    return AnalysisType(
+        alias=f'bam-{serial}',
+        title=f'{serial}.bam',
+        description='aligned reads',
+        study_ref=AnalysisType.StudyRef(accession='EGAS00000000001'),
+        sample_ref=[AnalysisType.SampleRef(label='rg1,rg2',
+                                           refname=f'sample-{serial}')],
+        analysis_type=AnalysisType.AnalysisType(
+            reference_alignment=refalign),
+        files=AnalysisType.Files(file=[AnalysisFileType(
+            filename=f'dir/{serial}.bam.gpg',
+            filetype=AnalysisFileTypeFiletype.BAM,
+            checksum_method=AnalysisFileTypeChecksumMethod.MD5,
+            checksum='0' * 32, unencrypted_checksum='f' * 32)]),
+        analysis_attributes=AnalysisType.AnalysisAttributes(
+            analysis_attribute=[
+                AttributeType(tag='NOTE', value='Aligned & sorted <bench>'),
+                AttributeType(tag='Reference', value='GRCh37')]))
+
+
+class Discard(io.TextIOBase):
+    """
+    Text buffer that drops everything written
+    """
+
+    def write(self, text):
+        return len(text)
+
+
+def write(analyses, fragments, out):
+    """
+    Write ANALYSIS.xml to `out` with SetWriter
+    """
+    with SetWriter(out, AnalysisSet, XMLCONF, fragments) as writer:
+        for item in analyses:
+            writer.write(item)
+
+
+def cpu_seconds(analyses, fragments_factory, repeat):
+    """
+    Returns best CPU seconds of writing `analyses`
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.process_time()
+        write(analyses, fragments_factory(), Discard())
+        seconds.append(time.process_time() - start)
+    return min(seconds)
+
+
+def main():
+    """
+    Print CPU time with and without the fragment cache
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--analyses', type=int, default=2000)
+    parser.add_argument('--sequences', type=int, default=84,
+                        help='sequences per reference, e.g. 84 for '
+                        'GRCh37 with decoys, 195 for GRCh38 primary')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    refalign = reference_alignment(args.sequences)
+    analyses = [analysis(serial, refalign)
+                for serial in range(args.analyses)]
+
+    def cached():
+        return FragmentCache([ReferenceSequenceType])
+
+    plain, spliced = io.StringIO(), io.StringIO()
+    write(analyses, None, plain)
+    write(analyses, cached(), spliced)
+    if plain.getvalue() != spliced.getvalue():
+        raise AssertionError('output with fragments differs')
+    print(f'{"fragments":10} {"cpu (s)":>9} {"analyses/s":>11}')
+    results = {}
+    for name, factory in (('none', lambda: None), ('cached', cached)):
+        seconds = results[name] = cpu_seconds(analyses, factory, args.repeat)
+        print(f'{name:10} {seconds:9.3f} {len(analyses) / seconds:11,.0f}')
+    print(f'speedup: {results["none"] / results["cached"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark import time of the EGA command-line entry points, comparing lazy
+loading of `graflipy.ega.schema_1_5_0` against importing every generated
+submodule up front as the package used to.
+
+Each measurement is made in a fresh interpreter. Usage:
+
+    python bench/import_time.py [--repeat N]
+"""
+import statistics
+import subprocess
+import sys
+
+from argparse import ArgumentParser
+
+ENTRY_POINTS = (
+    'graflipy.cli.ega_analysisxml',
+    'graflipy.cli.ega_datasetxml',
+    'graflipy.cli.ega_samplexml',
+    'graflipy.cli.ega_submitxml',
+    'graflipy.cli.ega_updatedb',
+    'graflipy.ega.client',
+)
+EAGER = ('import graflipy.ega.schema_1_5_0 as schema\n'
+         'for name in schema.__all__:\n'
+         '    getattr(schema, name)\n')
+TIMED = ('import time\n'
+         'start = time.perf_counter()\n'
+         '{preload}'
+         'import {module}\n'
+         'print(time.perf_counter() - start)\n')
+
+
+def import_seconds(module, eager, repeat):
+    """
+    Returns median wall-clock seconds to import `module` in a new interpreter
+    """
+    code = TIMED.format(preload=EAGER if eager else '', module=module)
+    return statistics.median(
+        float(subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True).stdout)
+        for _ in range(repeat))
+
+
+def main():
+    """
+    Print a table of eager vs lazy import times per entry point
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(f'{"module":40} {"eager (ms)":>12} {"lazy (ms)":>12}')
+    for module in ENTRY_POINTS:
+        eager = import_seconds(module, True, args.repeat)
+        lazy = import_seconds(module, False, args.repeat)
+        print(f'{module:40} {eager * 1000:12.1f} {lazy * 1000:12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark the peak memory of building a synthetic ANALYSIS_SET for 10k
+bams, comparing the slotted schema dataclasses against otherwise identical
+dataclasses with a per-instance `__dict__`.
+
+The REFERENCE_ALIGNMENT is either shared by every analysis, as
+`metadata.analysis_refalign` builds it, or built per analysis, as parsing
+an ANALYSIS.xml does. Usage:
+
+    python bench/memory.py [--analyses N] [--sequences N]
+"""
+import dataclasses
+import gc
+import tracemalloc
+
+from argparse import ArgumentParser
+
+from graflipy.ega.schema_1_5_0 import (AnalysisFileType,
+                                       AnalysisFileTypeChecksumMethod,
+                                       AnalysisFileTypeFiletype,
+                                       AnalysisSet,
+                                       AnalysisType,
+                                       AttributeType,
+                                       ReferenceAssemblyType,
+                                       ReferenceSequenceType)
+
+SLOTTED = {cls.__qualname__: cls for cls in (
+    AnalysisFileType, AnalysisSet, AnalysisType, AnalysisType.AnalysisType,
+    AnalysisType.AnalysisAttributes, AnalysisType.Files,
+    AnalysisType.SampleRef, AnalysisType.StudyRef, AttributeType,
+    ReferenceAssemblyType, ReferenceAssemblyType.Standard,
+    ReferenceSequenceType, ReferenceSequenceType.Sequence)}
+
+
+def unslotted(cls):
+    """
+    Returns a dataclass with the fields of `cls` and a per-instance
+    `__dict__`, i.e. `cls` as it was generated before slots
+    """
+    return dataclasses.make_dataclass(cls.__name__, [
+        (field.name, field.type, dataclasses.field(
+            default=field.default, default_factory=field.default_factory,
+            metadata=field.metadata))
+        for field in dataclasses.fields(cls)])
+
+
+def refalign(classes, sequences):
+    """
+    Returns a REFERENCE_ALIGNMENT ReferenceSequenceType
+    """
+    sequence = classes['ReferenceSequenceType.Sequence']
+    return classes['ReferenceSequenceType'](
+        assembly=classes['ReferenceAssemblyType'](
+            standard=classes['ReferenceAssemblyType.Standard'](
+                accession='GCA_000001405.1')),
+        sequence=[sequence(accession=f'CM{663 + i:06d}.1', label=f'chr{i + 1}')
+                  for i in range(sequences)])
+
+
+def analysisset(classes, analyses, sequences, shared):
+    """
+    Returns ANALYSIS_SET of `analyses` analyses shaped like those of
+    `metadata.analysis_refalign`
+    """
+    analysis = classes['AnalysisType']
+    attribute = classes['AttributeType']
+    reference = refalign(classes, sequences) if shared else None
+    items = []
+    for serial in range(analyses):
+        items.append(analysis(
+            alias=f'bam-{serial}',
+            title=f'{serial}.bam',
+            description='aligned reads',
+            study_ref=classes['AnalysisType.StudyRef'](
+                accession='EGAS00000000001'),
+            sample_ref=[classes['AnalysisType.SampleRef'](
+                label='rg1,rg2', refname=f'sample-{serial}')],
+            analysis_type=classes['AnalysisType.AnalysisType'](
+                reference_alignment=(
+                    reference or refalign(classes, sequences))),
+            files=classes['AnalysisType.Files'](file=[
+                classes['AnalysisFileType'](
+                    filename=f'dir/{serial}.bam.gpg',
+                    filetype=AnalysisFileTypeFiletype.BAM,
+                    checksum_method=AnalysisFileTypeChecksumMethod.MD5,
+                    checksum=f'{serial:032x}',
+                    unencrypted_checksum=f'{serial:032d}')]),
+            analysis_attributes=classes['AnalysisType.AnalysisAttributes'](
+                analysis_attribute=[
+                    attribute(tag='NOTE', value='bench'),
+                    attribute(tag='LibraryCaptureKit',
+                              value='SureSelect Human All Exon V5'),
+                    attribute(tag='SequencingPlatform',
+                              value='Illumina HiSeq 2500'),
+                    attribute(tag='ReferenceSpecies',
+                              value='Homo sapiens'),
+                    attribute(tag='Reference', value='GRCh37')])))
+    return classes['AnalysisSet'](analysis=items)
+
+
+def peak_bytes(*args):
+    """
+    Returns peak bytes allocated while building the analysis set
+    """
+    gc.collect()
+    tracemalloc.start()
+    setobj = analysisset(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del setobj
+    return peak
+
+
+def main():
+    """
+    Print peak MiB of each class variant for each reference shape
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--analyses', type=int, default=10000)
+    parser.add_argument('--sequences', type=int, default=84)
+    args = parser.parse_args()
+    dicts = {name: unslotted(cls) for name, cls in SLOTTED.items()}
+    variants = (('__dict__', dicts), ('slots', SLOTTED))
+    print(f'{"classes":16} {"shared ref (MiB)":>17} '
+          f'{"per-analysis ref (MiB)":>23}')
+    for name, classes in variants:
+        shared, unshared = (
+            peak_bytes(classes, args.analyses, args.sequences, shape)
+            / 2 ** 20 for shape in (True, False))
+        print(f'{name:16} {shared:17.1f} {unshared:23.1f}')
+
+
+if __name__ == '__main__':
+    main()
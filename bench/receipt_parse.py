@@ -0,0 +1,94 @@
+"""
+Benchmark summarizing a large RECEIPT with the single-pass
+`ReceiptSummary.parse` against binding it to the generated
+`sra_receipt.Receipt` dataclasses with xsdata's XmlParser and building the
+same alias to accession maps. Usage:
+
+    python bench/receipt_parse.py [--objects N] [--repeat N]
+"""
+import statistics
+import time
+
+from argparse import ArgumentParser
+from collections import Counter
+
+from xsdata.formats.dataclass.parsers import XmlParser
+
+from graflipy.ega.receipt import ReceiptSummary
+from graflipy.ega.schema_1_5_0 import Receipt
+
+ID = ('  <{tag} accession="{prefix}{serial:011d}" alias="{tag}-{serial}" '
+      'status="PRIVATE"/>\n')
+
+
+def receipt_xml(objects):
+    """
+    Returns bytes of a successful RECEIPT for `objects` analyses and as many
+    samples
+    """
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<RECEIPT receiptDate="2021-03-03T12:00:00.000Z" '
+             'submissionFile="submission.xml" success="true">\n']
+    for tag, prefix in (('ANALYSIS', 'EGAZ'), ('SAMPLE', 'EGAN')):
+        parts += [ID.format(tag=tag, prefix=prefix, serial=serial)
+                  for serial in range(objects)]
+    parts.append('  <SUBMISSION accession="EGAB00000000001" alias="bench"/>\n'
+                 '  <MESSAGES>\n'
+                 + ''.join(f'    <INFO>added {serial}</INFO>\n'
+                           for serial in range(objects)) +
+                 '  </MESSAGES>\n'
+                 '  <ACTIONS>ADD</ACTIONS>\n'
+                 '</RECEIPT>\n')
+    return ''.join(parts).encode()
+
+
+def xsdata_summary(data):
+    """
+    Bind the receipt with xsdata and build the ReceiptSummary maps from it
+    """
+    receipt = XmlParser().from_bytes(data, Receipt)
+    accessions, statuses = {}, Counter()
+    for tag in ('analysis', 'sample'):
+        accessions[tag.upper()] = {
+            ident.alias: ident.accession for ident in getattr(receipt, tag)}
+        statuses.update(ident.status.value for ident in getattr(receipt, tag))
+    return receipt.success, accessions, statuses, receipt.messages.info
+
+
+def seconds(func, data, repeat):
+    """
+    Returns median seconds of `func(data)`
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    """
+    Print the time taken by each approach
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    data = receipt_xml(args.objects)
+    summary = ReceiptSummary.parse(data)
+    success, accessions, statuses, infos = xsdata_summary(data)
+    assert summary.success == success
+    assert dict(summary.accessions) == {
+        **accessions, 'SUBMISSION': {'bench': 'EGAB00000000001'}}
+    assert summary.statuses == statuses and summary.infos == infos
+    fast = seconds(ReceiptSummary.parse, data, args.repeat)
+    slow = seconds(xsdata_summary, data, args.repeat)
+    print(f'{len(data) / 1e6:.1f} MB receipt, {2 * args.objects} objects')
+    print(f'{"ReceiptSummary.parse":24} {fast * 1000:10.1f} ms')
+    print(f'{"xsdata XmlParser":24} {slow * 1000:10.1f} ms')
+    print(f'{"speedup":24} {slow / fast:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
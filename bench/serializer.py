@@ -0,0 +1,123 @@
+"""
+Benchmark rendering a synthetic ANALYSIS_SET and SAMPLE_SET with the
+generated writers of `SchemaSerializer` against xsdata's `XmlSerializer`,
+in elements per second, checking that the output is identical. Usage:
+
+    python bench/serializer.py [--items N] [--sequences N] [--repeat N]
+"""
+import time
+
+from argparse import ArgumentParser
+
+from lxml import etree
+from xsdata.formats.dataclass.serializers import XmlSerializer
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+
+from graflipy.ega.schema_1_5_0 import (ANALYSISXSD,
+                                       SAMPLEXSD,
+                                       AnalysisFileType,
+                                       AnalysisFileTypeChecksumMethod,
+                                       AnalysisFileTypeFiletype,
+                                       AnalysisSet,
+                                       AnalysisType,
+                                       AttributeType,
+                                       ReferenceAssemblyType,
+                                       ReferenceSequenceType,
+                                       SampleSet,
+                                       SampleType)
+from graflipy.ega.serialize import SchemaSerializer
+from graflipy.ega.xmlcontext import schema_context
+
+
+def analysis(serial, sequences):
+    """
+    Returns AnalysisType shaped like those of `metadata.analysis`
+    """
+    return AnalysisType(
+        alias=f'bam-{serial}',
+        title=f'{serial}.bam',
+        description='aligned reads',
+        study_ref=AnalysisType.StudyRef(accession='EGAS00000000001'),
+        sample_ref=[AnalysisType.SampleRef(label='rg1,rg2',
+                                           refname=f'sample-{serial}')],
+        analysis_type=AnalysisType.AnalysisType(
+            reference_alignment=ReferenceSequenceType(
+                assembly=ReferenceAssemblyType(
+                    standard=ReferenceAssemblyType.Standard(
+                        accession='GCA_000001405.1')),
+                sequence=[ReferenceSequenceType.Sequence(
+                    accession=f'CM{663 + i:06d}.1', label=f'chr{i + 1}')
+                          for i in range(sequences)])),
+        files=AnalysisType.Files(file=[AnalysisFileType(
+            filename=f'dir/{serial}.bam.gpg',
+            filetype=AnalysisFileTypeFiletype.BAM,
+            checksum_method=AnalysisFileTypeChecksumMethod.MD5,
+            checksum='0' * 32, unencrypted_checksum='f' * 32)]),
+        analysis_attributes=AnalysisType.AnalysisAttributes(
+            analysis_attribute=[
+                AttributeType(tag='NOTE', value='Aligned & sorted <bench>'),
+                AttributeType(tag='Reference', value='GRCh37')]))
+
+
+def sample(serial):
+    """
+    Returns SampleType shaped like those of `metadata.sample`
+    """
+    return SampleType(
+        alias=f'sample-{serial}',
+        sample_name=SampleType.SampleName(
+            taxon_id=9606, scientific_name='Homo sapiens',
+            common_name='human'),
+        description='blood',
+        sample_attributes=SampleType.SampleAttributes(sample_attribute=[
+            AttributeType(tag='Sample ID', value=f'S{serial}'),
+            AttributeType(tag='gender', value='female')]))
+
+
+def best_seconds(func, repeat):
+    """
+    Returns the minimum wall-clock seconds of `repeat` calls of `func`
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """
+    Print elements per second of each serializer for each set
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--sequences', type=int, default=25)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    sets = (
+        ('ANALYSIS_SET', ANALYSISXSD, AnalysisSet(analysis=[
+            analysis(serial, args.sequences)
+            for serial in range(args.items)])),
+        ('SAMPLE_SET', SAMPLEXSD, SampleSet(sample=[
+            sample(serial) for serial in range(args.items)])),
+    )
+    print(f'{"set":14} {"elements":>9} {"xsdata (el/s)":>15} '
+          f'{"generated (el/s)":>17} {"speedup":>8}')
+    for name, xsd, setobj in sets:
+        config = SerializerConfig(pretty_print=True,
+                                  no_namespace_schema_location=xsd)
+        xsdata = XmlSerializer(context=schema_context(), config=config)
+        generated = SchemaSerializer(config)
+        expected = xsdata.render(setobj)
+        if generated.render(setobj) != expected:
+            raise AssertionError(f'{name} output differs from xsdata')
+        elements = sum(1 for _ in etree.fromstring(expected.encode()).iter())
+        slow = best_seconds(lambda: xsdata.render(setobj), args.repeat)
+        fast = best_seconds(lambda: generated.render(setobj), args.repeat)
+        print(f'{name:14} {elements:9} {elements / slow:15,.0f} '
+              f'{elements / fast:17,.0f} {slow / fast:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark the latency of the first XML render in a new process, i.e. the
+cost of building xsdata's binding metadata for the schema classes, with a
+fresh `XmlContext` per serializer against the shared `schema_context()`
+loaded from its on-disk cache, and rebuilding that cache.
+
+Each measurement is made in a fresh interpreter with its own cache
+directory. Usage:
+
+    python bench/xmlcontext.py [--repeat N]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from argparse import ArgumentParser
+
+SETUP = '''
+import time
+from xsdata.formats.dataclass.serializers import XmlSerializer
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+from graflipy.ega.schema_1_5_0 import (
+    AnalysisFileType, AnalysisFileTypeChecksumMethod,
+    AnalysisFileTypeFiletype, AnalysisSet, AnalysisType, AddSchema,
+    AttributeType, ReferenceAssemblyType, ReferenceSequenceType, Submission,
+    SubmissionSet, SubmissionType)
+from graflipy.ega.xmlcontext import schema_context
+
+ACTION = SubmissionType.Actions.Action
+analyses = AnalysisSet(analysis=[AnalysisType(
+    alias='bam-1', title='1.bam', description='aligned reads',
+    study_ref=AnalysisType.StudyRef(accession='EGAS00000000001'),
+    sample_ref=[AnalysisType.SampleRef(label='rg1', refname='sample-1')],
+    analysis_type=AnalysisType.AnalysisType(
+        reference_alignment=ReferenceSequenceType(
+            assembly=ReferenceAssemblyType(
+                standard=ReferenceAssemblyType.Standard(
+                    accession='GCA_000001405.1')),
+            sequence=[ReferenceSequenceType.Sequence(
+                accession='CM000663.1', label='chr1')])),
+    files=AnalysisType.Files(file=[AnalysisFileType(
+        filename='dir/1.bam.gpg', filetype=AnalysisFileTypeFiletype.BAM,
+        checksum_method=AnalysisFileTypeChecksumMethod.MD5,
+        checksum='0' * 32, unencrypted_checksum='f' * 32)]),
+    analysis_attributes=AnalysisType.AnalysisAttributes(
+        analysis_attribute=[AttributeType(tag='NOTE', value='bench')]))])
+submissions = SubmissionSet(submission=[Submission(
+    alias='bench', actions=SubmissionType.Actions(action=[
+        ACTION(add=ACTION.Add(source='ANALYSIS.xml',
+                              schema=AddSchema.ANALYSIS))]))])
+config = SerializerConfig(pretty_print=True)
+start = time.perf_counter()
+'''
+MODES = {
+    'xsdata': 'context = None\n',
+    'cached': 'context = schema_context()\n',
+}
+TIMED = '''
+for obj in (analyses, submissions):
+    serializer = (XmlSerializer(context=context, config=config) if context
+                  else XmlSerializer(config=config))
+    serializer.render(obj)
+print(time.perf_counter() - start)
+'''
+
+
+def first_render_seconds(mode, cachedir, repeat, warm):
+    """
+    Returns median wall-clock seconds from creating the context to the end
+    of the first render of an ANALYSIS_SET and a SUBMISSION_SET
+
+    Args:
+        mode: key of MODES
+        cachedir: XDG_CACHE_HOME for the subprocess
+        repeat: int number of processes to time
+        warm: bool whether to populate the cache before timing
+    """
+    env = dict(os.environ, XDG_CACHE_HOME=cachedir)
+    code = SETUP + MODES[mode] + TIMED
+    if warm:
+        subprocess.run([sys.executable, '-c', SETUP + MODES['cached']],
+                       check=True, env=env)
+    times = []
+    for _ in range(repeat):
+        if not warm:
+            cache = os.path.join(cachedir, 'graflipy', 'xmlcontext.pickle')
+            if os.path.exists(cache):
+                os.remove(cache)
+        times.append(float(subprocess.run(
+            [sys.executable, '-c', code], check=True, capture_output=True,
+            text=True, env=env).stdout))
+    return statistics.median(times)
+
+
+def main():
+    """
+    Print the first-render latency of each mode
+    """
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as cachedir:
+        results = (
+            ('fresh XmlContext', first_render_seconds(
+                'xsdata', cachedir, args.repeat, False)),
+            ('schema_context, cached', first_render_seconds(
+                'cached', cachedir, args.repeat, True)),
+            ('schema_context, rebuilt', first_render_seconds(
+                'cached', cachedir, args.repeat, False)),
+        )
+    print(f'{"context":28} {"first render (ms)":>18}')
+    for name, seconds in results:
+        print(f'{name:28} {seconds * 1000:18.1f}')
+
+
+if __name__ == '__main__':
+    main()
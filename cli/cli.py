@@ -2,12 +2,16 @@
 """
 Convenient base class for building command-line interfaces
 """
+import cProfile
+import importlib
+import json
 import logging
 import logging.config
 import sys
 
 from abc import ABC, abstractmethod
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser, FileType
+from pathlib import Path
 
 from pyhocon.exceptions import ConfigMissingException
 
@@ -17,6 +21,7 @@ from graflipy.exceptions import NotifiableError
 
 LOGCONF = logconf.LOGCONF['filelog_1']
 LOGGER = logging.getLogger(__name__)
+MSG_PROFILE = 'profile written to %s'
 
 
 class CLI(ABC):
@@ -55,6 +60,17 @@ class CLI(ABC):
             choices=logging._levelToName.values(),
             default=LOGCONF['handlers']['stderr']['level'],
             help='set the stderr handler logging level')
+        self.parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='write a JSON summary of the time spent in database '
+            'queries, bam and md5 reads, XML serialization and HTTP requests '
+            'to [log file stem].profile.json')
+        self.parser.add_argument(
+            '--profile-pstats',
+            action='store_true',
+            help='as --profile, and also run under cProfile and write the '
+            'stats to [log file stem].pstats')
 
     def _run(self, cmdline):
         """
@@ -70,12 +86,15 @@ class CLI(ABC):
         sys.argv, call `self.work` and finally call sys.exit
         """
         args = self.parser.parse_args()
+        # --profile-pstats implies --profile
+        args.profile = args.profile or args.profile_pstats
         LOGCONF['handlers']['file']['filename'] = args.log_file.name
         LOGCONF['handlers']['file']['level'] = args.log_file_level
         LOGCONF['handlers']['stderr']['level'] = args.log_stderr_level
         logging.config.dictConfig(LOGCONF)
         LOGGER.info(sys.argv)
         exit_code = 0
+        profiler = self._start_profile(args)
         try:
             self.work(args)
         # 'expected' Exceptions don't need trace; log as ERROR
@@ -86,10 +105,49 @@ class CLI(ABC):
             LOGGER.exception(ex)
             exit_code = 1
         finally:
+            if args.profile:
+                self._write_profile(args, profiler)
             LOGGER.info('%s exit_code: %s', self.owner, exit_code)
             args.log_file.close()
         sys.exit(exit_code)
 
+    @staticmethod
+    def _start_profile(args):
+        """
+        If profiling was requested, install the instrumentation timers and
+        start cProfile if requested
+
+        Returns:
+            Optional[cProfile.Profile]
+        """
+        if not args.profile:
+            return None
+        # imported only when needed, to keep it out of normal start up
+        importlib.import_module('graflipy.ega.instrument').install()
+        if not args.profile_pstats:
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    @staticmethod
+    def _write_profile(args, profiler):
+        """
+        Write the instrumentation summary, and cProfile stats if any,
+        alongside the log file
+        """
+        instrument = importlib.import_module('graflipy.ega.instrument')
+        stem = Path(args.log_file.name).with_suffix('')
+        summary_path = stem.with_suffix('.profile.json')
+        summary_path.write_text(
+            json.dumps(instrument.summary(), indent=2) + '\n')
+        LOGGER.info(MSG_PROFILE, summary_path)
+        if profiler is not None:
+            profiler.disable()
+            stats_path = stem.with_suffix('.pstats')
+            profiler.dump_stats(stats_path)
+            LOGGER.info(MSG_PROFILE, stats_path)
+
     @abstractmethod
     def configure_parser(self):
         """
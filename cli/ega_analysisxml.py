@@ -1,16 +1,20 @@
 """
 Prepare ANALYSIS.xml metadata describing bams transferred to EGA.
 """
-from argparse import FileType
+from contextlib import nullcontext
 
-from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 
 from graflipy import configure
 from graflipy.cli import CLI
 from graflipy.ega import study_accession
-from graflipy.ega.metadata import analysisset
-from graflipy.ega.schema_1_5_0 import ANALYSISXSD
+from graflipy.ega.checksums import CHECKSUM_JOBS
+from graflipy.ega.headercache import DEFAULT_CACHE, open_cache
+from graflipy.ega.metadata import iter_analyses
+from graflipy.ega.schema_1_5_0 import (ANALYSISXSD,
+                                       AnalysisSet,
+                                       ReferenceSequenceType)
+from graflipy.ega.serialize import FragmentCache, SetWriter, atomic_output
 from graflipy.envconf import ENVS
 from graflipy.reference import ReferenceAssembly
 
@@ -35,13 +39,18 @@ class EGAAnalysisXML(CLI):
                                  action='append', metavar='PATH',
                                  help='path to original (unencrypted) bam: '
                                  'specify multiple times for multiple bams')
-        self.parser.add_argument('-o', '--output', type=FileType('w'),
-                                 metavar='PATH', default=default_output,
-                                 help='use - for stdout')
-        self.parser.add_argument('--checksum-files-dir', required=True,
-                                 metavar='PATH',
-                                 help='directory containing the [bam].md5 and '
-                                 '[bam].gpg.md5 files for all input bams')
+        self.parser.add_argument('-o', '--output', metavar='PATH',
+                                 default=default_output,
+                                 help='use - for stdout. The file is only '
+                                 'written if all the analyses are')
+        checksums = self.parser.add_mutually_exclusive_group(required=True)
+        checksums.add_argument('--checksum-files-dir', metavar='PATH',
+                               help='directory containing the [bam].md5 and '
+                               '[bam].gpg.md5 files for all input bams')
+        checksums.add_argument('--checksum-manifest', metavar='PATH',
+                               help='md5sum-format file listing checksums of '
+                               'all input bams and their .gpg files, or the '
+                               '.jsonl manifest written by ega_prepare')
         self.parser.add_argument('--ega-submission-dir', required=True,
                                  metavar='PATH',
                                  help='directory at EGA box into which the '
@@ -59,18 +68,46 @@ class EGAAnalysisXML(CLI):
                                  'This option may be useful to build scaffold '
                                  'metadata for hand-editing when bams are not '
                                  'in the database.')
+        self.parser.add_argument('-j', '--jobs', type=int, default=1,
+                                 metavar='N',
+                                 help='number of bam headers to read '
+                                 'concurrently')
+        self.parser.add_argument('--db-jobs', type=int, default=1,
+                                 metavar='N',
+                                 help='number of bulk database queries to '
+                                 'run concurrently')
+        self.parser.add_argument('--checksum-jobs', type=int,
+                                 default=CHECKSUM_JOBS, metavar='N',
+                                 help='number of bams whose [bam].md5 and '
+                                 '[bam].gpg.md5 files are read concurrently '
+                                 'from --checksum-files-dir')
+        self.parser.add_argument('--no-header-cache', action='store_true',
+                                 help='always read bam headers from the bams '
+                                 'rather than from the header cache at '
+                                 f'{DEFAULT_CACHE}')
 
     def work(self, args):
         configure(args.environment, 'READONLY')
-        xmlobj = analysisset(
-            args.paths,
-            args.checksum_files_dir,
-            args.study_ref_accession,
-            args.ega_submission_dir,
-            (args.no_db_reference and ReferenceAssembly.fromstr(
-                args.no_db_reference)),
-            args.include_accessioned)
-        XmlSerializer(config=XMLCONF).write(args.output, xmlobj)
+        header_cache = None if args.no_header_cache else open_cache()
+        with header_cache or nullcontext():
+            analyses = iter_analyses(
+                args.paths,
+                args.checksum_files_dir or args.checksum_manifest,
+                args.study_ref_accession,
+                args.ega_submission_dir,
+                (args.no_db_reference and ReferenceAssembly.fromstr(
+                    args.no_db_reference)),
+                args.include_accessioned,
+                args.jobs,
+                header_cache,
+                args.db_jobs,
+                args.checksum_jobs)
+            # REFERENCE_ALIGNMENT is shared by all analyses on a reference
+            fragments = FragmentCache([ReferenceSequenceType])
+            with atomic_output(args.output) as output, SetWriter(
+                    output, AnalysisSet, XMLCONF, fragments) as writer:
+                for analysis in analyses:
+                    writer.write(analysis)
 
 
 def main():
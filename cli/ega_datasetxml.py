@@ -4,14 +4,14 @@ at EGA
 """
 from argparse import FileType
 
-from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 
 from graflipy.cli import CLI
 from graflipy.ega import analysis_accession, policy_accession
 from graflipy.ega.metadata import dataset_analysisref, datasets
+from graflipy.ega.receipt import tag_attribute
 from graflipy.ega.schema_1_5_0 import DATASETXSD
-from graflipy.util import get_tag_attribute
+from graflipy.ega.serialize import SchemaSerializer
 
 XMLCONF = SerializerConfig(pretty_print=True,
                            no_namespace_schema_location=DATASETXSD)
@@ -31,7 +31,7 @@ class EGADatasetXML(CLI):
         self.parser.epilog = ('Either --analysis-receipt or a list of '
                               '--analysis accessions may be specified')
         inputs = self.parser.add_mutually_exclusive_group(required=True)
-        inputs.add_argument('-x', '--analysis-receipt', type=FileType('r'),
+        inputs.add_argument('-x', '--analysis-receipt', type=FileType('rb'),
                             metavar='PATH',
                             help='the receipt XML from an analysis submission '
                             'containing ANALYSIS elements with accession='
@@ -63,7 +63,7 @@ class EGADatasetXML(CLI):
                             help='required if --icgc is not specified')
 
     def work(self, args):
-        analyses = (args.analyses or get_tag_attribute(
+        analyses = (args.analyses or tag_attribute(
             args.analysis_receipt, 'ANALYSIS', 'accession'))
         xmlobj = datasets([
             dataset_analysisref(
@@ -75,7 +75,7 @@ class EGADatasetXML(CLI):
                 args.icgc
             )
         ])
-        XmlSerializer(config=XMLCONF).write(args.output, xmlobj)
+        SchemaSerializer(XMLCONF).write(args.output, xmlobj)
 
 
 def main():
@@ -0,0 +1,76 @@
+"""
+Serve a local stand-in for the EGA REST API, for testing clients without
+network access.
+"""
+import json
+import logging
+
+from graflipy.cli import CLI
+from graflipy.ega.mockserver import MockEGAServer
+
+LOGGER = logging.getLogger(__name__)
+MSG_SERVING = 'serving EGA REST API stand-in at %s'
+MSG_STATS = 'request counts: %s'
+ROUTES = ('login', 'logout', 'submit', 'lookup')
+
+
+class EGAMockServer(CLI):
+    """
+    Serve a local stand-in for the EGA REST API, for testing clients without
+    network access. Pass the printed URL as the client endpoint. Objects
+    added by submissions are kept in memory until the server stops.
+    """
+
+    def configure_parser(self):
+        """
+        Configure `self.parser` with required args
+        """
+        self.parser.add_argument('--host', default='127.0.0.1',
+                                 help='address to listen on')
+        self.parser.add_argument('--port', type=int, default=8080,
+                                 help='port to listen on')
+        self.parser.add_argument('--latency', type=float, default=0.0,
+                                 metavar='SECONDS',
+                                 help='delay every response')
+        self.parser.add_argument('--jitter', type=float, default=0.0,
+                                 metavar='SECONDS',
+                                 help='max extra random delay per response')
+        self.parser.add_argument('--error-rate', type=float, default=0.0,
+                                 metavar='P',
+                                 help='probability of answering a request '
+                                 'with --error-status')
+        self.parser.add_argument('--error-status', type=int, default=503,
+                                 help='HTTP status of injected errors')
+        self.parser.add_argument('--error-route', action='append',
+                                 dest='error_routes', choices=ROUTES,
+                                 help='inject errors only on this route: '
+                                 'specify multiple times for multiple routes')
+        self.parser.add_argument('--seed', type=int,
+                                 help='random seed for jitter and errors')
+
+    def work(self, args):
+        server = MockEGAServer(
+            host=args.host,
+            port=args.port,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            error_routes=args.error_routes and set(args.error_routes),
+            seed=args.seed)
+        LOGGER.info(MSG_SERVING, server.url)
+        print(server.url, flush=True)
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+            LOGGER.info(MSG_STATS, json.dumps(server.stats.summary()))
+
+
+def main():
+    """
+    Run as a command-line script
+    """
+    EGAMockServer().run()
@@ -0,0 +1,60 @@
+"""
+Checksum, encrypt and checksum files for transfer to EGA.
+"""
+from argparse import FileType
+
+from graflipy.cli import CLI
+from graflipy.ega.prepare import DEFAULT_KEY_ID, Manifest, prepare_files
+
+
+class EGAPrepare(CLI):
+    """
+    Checksum, encrypt and checksum files for transfer to EGA. Writes
+    [file].gpg, [file].md5 and [file].gpg.md5 for each input file to the
+    output directory.
+    """
+
+    def configure_parser(self):
+        """
+        Configure `self.parser` with required args
+        """
+        self.parser.epilog = ('Either --file-list or a list of --input paths '
+                              'may be specified')
+        inputs = self.parser.add_mutually_exclusive_group(required=True)
+        inputs.add_argument('-i', '--input', action='append', dest='paths',
+                            metavar='PATH',
+                            help='path to original (unencrypted) file: '
+                            'specify multiple times for multiple files')
+        inputs.add_argument('-f', '--file-list', type=FileType('r'),
+                            metavar='PATH',
+                            help='file containing a list of paths to '
+                            'original files, one per line')
+        self.parser.add_argument('-o', '--output-dir', required=True,
+                                 metavar='PATH',
+                                 help='directory for the gpg and md5 files')
+        self.parser.add_argument('-k', '--key-id', default=DEFAULT_KEY_ID,
+                                 help='id of public key to encrypt with (must '
+                                 'be in the gpg keyring and trusted)')
+        self.parser.add_argument('-j', '--jobs', type=int, default=1,
+                                 metavar='N',
+                                 help='number of files to prepare '
+                                 'concurrently')
+        self.parser.add_argument('-m', '--manifest', metavar='PATH',
+                                 help='JSON lines file recording the progress '
+                                 'and checksums of each file. If it exists, '
+                                 'files it shows as already prepared are '
+                                 'skipped. Use as --checksum-manifest for '
+                                 'ega_analysisxml.')
+
+    def work(self, args):
+        paths = args.paths or [
+            line.strip() for line in args.file_list if line.strip()]
+        prepare_files(paths, args.output_dir, args.key_id, args.jobs,
+                      args.manifest and Manifest(args.manifest))
+
+
+def main():
+    """
+    Run as a command-line script
+    """
+    EGAPrepare().run()
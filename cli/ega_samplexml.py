@@ -3,15 +3,15 @@ Prepare SAMPLE.xml metadata describing samples used in submitted analyses.
 """
 from argparse import FileType
 
-from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 
 from graflipy import configure
 from graflipy.cli import CLI
 from graflipy.ega.metadata import sampleset
+from graflipy.ega.receipt import tag_attribute
 from graflipy.ega.schema_1_5_0 import SAMPLEXSD
+from graflipy.ega.serialize import SchemaSerializer
 from graflipy.envconf import ENVS
-from graflipy.util import get_tag_attribute
 
 XMLCONF = SerializerConfig(pretty_print=True,
                            no_namespace_schema_location=SAMPLEXSD)
@@ -33,7 +33,7 @@ class EGASampleXML(CLI):
                                  choices=ENVS)
         inputs = self.parser.add_mutually_exclusive_group(required=True)
         inputs.add_argument('-x', '--analysis-xml', metavar='PATH',
-                            type=FileType('r'),
+                            type=FileType('rb'),
                             help='prepared ANALYSIS.xml file, containing '
                             'SAMPLE_REF elements with refname="<uuid>"')
         inputs.add_argument('-s', '--sample', action='append', dest='samples',
@@ -47,10 +47,10 @@ class EGASampleXML(CLI):
 
     def work(self, args):
         configure(args.environment, 'READONLY')
-        samples = (args.samples or get_tag_attribute(
+        samples = (args.samples or tag_attribute(
             args.analysis_xml, 'SAMPLE_REF', 'refname'))
         xmlobj = sampleset(samples, args.include_accessioned)
-        XmlSerializer(config=XMLCONF).write(args.output, xmlobj)
+        SchemaSerializer(XMLCONF).write(args.output, xmlobj)
 
 
 def main():
@@ -3,12 +3,26 @@ Submit metadata to EGA, with either ADD or VALIDATE action
 """
 from argparse import FileType
 
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+
 from graflipy import get_config
 from graflipy.cli import CLI
 from graflipy.ega.client import FileUpload, RESTClient
-from graflipy.ega.schema_1_5_0 import AddSchema, SubmissionType
+from graflipy.ega.planner import (iter_chunks,
+                                  iter_items,
+                                  plan_chunks,
+                                  submit_chunks)
+from graflipy.ega.schema_1_5_0 import (ANALYSISXSD,
+                                       SAMPLEXSD,
+                                       AddSchema,
+                                       AnalysisSet,
+                                       SampleSet,
+                                       SubmissionType)
 
 EGACONF = get_config().ega
+ERR_CHUNK_ALIAS = '--max-items and --max-bytes require --alias'
+ERR_CHUNK_FILES = ('--max-items and --max-bytes require exactly one of '
+                   '--schema-analysis-file or --schema-sample-file')
 ADD = SubmissionType.Actions.Action.Add
 VALIDATE = SubmissionType.Actions.Action.Validate
 
@@ -48,14 +62,36 @@ class EGASubmitXML(CLI):
         self.parser.add_argument('--test', action='store_true',
                                  help='Submit to test server; metadata is '
                                  'deleted after 24hrs')
+        self.parser.add_argument('--max-items', type=int, metavar='N',
+                                 help='split the analysis or sample set into '
+                                 'separate submissions of at most N items '
+                                 'each; the receipts are merged into one')
+        self.parser.add_argument('--max-bytes', type=int, metavar='N',
+                                 help='split the analysis or sample set into '
+                                 'separate submissions of at most N bytes '
+                                 'each; the receipts are merged into one')
+        self.parser.add_argument('-j', '--jobs', type=int, default=1,
+                                 metavar='N',
+                                 help='number of split submissions to make '
+                                 'concurrently')
 
     def work(self, args):
         if not (args.schema_analysis_file or args.schema_dataset_file or
                 args.schema_sample_file):
             self.parser.error('No schema file specified')
+        chunked = args.max_items or args.max_bytes
+        if chunked and (args.schema_dataset_file or not (
+                bool(args.schema_analysis_file) ^
+                bool(args.schema_sample_file))):
+            self.parser.error(ERR_CHUNK_FILES)
+        if chunked and not args.alias:
+            self.parser.error(ERR_CHUNK_ALIAS)
         client = RESTClient(args.ega_account,
                             password_file=args.ega_password_file.name,
                             test=args.test)
+        if chunked:
+            self.submit_chunked(client, args)
+            return
         uploads = []
         if args.schema_analysis_file:
             uploads.append(
@@ -72,6 +108,37 @@ class EGASubmitXML(CLI):
             args.alias,
             args.output)
 
+    @staticmethod
+    def submit_chunked(client, args):
+        """
+        Split the analysis or sample set and submit it in chunks
+        """
+        if args.schema_analysis_file:
+            schema, set_class, xsd = (
+                AddSchema.ANALYSIS, AnalysisSet, ANALYSISXSD)
+            setfile = args.schema_analysis_file
+        else:
+            schema, set_class, xsd = AddSchema.SAMPLE, SampleSet, SAMPLEXSD
+            setfile = args.schema_sample_file
+        # the set file is read twice, to plan the chunks and then to render
+        # each one as it is submitted, so it is never held in memory whole
+        config = SerializerConfig(pretty_print=True,
+                                  no_namespace_schema_location=xsd)
+        counts = plan_chunks(
+            iter_items(setfile.name, set_class), set_class,
+            max_items=args.max_items, max_bytes=args.max_bytes,
+            config=config)
+        chunks = iter_chunks(
+            iter_items(setfile.name, set_class), set_class, counts,
+            args.alias, setfile.name, config=config)
+        submit_chunks(
+            client,
+            schema,
+            chunks,
+            ADD if args.add else VALIDATE,
+            args.output,
+            jobs=args.jobs)
+
 
 def main():
     """
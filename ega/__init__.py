@@ -9,22 +9,28 @@ e.g.
     xsdata generate -p graflipy.ega.schema_1_5_0 \
         $workdir/schema-1.5.0/src/main/resources/uk/ac/ebi/ena/sra/schema
 
-`*XSD` locations are added manually to `schema_x_y_z/__init__.py`
+The generated imports in `schema_x_y_z/__init__.py` are rewritten manually as
+a table of submodule names for lazy loading, and `*XSD` locations are added.
 """
+import importlib.resources as pkg_resources
 import logging
 import re
 
 from argparse import ArgumentTypeError
 from pathlib import Path
-from lxml import etree
+from string import Template
+
+from rdflib import Literal
 from xsdata.formats.converter import Converter, converter
 
+import graflipy.query
 from graflipy import (ALIGNEDREADGROUPSET,
                       COLLECTEDSAMPLE,
                       AlignedReadGroupSet,
                       CollectedSample)
+from graflipy.connect import do_query, do_update
+from graflipy.ega.receipt import iter_ids
 from graflipy.exceptions import NotifiableError
-from graflipy.orm.persistence import bulk_merge
 
 
 ERR_ACCESSION_CONFLICT = '%s existing accession %s conflicts with new value %s'
@@ -34,6 +40,8 @@ LOGGER = logging.getLogger(__name__)
 MSG_ACCESSION_UPDATE = '%s egaAccession marked for update: %s'
 MSG_ACCESSION_NOT_FOUND = 'no accessions found in input'
 MSG_UPDATE_NOT_REQUIRED = 'update not required, %s already has accession %s'
+# max number of entities resolved by a single bulk query
+QUERY_CHUNK = 200
 RE_EGAANALYSIS = re.compile(r'EGAZ\d{11}')
 RE_EGAPOLICY = re.compile(r'EGAP\d{11}')
 RE_EGASTUDY = re.compile(r'EGAS\d{11}')
@@ -93,10 +101,43 @@ def study_accession(value):
     return value
 
 
+def ega_accessions(entities):
+    """
+    Fetch the `:egaAccession` of many entities from the database, using one
+    `ega_accessions.sparql` query per `QUERY_CHUNK` entities rather than
+    loading each entity
+
+    Args:
+        entities: (rdflib.URIRef, ORM class) of each entity, which is only
+            found as an instance of the ontology class of the same name
+
+    Returns:
+        dict of {iri: Optional[str] egaAccession} with an entry for each
+        entity found in the database
+    """
+    template = Template(
+        pkg_resources.read_text(graflipy.query, 'ega_accessions.sparql'))
+    entities = list(entities)
+    accessions = {}
+    for i in range(0, len(entities), QUERY_CHUNK):
+        query = template.substitute(values=' '.join(
+            f'({iri.n3()} :{cls.__name__})'
+            for iri, cls in entities[i:i + QUERY_CHUNK]))
+        for result in do_query(query):
+            accession = result.egaAccession and result.egaAccession.value
+            accessions[result.acc] = accessions.get(result.acc) or accession
+    return accessions
+
+
 def update_accessions(receiptxml):
     """
     Update the database with accessions from the EGA receipt.
 
+    The existing accessions of all the implied entities are fetched and
+    checked in bulk, and then the new accessions are added in bulk by one
+    `ega_accessions_update.sparql` update per `QUERY_CHUNK` entities, without
+    loading any entity.
+
     Args:
         receiptxml: file-like binary stream with receipt XML from a submission
             containing ANALYSIS and/or SAMPLE elements with "alias" and
@@ -107,34 +148,42 @@ def update_accessions(receiptxml):
             in the db, or an element `accession` attribute conflicts with an
             existing entity `:egaAccession` property value
     """
-    tree = etree.parse(receiptxml)
     tag_class_prefix = (
         ('SAMPLE', CollectedSample, COLLECTEDSAMPLE),
         ('ANALYSIS', AlignedReadGroupSet, ALIGNEDREADGROUPSET)
     )
-    errors, updates, found = [], [], False
-    for tag, cls, prefix in tag_class_prefix:
-        for elem in (tree.findall(f'//{tag}') or []):
-            found = True
-            alias = elem.attrib['alias']
-            accessionupdate = elem.attrib['accession']
-            iri = prefix[alias]
-            obj = cls.find(iri)
-            accessionexists = obj and obj.egaAccession
-            if not obj:
-                errors.append(ERR_NOT_FOUND % (tag, alias, iri))
-            elif accessionexists and accessionupdate != accessionexists:
-                errors.append(ERR_ACCESSION_CONFLICT %
-                              (obj, accessionexists, accessionupdate))
-            elif not accessionexists:
-                LOGGER.info(MSG_ACCESSION_UPDATE, iri, accessionupdate)
-                obj.egaAccession = accessionupdate
-                updates.append(obj)
-            else:
-                LOGGER.info(MSG_UPDATE_NOT_REQUIRED, iri, accessionexists)
+    # read the receipt in a single pass, but report by tag as before
+    ids = {tag: [] for tag, _, _ in tag_class_prefix}
+    for tag, alias, accession in iter_ids(receiptxml, ids):
+        ids[tag].append((alias, accession))
+    # (tag, cls, alias, iri, accession) of each element
+    entries = [
+        (tag, cls, alias, prefix[alias], accession)
+        for tag, cls, prefix in tag_class_prefix
+        for alias, accession in ids[tag]
+    ]
+    existing = ega_accessions({(entry[3], entry[1]) for entry in entries})
+    errors, pending = [], []
+    for tag, cls, alias, iri, accessionupdate in entries:
+        accessionexists = existing.get(iri)
+        if iri not in existing:
+            errors.append(ERR_NOT_FOUND % (tag, alias, iri))
+        elif accessionexists and accessionupdate != accessionexists:
+            errors.append(ERR_ACCESSION_CONFLICT %
+                          (iri, accessionexists, accessionupdate))
+        elif not accessionexists:
+            LOGGER.info(MSG_ACCESSION_UPDATE, iri, accessionupdate)
+            pending.append((cls, iri, accessionupdate))
+            existing[iri] = accessionupdate
+        else:
+            LOGGER.info(MSG_UPDATE_NOT_REQUIRED, iri, accessionexists)
     if errors:
         raise AccessionUpdateError('\n'.join(errors))
-    if updates:
-        bulk_merge(updates)
-    elif not found:
+    template = Template(pkg_resources.read_text(
+        graflipy.query, 'ega_accessions_update.sparql'))
+    for i in range(0, len(pending), QUERY_CHUNK):
+        do_update(template.substitute(values=' '.join(
+            f'({iri.n3()} :{cls.__name__} {Literal(accessionupdate).n3()})'
+            for cls, iri, accessionupdate in pending[i:i + QUERY_CHUNK])))
+    if not entries:
         LOGGER.warning(MSG_ACCESSION_NOT_FOUND)
@@ -0,0 +1,263 @@
+"""
+asyncio client for concurrent retrieval of metadata from the EGA REST API.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from urllib.parse import quote_plus, urlsplit
+
+import aiohttp
+
+from graflipy.ega.client import (DEFAULT_BACKOFF,
+                                 DEFAULT_RETRIES,
+                                 EGACONF,
+                                 ERR_AUTH,
+                                 ERR_CRED_SRC,
+                                 ERR_RESPONSE,
+                                 MSG_RETRY,
+                                 SCHEMA_ARCHIVE,
+                                 RequestFailed,
+                                 RequestStats)
+
+DEFAULT_CONCURRENCY = 10
+LOGGER = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Space out calls to at most `rate` per second
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate: float max calls per second
+        """
+        self.interval = 1 / rate
+        self.next_time = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        """
+        Wait until the next call is allowed
+        """
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncRESTClient:
+    """
+    asyncio client for the EGA REST API. Logs in on entry and out on exit:
+
+        async with AsyncRESTClient(user, password_file=path) as client:
+            async for accession, result in client.retrieve_many(
+                    AddSchema.ANALYSIS, accessions):
+                ...
+    """
+
+    def __init__(self, user, password=None, password_file=None, test=False,
+                 timeout=120, concurrency=DEFAULT_CONCURRENCY,
+                 rate_limit=None, rate_limits=None, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, endpoint=None):
+        """
+        Exactly one of password or password_file is required
+
+        Args:
+            user: str username
+            password: Optional[str] password
+            password_file: Optional[str] location of a file containing the
+                user's password
+            test: bool if True then use API test endpoint otherwise production
+            timeout: int use this timeout in requests
+            concurrency: int max number of requests in flight
+            rate_limit: Optional[float] max requests per second to any host
+            rate_limits: Optional[dict] of {host: max requests per second},
+                overriding `rate_limit` for those hosts
+            retries: int max number of times a request is retried after a
+                connection error or 5xx response
+            backoff: float base delay in seconds before the first retry;
+                doubled for each further retry, with random jitter
+            endpoint: Optional[str] base URL of the API, overriding the
+                configured one, e.g. for a local stand-in server
+        """
+        if (password is None) == (password_file is None):
+            raise ValueError(ERR_CRED_SRC)
+        self.user = user
+        self.password = (password or
+                         Path(password_file).expanduser().read_text().strip())
+        self.endpoint_new = endpoint or (
+            None if test else EGACONF.restUrlNew)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.rate_limits = rate_limits or {}
+        self.limiters = {}
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = RequestStats()
+        self.session = None
+        self.login_token = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            timeout=self.timeout,
+            connector=aiohttp.TCPConnector(limit=self.concurrency))
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.logout()
+        await self.session.close()
+
+    async def _throttle(self, url):
+        """
+        Wait for the rate limiter of the host of `url`, if it has one
+        """
+        host = urlsplit(url).hostname
+        rate = self.rate_limits.get(host, self.rate_limit)
+        if rate:
+            if host not in self.limiters:
+                self.limiters[host] = RateLimiter(rate)
+            await self.limiters[host].wait()
+
+    async def _request(self, method, url, retry=True, **kwargs):
+        """
+        Make an HTTP request, retrying connection errors and 5xx responses
+        with exponential backoff and jitter, and return the status and body.
+        Attempts, retries and latency are recorded in `self.stats`.
+
+        Returns:
+            (int status, bytes body)
+        """
+        attempts = 1 + (self.retries if retry else 0)
+        for attempt in range(1, attempts + 1):
+            await self._throttle(url)
+            start, failed = time.monotonic(), True
+            try:
+                async with self.session.request(
+                        method, url, **kwargs) as response:
+                    body = await response.read()
+                failed = response.status >= 500
+                reason = response.status
+            except (aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError) as err:
+                if attempt == attempts:
+                    raise
+                reason = type(err).__name__
+            finally:
+                self.stats.record(time.monotonic() - start, failed)
+            if not failed or attempt == attempts:
+                return response.status, body
+            delay = (self.backoff * 2 ** (attempt - 1) *
+                     random.uniform(0.5, 1.5))
+            LOGGER.warning(MSG_RETRY, method, url, reason, attempt,
+                           attempts - 1, delay)
+            self.stats.retries += 1
+            await asyncio.sleep(delay)
+
+    async def login(self):
+        """
+        Get a login token for the API
+        """
+        status, body = await self._request(
+            'POST',
+            self.endpoint_new + 'login',
+            data={'username': self.user,
+                  'password': quote_plus(self.password),
+                  'loginType': 'submitter'})
+        try:
+            self.login_token = json.loads(body)[
+                'response']['result'][0]['session']['sessionToken']
+        except (ValueError, KeyError, IndexError, TypeError):
+            LOGGER.error(ERR_RESPONSE, status, body)
+            LOGGER.error(ERR_AUTH, self.endpoint_new)
+
+    async def logout(self):
+        """
+        Invalidate the login token
+        """
+        if self.login_token:
+            await self._request(
+                'DELETE',
+                self.endpoint_new + 'logout',
+                retry=False,
+                headers={'X-Token': self.login_token})
+            self.login_token = None
+
+    async def retrieve_metadata(self, schema, accession):
+        """
+        Return metadata at EGA about an entity specified by accession
+
+        Args:
+            schema: AddSchema instance
+            accession: str
+
+        Returns:
+            decoded JSON response
+
+        Raises:
+            RequestFailed on an error response
+        """
+        archive = SCHEMA_ARCHIVE.get(schema, schema.value + 's')
+        status, body = await self._request(
+            'GET',
+            self.endpoint_new + f'{archive}/{accession}'
+                                 '?idtype=ega_stable_id',
+            headers={'X-Token': self.login_token})
+        if status >= 400:
+            raise RequestFailed(ERR_RESPONSE % (status, body))
+        return json.loads(body)
+
+    async def retrieve_many(self, schema, accessions):
+        """
+        Retrieve metadata for many accessions with at most `concurrency`
+        requests in flight, yielding results as they complete (not in input
+        order).
+
+        Args:
+            schema: AddSchema instance
+            accessions: iterable of str
+
+        Yields:
+            (accession, result) where result is the decoded JSON response,
+            or the exception raised retrieving it
+        """
+        pending = iter(accessions)
+        results = asyncio.Queue()
+
+        async def worker():
+            try:
+                for accession in pending:
+                    try:
+                        result = await self.retrieve_metadata(
+                            schema, accession)
+                    except (RequestFailed, aiohttp.ClientError,
+                            asyncio.TimeoutError) as err:
+                        result = err
+                    await results.put((accession, result))
+            finally:
+                # sentinel: this worker is finished
+                await results.put(None)
+
+        workers = [asyncio.create_task(worker())
+                   for _ in range(self.concurrency)]
+        try:
+            finished = 0
+            while finished < len(workers):
+                item = await results.get()
+                if item is None:
+                    finished += 1
+                else:
+                    yield item
+            # re-raise any unexpected worker error
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
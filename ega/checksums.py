@@ -0,0 +1,114 @@
+"""
+Look up md5 checksums for files prepared for EGA
+"""
+from pathlib import Path
+
+from graflipy.ega import MetadataConstructionError
+from graflipy.ega.prepare import Manifest
+
+ERR_MD5_NONE = 'md5 not found for %s'
+ERR_MD5_FORMAT = '%s: not md5sum format: %r'
+# suffix identifying a `graflipy.ega.prepare.Manifest`
+MANIFEST_SUFFIX = '.jsonl'
+# default number of bams whose md5 files the checksum stage of
+# `metadata.iter_analyses` reads concurrently
+CHECKSUM_JOBS = 16
+
+
+def parse_md5sum(text, source='<string>'):
+    """
+    Parse `md5sum` output
+
+    Args:
+        text: str lines of "<md5> <filename>", where the filename may be
+            prefixed with '*' as md5sum does in binary mode
+        source: name of the text source, for error messages
+
+    Returns:
+        dict of {filename: md5} where filename is the base name only
+
+    Raises:
+        ValueError if a non-blank line isn't in md5sum format
+    """
+    md5s = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        md5, sep, name = line.partition(' ')
+        if not (sep and md5 and name[1:]):
+            raise ValueError(ERR_MD5_FORMAT % (source, line))
+        md5s[Path(name[1:]).name] = md5
+    return md5s
+
+
+def read_md5_file(md5file):
+    """
+    Returns dict of {filename: md5} from an `md5sum` output file
+    """
+    return parse_md5sum(Path(md5file).read_text(), str(md5file))
+
+
+def load_md5s(source):
+    """
+    Load md5 checksums from either a single consolidated `md5sum`-format
+    manifest file, or the JSON lines manifest kept by `graflipy.ega.prepare`
+    (which must have a `.jsonl` suffix)
+
+    Args:
+        source: path to a file
+
+    Returns:
+        dict of {filename: md5}
+    """
+    source = Path(source)
+    if source.suffix == MANIFEST_SUFFIX:
+        return Manifest(source).md5s()
+    return parse_md5sum(source.read_text(), str(source))
+
+
+def md5_reader(source):
+    """
+    Returns a function that looks up the md5 of a file by its base name.
+    For a directory of `.md5` files, only [file].md5 is read, when the
+    function is called, so the checksum stage of `metadata.iter_analyses`
+    reads them concurrently with the other stages rather than loading the
+    whole directory up front; a manifest file is loaded in full by
+    `load_md5s`.
+
+    Args:
+        source: path to a directory containing the [file].md5 files, as
+            written by `md5sum`, or a manifest file as for `load_md5s`
+
+    Returns:
+        callable of (filename) -> md5, raising MetadataConstructionError if
+        the file has no md5
+    """
+    source = Path(source)
+    if not source.is_dir():
+        md5s = load_md5s(source)
+        return lambda filename: lookup_md5(md5s, filename)
+
+    def read(filename):
+        try:
+            md5s = read_md5_file(source / f'{filename}.md5')
+        except FileNotFoundError:
+            md5s = {}
+        return lookup_md5(md5s, filename)
+    return read
+
+
+def lookup_md5(md5s, filename):
+    """
+    Returns the md5 of a file
+
+    Args:
+        md5s: dict of {filename: md5}, e.g. from `load_md5s`
+        filename: base name of the file
+
+    Raises:
+        MetadataConstructionError if the file has no md5
+    """
+    try:
+        return md5s[filename]
+    except KeyError:
+        raise MetadataConstructionError(ERR_MD5_NONE % filename) from None
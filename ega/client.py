@@ -1,23 +1,38 @@
 """
 Client for interacting with EGA REST API.
 """
+import io
 import logging
+import mmap
+import os
+import random
+import stat
+import threading
+import time
+import uuid
+from dataclasses import dataclass
 from json import JSONDecodeError
 from pathlib import Path
 from urllib.parse import quote_plus
 
 import requests
 from lxml import etree
+from requests.adapters import HTTPAdapter
 
-from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 
 from graflipy import get_config
 from graflipy.ega.metadata import submission, submissionset
+from graflipy.ega.receipt import ReceiptSummary
 from graflipy.ega.schema_1_5_0 import SUBMISSIONXSD, AddSchema, SubmissionType
+from graflipy.ega.serialize import SchemaSerializer
 from graflipy.exceptions import NotifiableError
 
 
+BLOCKSIZE = 1 << 16
+DEFAULT_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
 EGACONF = get_config().ega
 ERR_ACTION = 'Unhandled action %s'
 ERR_AUTH = 'No token received; endpoint %s will be unavailable'
@@ -25,6 +40,10 @@ ERR_CRED_SRC = 'Exactly one of password or password_file is required'
 ERR_FAILED = 'Submission failed. See output for details'
 ERR_RESPONSE = 'Unexpected response %s: %s'
 LOGGER = logging.getLogger(__name__)
+MULTIPART_HEADER = ('--%s\r\n'
+                    'Content-Disposition: form-data; name="%s"; filename="%s"'
+                    '\r\nContent-Type: text/plain\r\n\r\n')
+MSG_RETRY = '%s %s failed (%s); retry %s of %s in %.1fs'
 MSG_SUCCEEDED = 'Submission succeeded'
 SCHEMA_ARCHIVE = {
     AddSchema.ANALYSIS: 'analyses',
@@ -54,10 +73,32 @@ class RequestFailed(Exception):
     """
 
 
+@dataclass
+class RequestStats:
+    """
+    Counts of requests made by a RESTClient, including retries, and their
+    cumulative latency
+    """
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds, failed):
+        """
+        Record one HTTP request attempt
+        """
+        self.requests += 1
+        self.failures += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
 class FileUpload:
     """
     Associate a schema name with a data stream and provide some conveniently
-    named attributes
+    named attributes. The stream is not read until the upload is sent.
     """
     def __init__(self, schema, stream):
         """
@@ -67,7 +108,14 @@ class FileUpload:
         """
         self.schema = schema
         self.stream = stream
-        self.data = stream.read()
+
+    @property
+    def data(self):
+        """
+        Complete contents of the stream, read into memory
+        """
+        self.stream.seek(0)
+        return self.stream.read()
 
     @property
     def filename(self):
@@ -90,6 +138,104 @@ class FileUpload:
         """
         return self.filename
 
+    def open(self):
+        """
+        Returns a binary file-like object of the complete stream contents.
+        If the stream is a regular file this is a read-only memory map of
+        it, so the contents are paged in from disk only as they are read;
+        otherwise it is the UTF-8 encoded contents of the stream.
+        """
+        try:
+            fileno = self.stream.fileno()
+        except (AttributeError, OSError):
+            fileno = None
+        if fileno is not None:
+            filestat = os.fstat(fileno)
+            if stat.S_ISREG(filestat.st_mode) and filestat.st_size:
+                return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        if self.stream.seekable():
+            self.stream.seek(0)
+        data = self.stream.read()
+        return io.BytesIO(data.encode() if isinstance(data, str) else data)
+
+
+class MultipartEncoder:
+    """
+    A multipart/form-data request body that reads each part only as the body
+    is sent, so memory use does not depend on the size of the uploads.
+    Pass it as `data` to requests, with `content_type` as the Content-Type
+    header; it has a length so it is sent with a Content-Length rather than
+    chunked. Use as a context manager to close the part sources.
+    """
+
+    def __init__(self, parts):
+        """
+        Args:
+            parts: list of (str name, str filename, source) where source is a
+                binary file-like object positioned at its start, e.g. from
+                `FileUpload.open`
+        """
+        boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self.segments = []
+        for name, filename, source in parts:
+            header = MULTIPART_HEADER % (
+                boundary, name, filename.replace('"', '%22'))
+            self.segments += [io.BytesIO(header.encode()), source,
+                              io.BytesIO(b'\r\n')]
+        self.segments.append(io.BytesIO(f'--{boundary}--\r\n'.encode()))
+        self.len = 0
+        for segment in self.segments:
+            segment.seek(0, io.SEEK_END)
+            self.len += segment.tell()
+            segment.seek(0)
+        self.index = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            block = self.read(BLOCKSIZE)
+            if not block:
+                return
+            yield block
+
+    def __len__(self):
+        return self.len
+
+    def read(self, size=-1):
+        """
+        Read up to `size` bytes of the body, or the rest of it if size < 0
+        """
+        out = bytearray()
+        while self.index < len(self.segments) and (
+                size < 0 or len(out) < size):
+            want = size - len(out) if size >= 0 else -1
+            block = self.segments[self.index].read(want)
+            out += block
+            if want < 0 or len(block) < want:
+                self.index += 1
+        return bytes(out)
+
+    def rewind(self):
+        """
+        Go back to the start of the body, e.g. to send it again on retry
+        """
+        for segment in self.segments:
+            segment.seek(0)
+        self.index = 0
+
+    def close(self):
+        """
+        Close all part sources
+        """
+        for segment in self.segments:
+            segment.close()
+
 
 class RESTClient:
     """
@@ -97,7 +243,9 @@ class RESTClient:
     """
 
     def __init__(self, user, password=None, password_file=None, test=False,
-                 timeout=120):
+                 timeout=120, pool_size=DEFAULT_POOL_SIZE,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 endpoint=None):
         """
         Exactly one of password or password_file is required
 
@@ -108,21 +256,40 @@ class RESTClient:
                 user's password
             test: bool if True then use API test endpoint otherwise production
             timeout: int use this timeout in requests
+            pool_size: int max number of connections kept open per host
+            retries: int max number of times a request is retried after a
+                connection error or 5xx response
+            backoff: float base delay in seconds before the first retry;
+                doubled for each further retry, with random jitter
+            endpoint: Optional[str] base URL of both the submission and the
+                metadata API, overriding the configured ones, e.g. for a
+                `graflipy.ega.mockserver.MockEGAServer`
         """
         if (password is None) == (password_file is None):
             raise ValueError(ERR_CRED_SRC)
         password = (password or
                     Path(password_file).expanduser().read_text().strip())
         self.auth = (user, password)
-        self.endpoint = (EGACONF.restUrlTest if test
-                         else EGACONF.restUrlProduction)
-        self.endpoint_new = None if test else EGACONF.restUrlNew
+        self.endpoint = endpoint or (EGACONF.restUrlTest if test
+                                     else EGACONF.restUrlProduction)
+        self.endpoint_new = endpoint or (
+            None if test else EGACONF.restUrlNew)
         self.timeout = timeout
-        self.serializer = XmlSerializer(config=XMLCONF)
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = RequestStats()
+        self.stats_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.serializer = SchemaSerializer(XMLCONF)
         self.login_token = None
         # get login token for new API
         try:
-            response = requests.post(
+            response = self._request(
+                'POST',
                 self.endpoint_new + 'login',
                 data={'username': user,
                       'password': quote_plus(password),
@@ -135,9 +302,61 @@ class RESTClient:
 
     def __del__(self):
         if getattr(self, 'login_token', None):
-            requests.delete(
+            self._request(
+                'DELETE',
                 self.endpoint_new + 'logout',
+                retry=False,
                 headers={'X-Token': self.login_token})
+        if getattr(self, 'session', None):
+            self.session.close()
+
+    def _request(self, method, url, retry=True, **kwargs):
+        """
+        Make an HTTP request with the pooled session, retrying connection
+        errors and 5xx responses with exponential backoff and jitter.
+        Attempts, retries and latency are recorded in `self.stats`.
+
+        Args:
+            method: str HTTP method
+            url: str
+            retry: bool if False then make only one attempt, e.g. for
+                requests that are not safe to repeat
+            kwargs: passed to `requests.Session.request`
+
+        Returns:
+            requests.Response of the last attempt
+
+        Raises:
+            requests.exceptions.ConnectionError or Timeout from the last
+                attempt
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        attempts = 1 + (self.retries if retry else 0)
+        for attempt in range(1, attempts + 1):
+            if attempt > 1 and hasattr(kwargs.get('data'), 'rewind'):
+                kwargs['data'].rewind()
+            start, failed = time.monotonic(), True
+            try:
+                response = self.session.request(method, url, **kwargs)
+                failed = response.status_code >= 500
+                reason = response.status_code
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as err:
+                if attempt == attempts:
+                    raise
+                reason = type(err).__name__
+            finally:
+                with self.stats_lock:
+                    self.stats.record(time.monotonic() - start, failed)
+            if not failed or attempt == attempts:
+                return response
+            delay = (self.backoff * 2 ** (attempt - 1) *
+                     random.uniform(0.5, 1.5))
+            LOGGER.warning(MSG_RETRY, method, url, reason, attempt,
+                           attempts - 1, delay)
+            with self.stats_lock:
+                self.stats.retries += 1
+            time.sleep(delay)
 
     def retrieve_metadata(self, schema, accession):
         """
@@ -155,11 +374,11 @@ class RESTClient:
         """
         archive = SCHEMA_ARCHIVE.get(schema, schema.value + 's')
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 self.endpoint_new + f'{archive}/{accession}'
                                      '?idtype=ega_stable_id',
-                headers={'X-Token': self.login_token},
-                timeout=self.timeout)
+                headers={'X-Token': self.login_token})
             LOGGER.debug(response.request.headers)
             LOGGER.debug(response.request.body)
             response.raise_for_status()
@@ -170,15 +389,22 @@ class RESTClient:
             ) from err
         return response.json()
 
-    def submit_metadata(self, uploads, action, alias, receiptout):
+    def submit(self, uploads, action, alias):
         """
-        Submit XML metadata to EGA REST API endpoint
+        Submit XML metadata to EGA REST API endpoint and return the receipt,
+        whether or not the submission succeeded
 
         Args:
             uploads: list of FileUpload instances
             action: SubmissionType.Actions.Action.[Add|Validate]
             alias: short, distinctive alias for the submission
-            receiptout: text buffer to write receipt response
+
+        Returns:
+            (str receipt XML, ReceiptSummary)
+
+        Raises:
+            SubmissionFailed if the endpoint responds with an HTTP error or
+                doesn't return XML
 
         Caution:
             all headers including auth are present in DEBUG level log output
@@ -198,23 +424,27 @@ class RESTClient:
         submissionsetobj = submissionset([submission(alias, actions)])
         submissionsetdata = self.serializer.render(submissionsetobj)
         LOGGER.info(submissionsetdata)
-        files = [
-            (up.formname, (up.filename, up.data, 'text/plain'))
-            for up in uploads
+        parts = [
+            (up.formname, up.filename, up.open()) for up in uploads
         ] + [
-            ('SUBMISSION', ('SUBMISSION', submissionsetdata, 'text/plain'))
+            ('SUBMISSION', 'SUBMISSION',
+             io.BytesIO(submissionsetdata.encode()))
         ]
 
         try:
-            response = requests.post(
-                self.endpoint + 'submit/',
-                files=files,
-                auth=self.auth,
-                timeout=self.timeout)
+            with MultipartEncoder(parts) as body:
+                # only VALIDATE is safe to repeat: a retried ADD could add
+                # twice
+                response = self._request(
+                    'POST',
+                    self.endpoint + 'submit/',
+                    retry=action == Validate,
+                    data=body,
+                    headers={'Content-Type': body.content_type},
+                    auth=self.auth)
             LOGGER.debug(response.request.headers)
-            LOGGER.debug(response.request.body)
             response.raise_for_status()
-            receipt = etree.fromstring(response.content)
+            summary = ReceiptSummary.parse(response.content)
         # Log and raise HTTP errors and deserialization errors i.e. if we
         # didn't get XML back from the endpoint
         except (requests.exceptions.HTTPError, etree.XMLSyntaxError) as err:
@@ -222,9 +452,28 @@ class RESTClient:
                 ERR_RESPONSE % (response.status_code, response.content)
             ) from err
 
-        receiptout.write(response.text)
+        return response.text, summary
+
+    def submit_metadata(self, uploads, action, alias, receiptout):
+        """
+        Submit XML metadata to EGA REST API endpoint
+
+        Args:
+            uploads: list of FileUpload instances
+            action: SubmissionType.Actions.Action.[Add|Validate]
+            alias: short, distinctive alias for the submission
+            receiptout: text buffer to write receipt response
+
+        Caution:
+            all headers including auth are present in DEBUG level log output
+        """
+        receipttext, summary = self.submit(uploads, action, alias)
+
+        receiptout.write(receipttext)
 
-        if receipt.attrib['success'] != 'true':
+        for error in summary.errors:
+            LOGGER.error(error)
+        if not summary.success:
             raise SubmissionFailed(ERR_FAILED)
 
         LOGGER.info(MSG_SUCCEEDED)
@@ -0,0 +1,137 @@
+"""
+Persistent cache of the bam header fields used in metadata, so that
+regenerating ANALYSIS.xml for the same bams doesn't need to reopen them.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from pathlib import Path
+
+CACHE_DIR = Path(
+    os.environ.get('XDG_CACHE_HOME') or '~/.cache').expanduser() / 'graflipy'
+DEFAULT_CACHE = CACHE_DIR / 'bam_headers.sqlite'
+ERR_CACHE_OPEN = ('unable to open bam header cache %s, so headers are read '
+                  'from the bams: %s')
+LOGGER = logging.getLogger(__name__)
+MSG_STALE = 'bam header cache entry for %s is stale'
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS bam_header (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    readgroup_ids TEXT NOT NULL,
+    sequence_names TEXT NOT NULL
+)
+'''
+
+
+def file_key(path):
+    """
+    Returns (path, size, mtime_ns, inode) identifying the current state of the
+    file at `path`. Only the file metadata is read, never the file itself.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class HeaderCache:
+    """
+    SQLite-backed cache of bam @RG IDs and @SQ names keyed by path, size,
+    mtime and inode. An entry is stale, and is discarded on lookup, as soon
+    as any of those change.
+
+    Safe to share between threads. Use as a context manager, or call `close`.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE):
+        """
+        Args:
+            path: location of the SQLite database; created if necessary
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get(self, path):
+        """
+        Return the cached header fields for `path`
+
+        Args:
+            path: path to a bam
+
+        Returns:
+            (readgroup_ids, sequence_names) or None if there is no current
+            entry for the file, or it can't be accessed
+        """
+        try:
+            key = file_key(path)
+        except OSError:
+            return None
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                'SELECT size, mtime_ns, inode, readgroup_ids, sequence_names '
+                'FROM bam_header WHERE path = ?', key[:1]).fetchone()
+            if row is None:
+                return None
+            if tuple(row[:3]) != key[1:]:
+                LOGGER.debug(MSG_STALE, key[0])
+                self.conn.execute(
+                    'DELETE FROM bam_header WHERE path = ?', key[:1])
+                return None
+        return json.loads(row[3]), set(json.loads(row[4]))
+
+    def put(self, path, readgroup_ids, sequence_names, key=None):
+        """
+        Store header fields for `path`, replacing any existing entry
+
+        Args:
+            path: path to a bam
+            readgroup_ids: list of @RG ID values
+            sequence_names: set of @SQ SN values
+            key: `file_key(path)` taken before the header was read, so that
+                an entry for a file modified since is stale; default the
+                current state of the file
+        """
+        key = key or file_key(path)
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO bam_header VALUES (?, ?, ?, ?, ?, ?)',
+                key + (json.dumps(list(readgroup_ids)),
+                       json.dumps(sorted(sequence_names))))
+
+    def close(self):
+        """
+        Close the database connection
+        """
+        self.conn.close()
+
+
+def open_cache(path=DEFAULT_CACHE):
+    """
+    Returns the HeaderCache at `path`, or None if it can't be opened, e.g.
+    in a read-only home directory. That is logged, and the headers are
+    then read from the bams.
+
+    Args:
+        path: location of the SQLite database; created if necessary
+    """
+    try:
+        return HeaderCache(path)
+    except (OSError, sqlite3.Error) as err:
+        LOGGER.warning(ERR_CACHE_OPEN, path, err)
+        return None
@@ -0,0 +1,196 @@
+"""
+Timers and counters for finding where the time goes in a run, e.g. of
+`ega_analysisxml`. Nothing is recorded until `enable` is called, and the
+calls that dominate EGA metadata runs (SPARQL queries, bam header reads, md5
+reads, XML serialization and HTTP requests) are only timed once `install`
+has wrapped them:
+
+    instrument.install()
+    ...
+    json.dump(instrument.summary(), out)
+"""
+import functools
+import importlib
+import inspect
+import sys
+import threading
+import time
+
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+# (module, attribute path, timer name) of the calls wrapped by `install`.
+# Modules that have not been imported are skipped: they aren't used.
+TARGETS = (
+    ('graflipy.ega', 'do_query', 'sparql'),
+    ('graflipy.ega.metadata', 'do_query', 'sparql'),
+    ('graflipy.ega.metadata', 'bam_header', 'pysam.AlignmentFile'),
+    ('graflipy.ega.checksums', 'read_md5_file', 'md5.read'),
+    ('graflipy.ega.serialize', 'SchemaSerializer.render', 'xml.render'),
+    ('xsdata.formats.dataclass.serializers', 'XmlSerializer.render',
+     'xsdata.render'),
+    ('xsdata.formats.dataclass.serializers', 'XmlSerializer.write',
+     'xsdata.write'),
+    ('requests', 'Session.request', 'http.requests'),
+    ('aiohttp', 'ClientSession._request', 'http.aiohttp'),
+)
+
+
+@dataclass
+class TimerStats:
+    """
+    Cumulative timings of one named timer
+    """
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds, failed):
+        """
+        Record one timed call
+        """
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+class _Registry:
+    """
+    Process-wide timers and counters
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.timers = {}
+        self.counters = Counter()
+        self.started = time.monotonic()
+        self.installed = []
+
+    def record(self, name, seconds, failed):
+        """
+        Record one call of timer `name`
+        """
+        with self.lock:
+            if name not in self.timers:
+                self.timers[name] = TimerStats()
+            self.timers[name].record(seconds, failed)
+
+
+REGISTRY = _Registry()
+
+
+def enable():
+    """
+    Start recording, discarding anything recorded before
+    """
+    reset()
+    REGISTRY.enabled = True
+
+
+def reset():
+    """
+    Discard all timings and counts
+    """
+    with REGISTRY.lock:
+        REGISTRY.timers.clear()
+        REGISTRY.counters.clear()
+        REGISTRY.started = time.monotonic()
+
+
+@contextmanager
+def timer(name):
+    """
+    Context manager that times its block under `name`:
+
+        with timer('build'):
+            ...
+    """
+    start, failed = time.monotonic(), True
+    try:
+        yield
+        failed = False
+    finally:
+        if REGISTRY.enabled:
+            REGISTRY.record(name, time.monotonic() - start, failed)
+
+
+def timed(name):
+    """
+    Decorator that times every call of a function, or coroutine function,
+    under `name`
+    """
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timer(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, increment=1):
+    """
+    Add to counter `name`
+    """
+    if REGISTRY.enabled:
+        with REGISTRY.lock:
+            REGISTRY.counters[name] += increment
+
+
+def install(targets=TARGETS):
+    """
+    Enable recording, and wrap each of `targets` whose module has been
+    imported, and that exists, with a timer. Call `uninstall` to undo.
+
+    Args:
+        targets: iterable of (module name, attribute path, timer name)
+    """
+    enable()
+    for modname, path, name in targets:
+        if modname not in sys.modules:
+            continue
+        owner = importlib.import_module(modname)
+        *parents, attr = path.split('.')
+        for parent in parents:
+            owner = getattr(owner, parent, None)
+        if not hasattr(owner, attr):
+            continue
+        original = inspect.getattr_static(owner, attr)
+        setattr(owner, attr, timed(name)(getattr(owner, attr)))
+        REGISTRY.installed.append((owner, attr, original))
+
+
+def uninstall():
+    """
+    Restore everything wrapped by `install` and stop recording
+    """
+    while REGISTRY.installed:
+        owner, attr, original = REGISTRY.installed.pop()
+        setattr(owner, attr, original)
+    REGISTRY.enabled = False
+
+
+def summary():
+    """
+    Returns dict of the wall-clock seconds since recording was enabled,
+    the timers sorted by total time, and the counters
+    """
+    with REGISTRY.lock:
+        timers = sorted(REGISTRY.timers.items(),
+                        key=lambda item: -item[1].total_seconds)
+        return {
+            'seconds': round(time.monotonic() - REGISTRY.started, 3),
+            'timers': {name: asdict(stats) for name, stats in timers},
+            'counters': dict(REGISTRY.counters),
+        }
@@ -3,6 +3,7 @@ Utility functions to construct the necessary metadata for an EGA submisssion
 from input file paths and info from the db.
 """
 from dataclasses import dataclass, field, fields
+from functools import lru_cache, partial
 from pathlib import Path
 from string import Template
 
@@ -10,11 +11,16 @@ import importlib.resources as pkg_resources
 import logging
 
 import pysam
+from rdflib import Literal
 
 import graflipy.query
 from graflipy import get_config
 from graflipy.connect import do_query
-from graflipy.ega import MetadataConstructionError
+from graflipy.ega import QUERY_CHUNK, MetadataConstructionError
+from graflipy.ega.checksums import CHECKSUM_JOBS, md5_reader
+from graflipy.ega.headercache import file_key
+from graflipy.ega.instrument import count
+from graflipy.ega.pipeline import Pipeline, Stage
 from graflipy.ega.schema_1_5_0 import (AnalysisFileType,
                                        AnalysisFileTypeChecksumMethod,
                                        AnalysisFileTypeFiletype,
@@ -31,7 +37,6 @@ from graflipy.ega.schema_1_5_0 import (AnalysisFileType,
                                        SubmissionSet,
                                        SubmissionType)
 from graflipy.reference import ReferenceAssembly, Species
-from graflipy.util import get_md5
 
 BAM_NOTE = 'SAMPLE_REF label attribute contains csv list of bam @RG IDs'
 CONF = get_config()
@@ -43,6 +48,27 @@ ERR_SAMPLE_INCOMPLETE = 'donor:%s collectedsample:%s - missing db data for %s'
 ERR_UNKNOWN_SEQ = '%s header contains SQ not defined in the reference %s: %s'
 
 LOGGER = logging.getLogger(__name__)
+MSG_STAGE_TIMES = 'analysis construction stage timings: %s'
+
+
+@dataclass
+class BamHeader:
+    """
+    Helper to organize the bam header fields used in metadata
+    """
+    readgroup_ids: list
+    sequence_names: set
+
+
+@dataclass(frozen=True)
+class ReferenceIndex:
+    """
+    Helper to share structures derived from a reference assembly between all
+    the analyses aligned to it
+    """
+    sequence_names: frozenset
+    sequences: list
+    reference_alignment: ReferenceSequenceType
 
 
 @dataclass
@@ -92,6 +118,120 @@ class DbMetaSample:
         self.phenotype = '|'.join((self.sample_tissue, self.sample_type))
 
 
+def _chunks(values, size):
+    """
+    Yield successive lists of at most `size` items from `values`
+    """
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _single(key, records):
+    """
+    Return the only item in `records`
+
+    Raises:
+        MetadataConstructionError if `records` is empty or has more than one
+            item
+    """
+    if not records:
+        raise MetadataConstructionError(ERR_DBMETA_NONE % key)
+    if len(records) > 1:
+        raise MetadataConstructionError(ERR_DBMETA_MULTI % key)
+    return records[0]
+
+
+def _dbmeta_bam(result):
+    """
+    Returns DbMetaBam from a `ega_meta_bam.sparql` result row
+    """
+    return DbMetaBam(
+        bam_type=result.type,
+        bam_uuid=result.bamUuid.value,
+        ega_accession=(result.egaAccession and result.egaAccession.value),
+        sample_uuid=result.sampleUuid.value,
+        library_capture_kit=result.libraryCaptureKit.value,
+        sequencing_platform=result.sequencingPlatform.value,
+        reference=ReferenceAssembly.fromstr(result.reference.value))
+
+
+def bam_header(path):
+    """
+    Read the @RG IDs and @SQ names from a bam header
+
+    Args:
+        path: path to a bam on a locally accessible filesystem
+
+    Returns:
+        BamHeader
+    """
+    header = pysam.AlignmentFile(path).header
+    # pylint: disable=unsubscriptable-object
+    return BamHeader(
+        readgroup_ids=[rg['ID'] for rg in header['RG']],
+        sequence_names={seq['SN'] for seq in header['SQ']})
+    # pylint: enable=unsubscriptable-object
+
+
+@lru_cache(maxsize=None)
+def reference_index(reference):
+    """
+    Returns the ReferenceIndex for a reference assembly, built once per
+    process.
+
+    Args:
+        reference: ReferenceAssembly
+
+    Returns:
+        ReferenceIndex with the frozenset of sequence names, the list of
+        `ReferenceSequenceType.Sequence` in reference order, and the
+        `REFERENCE_ALIGNMENT` element. These are shared by every analysis
+        aligned to the reference, which lets a
+        `graflipy.ega.serialize.FragmentCache` render the element once, so
+        they must not be modified.
+    """
+    sequences = [
+        ReferenceSequenceType.Sequence(
+            accession=seq.accession,
+            label=seq.name
+        ) for seq in sorted(reference.sequences)
+    ]
+    return ReferenceIndex(
+        sequence_names=frozenset(seq.name for seq in reference.sequences),
+        sequences=sequences,
+        reference_alignment=ReferenceSequenceType(
+            assembly=ReferenceAssemblyType(
+                standard=ReferenceAssemblyType.Standard(
+                    accession=reference.accession
+                )
+            ),
+            sequence=sequences
+        ))
+
+
+def _cached_bam_header(path, cache=None):
+    """
+    Returns the BamHeader of a bam from `cache` if it has a current entry,
+    otherwise read from the bam and added to `cache`
+
+    Args:
+        path: path to a bam on a locally accessible filesystem
+        cache: Optional[HeaderCache]
+    """
+    cached = cache and cache.get(path)
+    if cached:
+        count('bam_header.cache_hit')
+        return BamHeader(*cached)
+    # the file state before the read, so a bam modified meanwhile is stale
+    key = cache and file_key(path)
+    header = bam_header(path)
+    if cache:
+        count('bam_header.cache_miss')
+        cache.put(path, header.readgroup_ids, header.sequence_names, key)
+    return header
+
+
 def dbmeta_bam(path):
     """
     Fetch some metadata about a bam from the database
@@ -109,50 +249,54 @@ def dbmeta_bam(path):
     query = Template(
         pkg_resources.read_text(graflipy.query, 'ega_meta_bam.sparql')
     ).substitute(bamPath=path)
-    results = list(do_query(query))
-    nresults = len(results)
-    if nresults == 0:
-        raise MetadataConstructionError(ERR_DBMETA_NONE % path)
-    if nresults > 1:
-        raise MetadataConstructionError(ERR_DBMETA_MULTI % path)
-    result = results[0]
-    return DbMetaBam(
-        bam_type=result.type,
-        bam_uuid=result.bamUuid.value,
-        ega_accession=(result.egaAccession and result.egaAccession.value),
-        sample_uuid=result.sampleUuid.value,
-        library_capture_kit=result.libraryCaptureKit.value,
-        sequencing_platform=result.sequencingPlatform.value,
-        reference=ReferenceAssembly.fromstr(result.reference.value))
+    return _single(path, [_dbmeta_bam(result) for result in do_query(query)])
 
 
-def dbmeta_sample(uuid):
+def dbmeta_bams(paths):
     """
-    Fetch some metadata about a sample from the database
+    Fetch some metadata about many bams from the database, using one
+    `ega_meta_bams.sparql` query per `QUERY_CHUNK` paths rather than one
+    query per path.
 
     Args:
-        uuid: UUID string of the CollectedSample
+        paths: values of :filePath property to match
 
     Returns:
-        DbMetaSample
+        dict of {str(path): [DbMetaBam, ...]} with an entry for every path.
+        The list is empty if the bam is not found, and has more than one item
+        if multiple matches are found: use `_single` to get the same errors
+        as `dbmeta_bam`.
+    """
+    template = Template(
+        pkg_resources.read_text(graflipy.query, 'ega_meta_bams.sparql'))
+    dbmetas = {str(path): [] for path in paths}
+    for chunk in _chunks(dbmetas, QUERY_CHUNK):
+        query = template.substitute(
+            values=' '.join(Literal(path).n3() for path in chunk))
+        for result in do_query(query):
+            dbmetas[str(result.filePath)].append(_dbmeta_bam(result))
+    return dbmetas
+
+
+def _dbmeta_sample(uuid, results):
+    """
+    Returns DbMetaSample from the `ega_meta_sample.sparql` result rows for
+    the CollectedSample with the specified UUID
 
     Raises:
         MetadataConstructionError if the specified sample is not found in the
             datbase, multiple matches are found, or the sample metadata is
             incomplete.
     """
-    query = Template(
-        pkg_resources.read_text(graflipy.query, 'ega_meta_sample.sparql')
-    ).substitute(sampleUuid=uuid)
-    results = list(do_query(query))
-    # at least 1 result because of agg function even when no other bindings
-    result = results[0]
-    if not result.sampleUuid:
+    # a single-sample query has 1 result because of the agg function even
+    # when no other bindings, but a bulk query has none for a missing sample
+    if not results or not results[0].sampleUuid:
         raise MetadataConstructionError(
                 ERR_DBMETA_NONE % ('collectedsample:'+uuid))
     if len(results) > 1:
         raise MetadataConstructionError(
                 ERR_DBMETA_MULTI % ('collectedsample:'+uuid))
+    result = results[0]
 
     return DbMetaSample(
         sample_uuid=result.sampleUuid,
@@ -173,6 +317,63 @@ def dbmeta_sample(uuid):
         donor_sex=(result.donorSex and result.donorSex.value))
 
 
+def dbmeta_sample(uuid):
+    """
+    Fetch some metadata about a sample from the database
+
+    Args:
+        uuid: UUID string of the CollectedSample
+
+    Returns:
+        DbMetaSample
+
+    Raises:
+        MetadataConstructionError if the specified sample is not found in the
+            datbase, multiple matches are found, or the sample metadata is
+            incomplete.
+    """
+    query = Template(
+        pkg_resources.read_text(graflipy.query, 'ega_meta_sample.sparql')
+    ).substitute(sampleUuid=uuid)
+    return _dbmeta_sample(uuid, list(do_query(query)))
+
+
+def dbmeta_samples(uuids):
+    """
+    Fetch some metadata about many samples from the database, using one
+    `ega_meta_samples.sparql` query per `QUERY_CHUNK` samples rather than one
+    query per sample.
+
+    Args:
+        uuids: UUID strings of the CollectedSamples
+
+    Returns:
+        dict of {uuid: DbMetaSample}
+
+    Raises:
+        MetadataConstructionError containing accumulated errors for all
+            samples that are not found in the database, have multiple
+            matches, or have incomplete metadata.
+    """
+    template = Template(
+        pkg_resources.read_text(graflipy.query, 'ega_meta_samples.sparql'))
+    results = {uuid: [] for uuid in uuids}
+    for chunk in _chunks(results, QUERY_CHUNK):
+        query = template.substitute(
+            values=' '.join(Literal(uuid).n3() for uuid in chunk))
+        for result in do_query(query):
+            results[str(result.uuid)].append(result)
+    dbmetas, errors = {}, []
+    for uuid, uuidresults in results.items():
+        try:
+            dbmetas[uuid] = _dbmeta_sample(uuid, uuidresults)
+        except MetadataConstructionError as mcerr:
+            errors.append(mcerr)
+    if errors:
+        raise MetadataConstructionError('; '.join(str(err) for err in errors))
+    return dbmetas
+
+
 ###############################################################
 # functions that return graflipy.ega.schema_1_5_0 dataclasses #
 ###############################################################
@@ -197,7 +398,8 @@ def dbmeta_sample(uuid):
 # in their appropriate container, e.g. AnalysisSet they serialize with the
 # expected caps tag names i.e. `<ANALYSIS>`.
 
-def analysis_refalign(path, md5, gpgmd5, egastudy, egadir, nodbref=None):
+def analysis_refalign(path, md5, gpgmd5, egastudy, egadir, nodbref=None,
+                      dbmeta=None, header=None):
     """
     Returns a `graflipy.ega.schema_1_5_0.AnalysisType` instance representing an
     `ANALYSIS/ANALYSIS_TYPE/REFERENCE_ALIGNMENT` element
@@ -217,6 +419,11 @@ def analysis_refalign(path, md5, gpgmd5, egastudy, egadir, nodbref=None):
             about the parent sample of analsis elements, for a start - but
             this can be useful for building scaffold XML files to be manually
             completed
+        dbmeta: Optional[DbMetaBam] already fetched for the bam, e.g. by
+            `dbmeta_bams`. If this is not supplied (and `nodbref` isn't
+            either) then the database is queried with `dbmeta_bam`.
+        header: Optional[BamHeader] already read from the bam, e.g. by
+            `bam_header`. If this is not supplied then the bam is opened here.
 
     Raises:
         MetadataConstructionError if the specified bam is not found in the
@@ -232,18 +439,16 @@ def analysis_refalign(path, md5, gpgmd5, egastudy, egadir, nodbref=None):
     # meta from the db
     dbmeta = (
         DbMetaBam('', '', None, '', '', '', nodbref) if nodbref
-        else dbmeta_bam(path))
+        else dbmeta or dbmeta_bam(path))
 
     # meta from the bam header
-    header = pysam.AlignmentFile(path).header
-    # pylint: disable=unsubscriptable-object
-    readgroup_ids = [rg['ID'] for rg in header['RG']]
-    sequence_names = {seq['SN'] for seq in header['SQ']}
-    # pylint: enable=unsubscriptable-object
+    header = header or bam_header(path)
+    readgroup_ids = header.readgroup_ids
+    sequence_names = header.sequence_names
 
     # sanity check
-    reference_sequence_names = {seq.name for seq in dbmeta.reference.sequences}
-    diff = sequence_names - reference_sequence_names
+    refindex = reference_index(dbmeta.reference)
+    diff = sequence_names - refindex.sequence_names
     if diff:
         raise ValueError(ERR_UNKNOWN_SEQ % (path, dbmeta.reference.name, diff))
 
@@ -270,19 +475,7 @@ def analysis_refalign(path, md5, gpgmd5, egastudy, egadir, nodbref=None):
             )
         ],
         analysis_type=AnalysisType.AnalysisType(
-            reference_alignment=ReferenceSequenceType(
-                assembly=ReferenceAssemblyType(
-                    standard=ReferenceAssemblyType.Standard(
-                        accession=dbmeta.reference.accession
-                    )
-                ),
-                sequence=[
-                    ReferenceSequenceType.Sequence(
-                        accession=seq.accession,
-                        label=seq.name
-                    ) for seq in sorted(dbmeta.reference.sequences)
-                ]
-            )
+            reference_alignment=refindex.reference_alignment
         ),
         files=AnalysisType.Files(
             file=[
@@ -311,7 +504,8 @@ def analysis_refalign(path, md5, gpgmd5, egastudy, egadir, nodbref=None):
 
 
 def analysisset(paths, md5dir, egastudy, egadir, nodbref=None,
-                include_accessioned=False):
+                include_accessioned=False, jobs=1, header_cache=None,
+                db_jobs=1, checksum_jobs=CHECKSUM_JOBS, timings=None):
     """
     Returns a `graflipy.ega.schema_1_5_0.AnalysisSet` instance representing an
     `ANALYSIS_SET` containing `ANALYSIS/ANALYSIS_TYPE/REFERENCE_ALIGNMENT`
@@ -320,7 +514,8 @@ def analysisset(paths, md5dir, egastudy, egadir, nodbref=None,
     Args:
         paths: list of paths to bams on a locally accessible filesystem
         md5dir: directory containing the .bam.md5 and .bam.gpg.md5 files for
-            all bams in `paths`
+            all bams in `paths`, or a single `md5sum`-format manifest file
+            listing both the bams and the .bam.gpg files
         egastudy: EGA accession of the study the bam belongs to
         egadir: directory in the EGA upload box that contains/will contain
             the encrypted bam
@@ -334,36 +529,91 @@ def analysisset(paths, md5dir, egastudy, egadir, nodbref=None,
         include_accessioned:
             include ANALYSIS elements where the corresponding file already has
             an `:egaAccession` value recorded in the database (default=False)
+        jobs: number of bam headers to read concurrently (default=1)
+        header_cache: Optional[HeaderCache]. If this is supplied then bams
+            are only opened if there is no current entry for them in the
+            cache, and newly read headers are added to it.
+        db_jobs: number of bulk database queries to run concurrently
+            (default=1)
+        checksum_jobs: number of bams whose md5 files are read concurrently
+            from a directory `md5dir`
+        timings: Optional[dict] updated with the `Pipeline.summary` timings
+            of each stage (checksums, db and bam_header) when done
 
     Raises:
         MetadataConstructionError containing accumulated metadata construction
             errors from all the analyses
     """
-    md5dir = Path(md5dir)
+    return AnalysisSet(analysis=list(iter_analyses(
+        paths, md5dir, egastudy, egadir, nodbref, include_accessioned, jobs,
+        header_cache, db_jobs, checksum_jobs, timings)))
+
+
+def iter_analyses(paths, md5dir, egastudy, egadir, nodbref=None,
+                  include_accessioned=False, jobs=1, header_cache=None,
+                  db_jobs=1, checksum_jobs=CHECKSUM_JOBS, timings=None):
+    """
+    Yields `graflipy.ega.schema_1_5_0.AnalysisType` instances representing
+    `ANALYSIS/ANALYSIS_TYPE/REFERENCE_ALIGNMENT` elements, one at a time as
+    they are built, in the order of `paths`. Use with
+    `graflipy.ega.serialize.SetWriter` to write an `ANALYSIS_SET` without
+    holding all the analyses in memory.
+
+    The md5 reads, database queries and bam header reads for the bams run
+    concurrently as the stages of a `graflipy.ega.pipeline.Pipeline`, each
+    with its own concurrency limit.
+
+    Args:
+        as for `analysisset`
+
+    Raises:
+        MetadataConstructionError containing accumulated metadata construction
+            errors from all the analyses, after the last analysis is yielded
+    """
+    md5 = md5_reader(md5dir)
     paths = [Path(path) for path in paths]
-    analyses, errors = [], []
-    for path in paths:
-        bam = path.name
-        bamgpg = bam + '.gpg'
-        try:
-            analyses.append(
-                analysis_refalign(
+
+    def checksums(path):
+        return md5(path.name), md5(path.name + '.gpg')
+
+    def dbmetas(chunk):
+        found = dbmeta_bams(chunk)
+        return [found[str(path)] for path in chunk]
+
+    stages = [Stage('checksums', checksums, checksum_jobs)]
+    if not nodbref:
+        stages.append(Stage('db', dbmetas, db_jobs, batch=QUERY_CHUNK))
+    stages.append(Stage('bam_header',
+                        partial(_cached_bam_header, cache=header_cache),
+                        jobs))
+    pipeline = Pipeline(stages)
+    errors = []
+    try:
+        # Future.result() re-raises any error from the stage, and the stages
+        # are checked in the same order the old serial steps ran
+        for path, (checksum, *dbmeta, header) in pipeline.run(paths):
+            try:
+                analysis = analysis_refalign(
                     path,
-                    get_md5(md5dir.joinpath(f'{bam}.md5'), bam),
-                    get_md5(md5dir.joinpath(f'{bamgpg}.md5'), bamgpg),
+                    *checksum.result(),
                     egastudy,
                     egadir,
-                    nodbref))
-        except (MetadataConstructionError, FileNotFoundError) as mcerr:
-            errors.append(mcerr)
+                    nodbref,
+                    dbmeta=(None if nodbref else
+                            _single(path, dbmeta[0].result())),
+                    header=header.result())
+            except (MetadataConstructionError, FileNotFoundError) as mcerr:
+                errors.append(mcerr)
+                continue
+            if include_accessioned or not analysis.accession:
+                yield analysis
+    finally:
+        LOGGER.info(MSG_STAGE_TIMES, pipeline.summary())
+        if timings is not None:
+            timings.update(pipeline.summary())
     if errors:
         raise MetadataConstructionError('\n'.join(str(err) for err in errors))
 
-    include = filter(
-        lambda a: include_accessioned or not a.accession, analyses)
-
-    return AnalysisSet(analysis=list(include))
-
 
 def dataset_analysisref(
         alias, title, description, analysis_accessions,
@@ -427,13 +677,16 @@ def datasets(dss):
     return Datasets(dataset=dss)
 
 
-def sample(uuid):
+def sample(uuid, dbmeta=None):
     """
     Returns a `graflipy.ega.schema_1_5_0.SampleType` instance representing a
     `SAMPLE` element
 
     Args:
         uuid: UUID string of the associated `:CollectedSample` in the db
+        dbmeta: Optional[DbMetaSample] already fetched for the sample, e.g.
+            by `dbmeta_samples`. If this is not supplied then the database is
+            queried with `dbmeta_sample`.
 
     Raises:
         MetadataConstructionError if the specified sample is not found in the
@@ -442,7 +695,7 @@ def sample(uuid):
     """
     LOGGER.info('building metadata for collectedsample:%s', uuid)
 
-    dbmeta = dbmeta_sample(uuid)
+    dbmeta = dbmeta or dbmeta_sample(uuid)
 
     return SampleType(
         alias=uuid,
@@ -482,14 +735,9 @@ def sampleset(uuids, include_accessioned=False):
         MetadataConstructionError containing accumulated metadata construction
             errors from all the samples
     """
-    samples, errors = [], []
-    for uuid in uuids:
-        try:
-            samples.append(sample(uuid))
-        except MetadataConstructionError as mcerr:
-            errors.append(mcerr)
-    if errors:
-        raise MetadataConstructionError('; '.join(str(err) for err in errors))
+    uuids = list(uuids)
+    dbmetas = dbmeta_samples(uuids)
+    samples = [sample(uuid, dbmetas[uuid]) for uuid in uuids]
 
     include = filter(lambda s: include_accessioned or not s.accession, samples)
 
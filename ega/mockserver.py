@@ -0,0 +1,395 @@
+"""
+Local stand-in for the EGA REST API, for testing and benchmarking clients
+without network access.
+
+Implements the parts of the API used by `graflipy.ega.client`: `login`,
+`logout`, `submit/` and `{archive}/{accession}` lookups. Submissions are
+answered with RECEIPT XML built from `sra_receipt.Receipt`, and objects
+added by a submission can be looked up afterwards. Latency and error
+responses can be injected, and requests are counted:
+
+    with MockEGAServer(latency=0.05, error_rate=0.1) as server:
+        client = RESTClient(user, password='x', endpoint=server.url)
+        ...
+        print(server.stats.summary())
+"""
+import email.parser
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from lxml import etree
+from xsdata.formats.dataclass.serializers import XmlSerializer
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+from xsdata.models.datatype import XmlDateTime
+
+from graflipy.ega.schema_1_5_0 import Id, IdStatus, Receipt, ReceiptActions
+from graflipy.ega.xmlcontext import schema_context
+
+# EGA accession prefix of each kind of object in a submission
+ACCESSION_PREFIX = {
+    'ANALYSIS': 'EGAZ',
+    'DAC': 'EGAC',
+    'DATASET': 'EGAD',
+    'EXPERIMENT': 'EGAX',
+    'POLICY': 'EGAP',
+    'RUN': 'EGAR',
+    'SAMPLE': 'EGAN',
+    'STUDY': 'EGAS',
+    'SUBMISSION': 'EGAB',
+}
+ERR_ALIAS_USED = 'In %s, alias: "%s" is already used'
+ERR_NO_SUBMISSION = 'No SUBMISSION part in request'
+LOGGER = logging.getLogger(__name__)
+MSG_ADDED = 'Added %s %s as %s'
+MSG_VALIDATED = 'Validated %s %s'
+XMLCONF = SerializerConfig(pretty_print=True)
+
+
+@dataclass
+class ServerStats:
+    """
+    Counts of requests handled by a MockEGAServer, by route
+    """
+    requests: Counter = field(default_factory=Counter)
+    errors_injected: Counter = field(default_factory=Counter)
+    bytes_received: int = 0
+    bytes_sent: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def summary(self):
+        """
+        Returns dict of the counts and requests per second since start
+        """
+        elapsed = time.monotonic() - self.started
+        total = sum(self.requests.values())
+        return {
+            'requests': dict(self.requests),
+            'errors_injected': dict(self.errors_injected),
+            'bytes_received': self.bytes_received,
+            'bytes_sent': self.bytes_sent,
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(total / elapsed, 1) if elapsed else 0,
+        }
+
+
+class MockEGAServer:
+    """
+    In-process EGA REST API stand-in served from a background thread. Use
+    as a context manager or call `start` and `stop`.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=HTTPStatus.SERVICE_UNAVAILABLE,
+                 error_routes=None, seed=None):
+        """
+        Args:
+            host: str address to listen on
+            port: int port to listen on; 0 picks a free port
+            latency: float seconds to delay every response
+            jitter: float max extra random seconds added to `latency`
+            error_rate: float probability in [0, 1] of answering a request
+                with `error_status` instead of handling it
+            error_status: int HTTP status of injected errors
+            error_routes: Optional[set] of routes ('login', 'logout',
+                'submit', 'lookup') subject to error injection; default all
+            seed: Optional[int] seed for latency jitter and error injection
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_routes = error_routes
+        self.random = random.Random(seed)
+        self.stats = ServerStats()
+        self.lock = threading.Lock()
+        self.tokens = set()
+        # {accession: (tag, alias)} and {(tag, alias): accession}
+        self.objects = {}
+        self.aliases = {}
+        self.serials = itertools.count(1)
+        self.serializer = XmlSerializer(context=schema_context(),
+                                        config=XMLCONF)
+        self.httpd = _HTTPServer((host, port), _Handler)
+        self.httpd.mock = self
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        """
+        Base URL of the API, for the client `endpoint` argument
+        """
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def start(self):
+        """
+        Serve requests from a background thread
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop serving and close the socket
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def register(self, tag, alias):
+        """
+        Record an object as if added by a submission
+
+        Args:
+            tag: str element name, e.g. 'ANALYSIS'
+            alias: str
+
+        Returns:
+            str accession of the object
+        """
+        with self.lock:
+            accession = '%s%011d' % (ACCESSION_PREFIX.get(tag, 'EGAX'),
+                                     next(self.serials))
+            self.objects[accession] = (tag, alias)
+            self.aliases[(tag, alias)] = accession
+        return accession
+
+    def receipt(self, action, submission_alias, elements):
+        """
+        Returns RECEIPT XML for a submission
+
+        Args:
+            action: ReceiptActions.ADD or VALIDATE
+            submission_alias: str
+            elements: list of submitted lxml.etree._Element objects, e.g.
+                the ANALYSIS children of an ANALYSIS_SET
+        """
+        receipt = Receipt(
+            success=True,
+            receipt_date=XmlDateTime.from_string(
+                datetime.now().isoformat(timespec='milliseconds')),
+            submission_file='submission.xml',
+            messages=Receipt.Messages(),
+            actions=[action])
+        submitted = [(elem.tag, elem.get('alias')) for elem in elements
+                     if elem.tag in ACCESSION_PREFIX and
+                     elem.tag != 'SUBMISSION']
+        with self.lock:
+            used = [key for key in submitted if key in self.aliases]
+        for tag, alias in submitted:
+            ids = getattr(receipt, tag.lower())
+            if action == ReceiptActions.VALIDATE:
+                ids.append(Id(alias=alias))
+                receipt.messages.info.append(MSG_VALIDATED % (tag, alias))
+            elif used:
+                # like EGA, add nothing if anything can't be added
+                ids.append(Id(alias=alias))
+                if (tag, alias) in used:
+                    receipt.messages.error.append(
+                        ERR_ALIAS_USED % (tag.lower(), alias))
+                receipt.success = False
+            else:
+                accession = self.register(tag, alias)
+                ids.append(Id(alias=alias, accession=accession,
+                              status=IdStatus.PRIVATE))
+                receipt.messages.info.append(
+                    MSG_ADDED % (tag, alias, accession))
+        accession = None
+        if action == ReceiptActions.ADD and receipt.success:
+            accession = self.register('SUBMISSION', submission_alias)
+        receipt.submission = Id(alias=submission_alias, accession=accession)
+        return self.serializer.render(receipt)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    """
+    Thread per connection, with a listen backlog deep enough for highly
+    concurrent clients
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Route requests to the MockEGAServer that owns the HTTP server
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    @property
+    def mock(self):
+        """
+        The MockEGAServer
+        """
+        return self.server.mock
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        LOGGER.debug(format, *args)
+
+    def route(self):
+        """
+        Returns the route name of the request path
+        """
+        path = urlsplit(self.path).path.strip('/')
+        if path in ('login', 'logout', 'submit'):
+            return path
+        return 'lookup' if path.count('/') == 1 else 'unknown'
+
+    def body(self):
+        """
+        Returns the request body
+        """
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.mock.lock:
+            self.mock.stats.bytes_received += len(data)
+        return data
+
+    def respond(self, status, data=b'', content_type='application/json'):
+        """
+        Send a complete response
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with self.mock.lock:
+            self.mock.stats.bytes_sent += len(data)
+
+    def handle_route(self, method):
+        """
+        Apply latency and error injection, count the request and dispatch
+        """
+        route = self.route()
+        mock = self.mock
+        delay = mock.latency + mock.random.uniform(0, mock.jitter)
+        if delay:
+            time.sleep(delay)
+        inject = (mock.error_rate and
+                  (mock.error_routes is None or route in mock.error_routes)
+                  and mock.random.random() < mock.error_rate)
+        with mock.lock:
+            mock.stats.requests[route] += 1
+            if inject:
+                mock.stats.errors_injected[route] += 1
+        if inject:
+            self.body()
+            self.respond(mock.error_status)
+            return
+        handler = getattr(self, f'{method}_{route}', None)
+        if handler is None:
+            self.body()
+            self.respond(HTTPStatus.NOT_FOUND)
+        else:
+            handler()
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        self.handle_route('delete')
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.handle_route('get')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.handle_route('post')
+
+    def post_login(self):
+        """
+        Issue a session token for any credentials
+        """
+        form = parse_qs(self.body().decode())
+        if not form.get('username'):
+            self.respond(HTTPStatus.UNAUTHORIZED)
+            return
+        token = uuid.uuid4().hex
+        with self.mock.lock:
+            self.mock.tokens.add(token)
+        self.respond(HTTPStatus.OK, json.dumps({'response': {'result': [
+            {'session': {'sessionToken': token}}]}}))
+
+    def delete_logout(self):
+        """
+        Invalidate the session token
+        """
+        self.body()
+        with self.mock.lock:
+            self.mock.tokens.discard(self.headers.get('X-Token'))
+        self.respond(HTTPStatus.OK, json.dumps({'response': {}}))
+
+    def post_submit(self):
+        """
+        Accept a multipart submission and answer with a RECEIPT
+        """
+        data = self.body()
+        if not self.headers.get('Authorization'):
+            self.respond(HTTPStatus.UNAUTHORIZED)
+            return
+        message = email.parser.BytesParser().parsebytes(
+            b'Content-Type: ' + self.headers['Content-Type'].encode() +
+            b'\r\n\r\n' + data)
+        parts = {part.get_param('name', header='content-disposition'):
+                 part.get_payload(decode=True)
+                 for part in message.get_payload()}
+        if 'SUBMISSION' not in parts:
+            self.respond(HTTPStatus.BAD_REQUEST, ERR_NO_SUBMISSION,
+                         'text/plain')
+            return
+        try:
+            submission = etree.fromstring(parts.pop('SUBMISSION')).find(
+                './/SUBMISSION')
+            elements = [elem for part in parts.values()
+                        for elem in etree.fromstring(part)]
+        except etree.XMLSyntaxError as err:
+            self.respond(HTTPStatus.BAD_REQUEST, str(err), 'text/plain')
+            return
+        action = (ReceiptActions.VALIDATE
+                  if submission.find('.//VALIDATE') is not None
+                  else ReceiptActions.ADD)
+        self.respond(HTTPStatus.OK,
+                     self.mock.receipt(action, submission.get('alias'),
+                                       elements),
+                     'application/xml')
+
+    def get_lookup(self):
+        """
+        Answer metadata about an object added by a submission
+        """
+        if self.headers.get('X-Token') not in self.mock.tokens:
+            self.respond(HTTPStatus.UNAUTHORIZED)
+            return
+        accession = urlsplit(self.path).path.rstrip('/').rsplit('/', 1)[-1]
+        with self.mock.lock:
+            obj = self.mock.objects.get(accession)
+        if obj is None:
+            self.respond(HTTPStatus.NOT_FOUND)
+            return
+        tag, alias = obj
+        self.respond(HTTPStatus.OK, json.dumps({'response': {
+            'numTotalResults': 1,
+            'result': [{'egaStableId': accession,
+                        'alias': alias,
+                        'objectType': tag.lower(),
+                        'status': IdStatus.PRIVATE.value}]}}))
@@ -0,0 +1,180 @@
+"""
+Run independent I/O-bound stages for a sequence of items concurrently, with
+a separate concurrency limit for each stage, a bound on the number of items
+in flight, and results in input order.
+"""
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+# default max number of items in flight
+DEFAULT_WINDOW = 1024
+
+
+@dataclass
+class Stage:
+    """
+    Helper to organize one stage of a Pipeline
+    """
+    name: str
+    # item -> result, or list of items -> list of results if `batch` is set
+    func: callable
+    workers: int = 1
+    # if set, call `func` once per `batch` consecutive items
+    batch: int = None
+
+
+@dataclass
+class StageTimes:
+    """
+    Cumulative timings of the calls made by a Pipeline stage
+    """
+    workers: int
+    items: int = 0
+    calls: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, items, waited, took):
+        """
+        Record one call of the stage function
+        """
+        self.items += items
+        self.calls += 1
+        self.wait_seconds += waited
+        self.busy_seconds += took
+        self.max_seconds = max(self.max_seconds, took)
+
+
+class Pipeline:
+    """
+    Run every stage for every item, each stage on its own pool of
+    `Stage.workers` threads, and yield the items in input order with a
+    Future of each stage's result. At most `window` items are in flight,
+    i.e. started but not yet yielded.
+
+        pipeline = Pipeline([Stage('db', query, 2), Stage('fs', read, 8)])
+        for item, (dbresult, fsresult) in pipeline.run(items):
+            ...
+        pipeline.summary()
+    """
+
+    def __init__(self, stages, window=DEFAULT_WINDOW):
+        """
+        Args:
+            stages: list of Stage
+            window: int max number of items in flight; raised if necessary
+                so that every worker of a batch stage can have a full batch
+        """
+        self.stages = stages
+        self.window = max([window] + [(stage.batch or 1) * stage.workers
+                                      for stage in stages])
+        self.times = {stage.name: StageTimes(stage.workers)
+                      for stage in stages}
+        self.lock = threading.Lock()
+        self.seconds = 0.0
+
+    def _timed(self, stage, items, queued):
+        """
+        Returns a callable that calls the stage function and records its
+        timings
+        """
+        def call(*args):
+            start = time.monotonic()
+            try:
+                return stage.func(*args)
+            finally:
+                end = time.monotonic()
+                with self.lock:
+                    self.times[stage.name].record(
+                        items, start - queued, end - start)
+        return call
+
+    def _submit(self, executor, stage, item):
+        """
+        Returns a Future of the stage result for one item
+        """
+        return executor.submit(
+            self._timed(stage, 1, time.monotonic()), item)
+
+    def _submit_batch(self, executor, stage, batch, futures):
+        """
+        Call the stage function for a batch of items and resolve each item's
+        Future from its result
+        """
+        def resolve(done):
+            try:
+                results = done.result()
+            except Exception as err:  # pylint: disable=broad-except
+                for future in futures:
+                    future.set_exception(err)
+                return
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+        executor.submit(
+            self._timed(stage, len(batch), time.monotonic()),
+            batch).add_done_callback(resolve)
+
+    def run(self, items):
+        """
+        Yields (item, list of Future) in input order, where the list has one
+        Future per stage in `self.stages` order. Future.result() returns the
+        stage result for the item or raises its error.
+
+        Args:
+            items: iterable of inputs to every stage
+        """
+        items = list(items)
+        start = time.monotonic()
+        executors = [ThreadPoolExecutor(max_workers=stage.workers,
+                                        thread_name_prefix=stage.name)
+                     for stage in self.stages]
+        # per batch stage: (items, Futures) of the batch being filled
+        batches = [([], []) for _ in self.stages]
+        inflight = deque()
+        try:
+            for index, item in enumerate(items):
+                futures = []
+                for stage, executor, (batch, batchfutures) in zip(
+                        self.stages, executors, batches):
+                    if not stage.batch:
+                        futures.append(self._submit(executor, stage, item))
+                        continue
+                    future = Future()
+                    futures.append(future)
+                    batch.append(item)
+                    batchfutures.append(future)
+                    if (len(batch) == stage.batch or
+                            index == len(items) - 1):
+                        self._submit_batch(executor, stage, list(batch),
+                                           list(batchfutures))
+                        batch.clear()
+                        batchfutures.clear()
+                inflight.append((item, futures))
+                if len(inflight) >= self.window:
+                    yield inflight.popleft()
+            while inflight:
+                yield inflight.popleft()
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self.seconds = time.monotonic() - start
+
+    def summary(self):
+        """
+        Returns dict of {stage name: timings} of the last run. `utilization`
+        is the fraction of the run for which the stage's workers were busy:
+        the stage closest to 1 limits throughput.
+        """
+        summary = {}
+        for name, times in self.times.items():
+            summary[name] = asdict(times)
+            summary[name]['utilization'] = round(
+                times.busy_seconds / (times.workers * self.seconds), 3
+            ) if self.seconds else 0.0
+        return summary
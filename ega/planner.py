@@ -0,0 +1,247 @@
+"""
+Split a large ANALYSIS_SET or SAMPLE_SET submission into several smaller
+submissions, and merge their receipts.
+"""
+import io
+import itertools
+import logging
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from lxml import etree
+from xsdata.formats.dataclass.parsers import XmlParser
+
+from graflipy.ega.client import (ERR_FAILED,
+                                 MSG_SUCCEEDED,
+                                 FileUpload,
+                                 SubmissionFailed)
+from graflipy.ega.receipt import RECEIPT_TAGS
+from graflipy.ega.serialize import SetWriter
+from graflipy.ega.xmlcontext import schema_context
+
+CHUNK_ALIAS = '%s (part %s of %s)'
+ERR_CHUNK_FAILED = '%s: %s'
+ERR_NO_LIMIT = 'at least one of max_items or max_bytes is required'
+LOGGER = logging.getLogger(__name__)
+MSG_CHUNK = 'submitting %s: %s items, %s bytes'
+# order of RECEIPT child elements in SRA.receipt.xsd
+RECEIPT_ORDER = RECEIPT_TAGS + ('MESSAGES', 'ACTIONS')
+
+
+@dataclass
+class Chunk:
+    """
+    Helper to organize one submission of a split set
+    """
+    alias: str
+    filename: str
+    data: str
+    count: int
+
+    def upload(self, schema):
+        """
+        Returns a FileUpload of the chunk data
+        """
+        stream = io.StringIO(self.data)
+        stream.name = self.filename
+        return FileUpload(schema, stream)
+
+
+def iter_items(source, set_class, context=None):
+    """
+    Yields the items of a set document one at a time, e.g. the AnalysisType
+    of each ANALYSIS of an ANALYSIS_SET, parsing each child element as it is
+    read and then discarding it, so the whole set is never in memory.
+
+    Args:
+        source: str path or binary file object of the set document
+        set_class: container dataclass with a single list field, e.g.
+            AnalysisSet or SampleSet
+        context: Optional[XmlContext], by default the shared schema context
+    """
+    context = context or schema_context()
+    var = context.build(set_class).get_element_vars()[0]
+    parser = XmlParser(context=context)
+    for _, element in etree.iterparse(source, tag=var.qname):
+        parent = element.getparent()
+        if parent is None or parent.getparent() is not None:
+            continue
+        yield parser.from_bytes(etree.tostring(element), var.clazz)
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def plan_chunks(items, set_class, max_items=None, max_bytes=None,
+                config=None):
+    """
+    Plan the split of the items of a set into chunks that each fit within
+    the limits. A single item that is larger than `max_bytes` gets a chunk
+    of its own. Only the size of each item is kept, so `items` may be a
+    stream, e.g. from `iter_items`.
+
+    Args:
+        items: iterable of the set's items
+        set_class: container dataclass with a single list field, e.g.
+            AnalysisSet or SampleSet
+        max_items: Optional[int] max number of items per chunk
+        max_bytes: Optional[int] max size of chunk XML in UTF-8 bytes
+        config: Optional[SerializerConfig] used to render the chunks
+
+    Returns:
+        list of int number of items in each chunk, for `iter_chunks`
+    """
+    if not (max_items or max_bytes):
+        raise ValueError(ERR_NO_LIMIT)
+    splitter = SetWriter(None, set_class, config)
+    counts, count, size = [], 0, 0
+    for item in items:
+        head, child, tail = splitter.split(item)
+        childsize = len(child.encode())
+        if count and (
+                (max_items and count >= max_items) or
+                (max_bytes and size + childsize > max_bytes)):
+            counts.append(count)
+            count = 0
+        if not count:
+            size = len(head.encode()) + len(tail.encode())
+        count += 1
+        size += childsize
+    if count:
+        counts.append(count)
+    return counts
+
+
+def iter_chunks(items, set_class, counts, alias, filename, config=None):
+    """
+    Yields each Chunk planned by `plan_chunks`, rendering it with a
+    SetWriter only when it is requested, so only the chunks being submitted
+    are held in memory.
+
+    Args:
+        items: iterable of the set's items, as passed to `plan_chunks`
+        set_class: container dataclass with a single list field, e.g.
+            AnalysisSet or SampleSet
+        counts: list of int number of items in each chunk
+        alias: alias of the whole submission; each chunk's alias is derived
+            from it
+        filename: name of the whole set file; each chunk's filename is
+            derived from it
+        config: Optional[SerializerConfig] used to render the chunks
+    """
+    items = iter(items)
+    path = Path(filename)
+    for i, count in enumerate(counts, 1):
+        data = io.StringIO()
+        with SetWriter(data, set_class, config) as writer:
+            for item in itertools.islice(items, count):
+                writer.write(item)
+        yield Chunk(alias=CHUNK_ALIAS % (alias, i, len(counts)),
+                    filename=f'{path.stem}.part{i}{path.suffix}',
+                    data=data.getvalue(),
+                    count=count)
+
+
+def merge_receipts(receipts):
+    """
+    Combine the receipts of several submissions into one RECEIPT
+
+    Args:
+        receipts: list of lxml.etree._Element RECEIPT roots
+
+    Returns:
+        lxml.etree._Element RECEIPT with success="true" only if every
+        receipt was successful, all the child elements of every receipt in
+        schema order, a single MESSAGES containing all messages, and each
+        distinct ACTIONS once
+    """
+    merged = etree.Element('RECEIPT')
+    merged.set('success', 'true' if all(
+        receipt.get('success') == 'true' for receipt in receipts) else 'false')
+    if receipts and receipts[-1].get('receiptDate'):
+        merged.set('receiptDate', receipts[-1].get('receiptDate'))
+    children = {tag: [] for tag in RECEIPT_ORDER}
+    messages = etree.Element('MESSAGES')
+    actions = {}
+    for receipt in receipts:
+        for child in receipt:
+            if child.tag == 'MESSAGES':
+                messages.extend(list(child))
+            elif child.tag == 'ACTIONS':
+                actions.setdefault(child.text, child)
+            else:
+                children.setdefault(child.tag, []).append(child)
+    children['MESSAGES'] = [messages]
+    children['ACTIONS'] = list(actions.values())
+    for tag in RECEIPT_ORDER:
+        merged.extend(children.pop(tag))
+    for elems in children.values():
+        merged.extend(elems)
+    return merged
+
+
+def submit_chunks(client, schema, chunks, action, receiptout, jobs=1):
+    """
+    Submit chunks as separate submissions, at most `jobs` at once, and write
+    their merged receipt. Each chunk is taken from `chunks` only when there
+    is a free job to submit it. If a submission fails outright, e.g. with an
+    HTTP error or a timeout, no further chunks are started, but the receipts
+    of those already submitted are still written, even if rendering the
+    next chunk fails.
+
+    Args:
+        client: RESTClient
+        schema: AddSchema of the chunked set
+        chunks: iterable of Chunk, e.g. from `iter_chunks`
+        action: SubmissionType.Actions.Action.[Add|Validate]
+        receiptout: text buffer to write merged receipt
+        jobs: int max number of concurrent submissions (default=1)
+
+    Raises:
+        SubmissionFailed if any chunk could not be submitted or was not
+            successful, chained from the first error other than
+            SubmissionFailed, if any
+    """
+    def submit(chunk):
+        LOGGER.info(MSG_CHUNK, chunk.alias, chunk.count, len(chunk.data))
+        receipttext, summary = client.submit(
+            [chunk.upload(schema)], action, chunk.alias)
+        for error in summary.errors:
+            LOGGER.error(ERR_CHUNK_FAILED, chunk.alias, error)
+        return etree.fromstring(receipttext.encode())
+
+    receipts, errors, cause = [], [], None
+    chunks = iter(chunks)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            # at most `jobs` chunks are rendered and submitting at once
+            running = deque(
+                (chunk, executor.submit(submit, chunk))
+                for chunk in itertools.islice(chunks, jobs))
+            while running:
+                chunk, future = running.popleft()
+                try:
+                    receipts.append(future.result())
+                # e.g. requests.RequestException: earlier chunks may already
+                # be added at EGA, so their receipts must still be written
+                except Exception as err:  # pylint: disable=broad-except
+                    errors.append(ERR_CHUNK_FAILED % (chunk.alias, err))
+                    if cause is None and not isinstance(
+                            err, SubmissionFailed):
+                        cause = err
+                chunk = None if errors else next(chunks, None)
+                if chunk:
+                    running.append((chunk, executor.submit(submit, chunk)))
+    finally:
+        merged = merge_receipts(receipts)
+        receiptout.write(etree.tostring(
+            merged, encoding='UTF-8', xml_declaration=True,
+            pretty_print=True).decode())
+    if errors:
+        raise SubmissionFailed('\n'.join(errors)) from cause
+    if merged.get('success') != 'true':
+        raise SubmissionFailed(ERR_FAILED)
+    LOGGER.info(MSG_SUCCEEDED)
@@ -0,0 +1,335 @@
+"""
+Checksum, encrypt and checksum files for transfer to EGA.
+
+A Python equivalent of `bin/prepare_data.sh` that runs locally: each file is
+read once, and the plaintext md5, gpg encryption and ciphertext md5 are all
+computed from that single stream. Files are processed concurrently.
+"""
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from graflipy.exceptions import NotifiableError
+
+# size of reads from the input file and from gpg output
+BUFSIZE = 8 * 1024 * 1024
+# id of public key to encrypt with (must be in user's gpg keyring and trusted)
+DEFAULT_KEY_ID = 'European Genome-Phenome Archive'
+ERR_GPG = '%s: gpg exited with status %s'
+ERR_VERIFY = '%s: wrote %s bytes but %s has %s bytes'
+ERR_WRITE = '%s: writing %s failed: %s'
+LOGGER = logging.getLogger(__name__)
+MSG_PREPARED = 'prepared %s: md5 %s, gpg md5 %s'
+MSG_SKIPPED = 'skipping %s: already verified in manifest'
+# manifest states, in order of progress
+PENDING = 'pending'
+HASHING = 'hashing'
+ENCRYPTED = 'encrypted'
+VERIFIED = 'verified'
+
+
+class PreparationError(NotifiableError):
+    """
+    Raise when one or more files could not be prepared
+    """
+
+
+@dataclass
+class PreparedFile:
+    """
+    Helper to organize the results of preparing a file
+    """
+    path: Path
+    size: int
+    md5: str
+    gpg_path: Path
+    gpg_size: int
+    gpg_md5: str
+
+
+class Manifest:
+    """
+    Append-only JSON lines record of file preparation progress, so that an
+    interrupted run can be resumed without redoing completed files.
+
+    Each line is a JSON object with the `path` of a source file, its `state`
+    (one of PENDING, HASHING, ENCRYPTED or VERIFIED) and whatever is known
+    about it so far: source `size` and `mtime_ns`, `md5`, `gpg_path`,
+    `gpg_size` and `gpg_md5`. The last line for a path is its current
+    record. A partially written last line, e.g. after a crash, is ignored.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: location of the manifest; created if necessary
+        """
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.records = {}
+        # True if the last line is unterminated and must be ended before
+        # appending, so that the next record isn't lost with it
+        self.partial = False
+        if self.path.exists():
+            with open(self.path) as lines:
+                for line in lines:
+                    self.partial = not line.endswith('\n')
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.records[record['path']] = record
+
+    def get(self, path):
+        """
+        Returns the current record dict for a source file, or None
+        """
+        return self.records.get(str(path))
+
+    def update(self, path, state, **fields):
+        """
+        Append a new record for a source file, merged with its current one
+
+        Args:
+            path: path of the source file
+            state: new state
+            fields: new field values
+        """
+        with self.lock:
+            record = dict(self.records.get(str(path), {}),
+                          path=str(path), state=state, **fields)
+            with open(self.path, 'a') as out:
+                if self.partial:
+                    out.write('\n')
+                    self.partial = False
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                os.fsync(out.fileno())
+            self.records[str(path)] = record
+
+    def is_complete(self, path):
+        """
+        True if the source file is VERIFIED, unchanged since it was prepared,
+        and its output still exists
+        """
+        record = self.get(path)
+        if not record or record['state'] != VERIFIED:
+            return False
+        try:
+            stat = Path(path).stat()
+            gpg_size = Path(record['gpg_path']).stat().st_size
+        except OSError:
+            return False
+        return ((stat.st_size, stat.st_mtime_ns, gpg_size) ==
+                (record['size'], record['mtime_ns'], record['gpg_size']))
+
+    def md5s(self):
+        """
+        Returns dict of {filename: md5} for the source files and gpg files
+        of all VERIFIED records, in the form returned by
+        `graflipy.ega.checksums.load_md5s`
+        """
+        md5s = {}
+        for record in self.records.values():
+            if record['state'] == VERIFIED:
+                md5s[Path(record['path']).name] = record['md5']
+                md5s[Path(record['gpg_path']).name] = record['gpg_md5']
+        return md5s
+
+
+def write_md5(path, md5, name):
+    """
+    Write a single-line `md5sum`-format file, as read by
+    `graflipy.ega.checksums`
+
+    Args:
+        path: location of the file to write
+        md5: hex digest
+        name: name of the file the digest is for
+    """
+    Path(path).write_text(f'{md5}  {name}\n')
+
+
+def _copy_hashed(source, dest, digest):
+    """
+    Copy binary stream `source` to `dest` in `BUFSIZE` chunks, updating
+    `digest` with each chunk
+
+    Returns:
+        int number of bytes copied
+    """
+    size = 0
+    for chunk in iter(lambda: source.read(BUFSIZE), b''):
+        digest.update(chunk)
+        dest.write(chunk)
+        size += len(chunk)
+    return size
+
+
+def _encrypt(path, gpg_path, key_id, manifest):
+    """
+    Encrypt a file with gpg to `gpg_path`, hashing the plaintext as it is
+    piped to gpg and the gpg output as it is written, for `prepare_file`
+
+    Returns:
+        PreparedFile
+
+    Raises:
+        PreparationError if gpg fails, writing the gpg file fails, or the
+            size of the written gpg file doesn't match what gpg output
+    """
+    md5, gpg_md5 = hashlib.md5(), hashlib.md5()
+    with open(path, 'rb') as infile, open(gpg_path, 'wb') as gpg_out, \
+            subprocess.Popen(['gpg', '--batch', '-r', key_id, '-e'],
+                             stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE) as gpg, \
+            ThreadPoolExecutor(max_workers=1) as reader:
+        # gpg output must be drained while input is written, or both block
+        gpg_size = reader.submit(_copy_hashed, gpg.stdout, gpg_out, gpg_md5)
+        # if draining fails, e.g. the disk is full, gpg blocks on its stdout
+        # and so would the input writer on gpg's stdin: kill gpg to end both
+        gpg_size.add_done_callback(
+            lambda future: future.exception() and gpg.kill())
+        try:
+            size = _copy_hashed(infile, gpg.stdin, md5)
+        except BrokenPipeError:
+            # gpg exited early; reported from its exit status below
+            size = None
+        finally:
+            try:
+                gpg.stdin.close()
+            except BrokenPipeError:
+                pass
+        try:
+            gpg_size = gpg_size.result()
+        except OSError as err:
+            raise PreparationError(ERR_WRITE % (path, gpg_path, err)) from err
+        returncode = gpg.wait()
+    if returncode:
+        raise PreparationError(ERR_GPG % (path, returncode))
+
+    prepared = PreparedFile(path, size, md5.hexdigest(),
+                            gpg_path, gpg_size, gpg_md5.hexdigest())
+    if manifest:
+        manifest.update(path, ENCRYPTED, **_record_fields(prepared))
+
+    written = gpg_path.stat().st_size
+    if written != gpg_size:
+        raise PreparationError(
+            ERR_VERIFY % (path, gpg_size, gpg_path, written))
+    return prepared
+
+
+def prepare_file(path, outputdir, key_id=DEFAULT_KEY_ID, manifest=None):
+    """
+    Encrypt a file with gpg, writing [file].gpg, [file].md5 and
+    [file].gpg.md5 to `outputdir`. The input is read once: the plaintext
+    is hashed as it is piped to gpg, and gpg output is hashed as it is
+    written. The .md5 files are only written once encryption has succeeded.
+
+    Args:
+        path: path of the file to prepare
+        outputdir: directory for the output files
+        key_id: id of the gpg public key to encrypt with
+        manifest: Optional[Manifest]. If this is supplied then progress is
+            recorded in it, and the file is skipped if the manifest shows it
+            has already been prepared.
+
+    Returns:
+        PreparedFile
+
+    Raises:
+        PreparationError if gpg fails, writing the gpg file fails, or the
+            size of the written gpg file doesn't match what gpg output. The
+            partial [file].gpg is removed first.
+    """
+    path = Path(path)
+    outputdir = Path(outputdir)
+    name = path.name
+    gpg_path = outputdir / f'{name}.gpg'
+
+    if manifest and manifest.is_complete(path):
+        LOGGER.info(MSG_SKIPPED, path)
+        record = manifest.get(path)
+        return PreparedFile(
+            path, record['size'], record['md5'], Path(record['gpg_path']),
+            record['gpg_size'], record['gpg_md5'])
+
+    LOGGER.info('preparing %s', path)
+    stat = path.stat()
+    if manifest:
+        manifest.update(path, HASHING, size=stat.st_size,
+                        mtime_ns=stat.st_mtime_ns)
+
+    try:
+        prepared = _encrypt(path, gpg_path, key_id, manifest)
+    except BaseException:
+        # don't leave a partial gpg file that could be taken for output
+        gpg_path.unlink(missing_ok=True)
+        raise
+    write_md5(outputdir / f'{name}.md5', prepared.md5, name)
+    write_md5(outputdir / f'{name}.gpg.md5', prepared.gpg_md5, gpg_path.name)
+    if manifest:
+        manifest.update(path, VERIFIED)
+    LOGGER.info(MSG_PREPARED, path, prepared.md5, prepared.gpg_md5)
+    return prepared
+
+
+def _record_fields(prepared):
+    """
+    Returns the fields of a PreparedFile as JSON-serializable manifest fields
+    """
+    fields = asdict(prepared)
+    del fields['path']
+    fields['gpg_path'] = str(prepared.gpg_path)
+    return fields
+
+
+def prepare_files(paths, outputdir, key_id=DEFAULT_KEY_ID, jobs=1,
+                  manifest=None):
+    """
+    Prepare many files concurrently with `prepare_file`
+
+    Args:
+        paths: paths of the files to prepare
+        outputdir: directory for the output files
+        key_id: id of the gpg public key to encrypt with
+        jobs: number of files to prepare concurrently (default=1)
+        manifest: Optional[Manifest] to record progress in. Files already
+            prepared according to the manifest are skipped, and any others
+            are redone from the start.
+
+    Returns:
+        list of PreparedFile in the order of `paths`
+
+    Raises:
+        PreparationError containing accumulated errors from all the files,
+            after all the files have been attempted
+    """
+    prepared, errors = [], []
+    paths = [Path(path).resolve() for path in paths]
+    if manifest:
+        for path in paths:
+            if not manifest.is_complete(path):
+                manifest.update(path, PENDING)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(prepare_file, path, outputdir, key_id,
+                                   manifest)
+                   for path in paths]
+        for future in futures:
+            try:
+                prepared.append(future.result())
+            except (PreparationError, OSError) as err:
+                errors.append(err)
+    if errors:
+        raise PreparationError('\n'.join(str(err) for err in errors))
+    return prepared
@@ -0,0 +1,130 @@
+"""
+Streaming readers for EGA receipts and other SRA XML documents, which may be
+far too large to parse into a tree
+"""
+import io
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from lxml import etree
+
+# tags of the receipt elements that identify submitted objects, in their
+# order in SRA.receipt.xsd
+RECEIPT_TAGS = ('ANALYSIS', 'EXPERIMENT', 'RUN', 'SAMPLE', 'SAMPLEGROUP',
+                'STUDY', 'DAC', 'POLICY', 'DATASET', 'PROJECT', 'CHECKLIST',
+                'SUBMISSION')
+
+
+@dataclass
+class ReceiptSummary:
+    """
+    Helper to organize the outcome of a submission as reported by its
+    RECEIPT
+    """
+    success: bool = False
+    receipt_date: str = None
+    # {tag: {alias: accession}}, e.g. {'ANALYSIS': {'uuid': 'EGAZ...'}}
+    accessions: dict = field(default_factory=lambda: defaultdict(dict))
+    # {status: count} of the identified objects, e.g. {'PRIVATE': 10}
+    statuses: Counter = field(default_factory=Counter)
+    errors: list = field(default_factory=list)
+    infos: list = field(default_factory=list)
+    actions: list = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, source):
+        """
+        Summarize a RECEIPT in a single streaming pass, without binding it
+        to the `sra_receipt.Receipt` dataclasses
+
+        Args:
+            source: bytes of the receipt XML, or a path or binary file-like
+                object
+
+        Raises:
+            lxml.etree.XMLSyntaxError if the receipt is not well-formed
+        """
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        summary = cls()
+        for elem in _iter_ended(source):
+            tag = elem.tag
+            if tag in RECEIPT_TAGS:
+                summary.accessions[tag][elem.get('alias')] = elem.get(
+                    'accession')
+                if elem.get('status'):
+                    summary.statuses[elem.get('status')] += 1
+            elif tag == 'ERROR':
+                summary.errors.append(elem.text)
+            elif tag == 'INFO':
+                summary.infos.append(elem.text)
+            elif tag == 'ACTIONS':
+                summary.actions.append(elem.text)
+            elif tag == 'RECEIPT':
+                summary.success = elem.get('success') == 'true'
+                summary.receipt_date = elem.get('receiptDate')
+        return summary
+
+    @property
+    def counts(self):
+        """
+        Returns dict of {tag: number of identified objects}
+        """
+        return {tag: len(ids) for tag, ids in self.accessions.items()}
+
+
+def _iter_ended(source):
+    """
+    Yield each element of the document as it ends, then clear it and remove
+    it from its parent, so memory use does not depend on the size of the
+    document. Only the attributes and text of the yielded element itself
+    are available; its children have already been cleared.
+    """
+    for _, elem in etree.iterparse(source, events=('end',)):
+        yield elem
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def iter_ids(source, tags=RECEIPT_TAGS, alias_attribute='alias'):
+    """
+    Yield the identifying attributes of every element with one of `tags`,
+    in a single streaming pass over the document
+
+    Args:
+        source: path or binary file-like object of the XML document
+        tags: element names to report
+        alias_attribute: name of the attribute reported as the alias, e.g.
+            'refname' for SAMPLE_REF elements in ANALYSIS.xml
+
+    Yields:
+        (str tag, Optional[str] alias, Optional[str] accession) in document
+        order
+    """
+    tags = frozenset(tags)
+    for elem in _iter_ended(source):
+        if elem.tag in tags:
+            yield elem.tag, elem.get(alias_attribute), elem.get('accession')
+
+
+def tag_attribute(source, tag, attribute):
+    """
+    Returns the distinct values of an attribute of all elements with `tag`,
+    in document order. A streaming replacement for
+    `graflipy.util.get_tag_attribute`.
+
+    Args:
+        source: path or binary file-like object of the XML document
+        tag: element name
+        attribute: attribute name
+
+    Returns:
+        list of str
+    """
+    return list(dict.fromkeys(
+        value for _, value, _ in iter_ids(source, (tag,), attribute)
+        if value is not None))
@@ -1,178 +1,212 @@
-from graflipy.ega.schema_1_5_0.ega_dac import (
-    Dac,
-    DacSet,
-    DacSetType,
-    DacType,
-)
-from graflipy.ega.schema_1_5_0.ega_dataset import (
-    Dataset,
-    Datasets,
-    DatasetType,
-    DatasetTypeDatasetType,
-    DatasetsType,
-)
-from graflipy.ega.schema_1_5_0.ega_policy import (
-    Policy,
-    PolicySet,
-    PolicySetType,
-    PolicyType,
-)
-from graflipy.ega.schema_1_5_0.ena_assembly import (
-    Assembly,
-    AssemblySet,
-    AssemblySetType,
-    AssemblyType,
-    AssemblyTypeAssemblyLevel,
-    AssemblyTypeGenomeRepresentation,
-    ChromosomeType,
-)
-from graflipy.ega.schema_1_5_0.ena_checklist import (
-    Checklist,
-    ChecklistSet,
-    ChecklistSetType,
-    ChecklistType,
-    ChecklistTypeChecklistType,
-    FieldGroupRestrictionType,
-    FieldMandatory,
-    FieldMultiplicity,
-    TaxonFieldRestrictionType,
-)
-from graflipy.ega.schema_1_5_0.ena_embl import (
-    EntryType,
-    EntryTypeTopology,
-    XrefType,
-    Entry,
-    EntrySet,
-    ReferenceType,
-)
-from graflipy.ega.schema_1_5_0.ena_project import (
-    OrganismType,
-    Project,
-    ProjectSet,
-    ProjectSetType,
-    ProjectType,
-    PublicationType,
-)
-from graflipy.ega.schema_1_5_0.ena_root import (
-    EntrySetType,
-    Root,
-    RootType,
-    TaxonSetType,
-)
-from graflipy.ega.schema_1_5_0.ena_sample_group import (
-    SampleGroup,
-    SampleGroupSet,
-    SampleGroupSetType,
-    SampleGroupType,
-)
-from graflipy.ega.schema_1_5_0.ena_taxonomy import (
-    ChildTaxonType,
-    ParentTaxonType,
-    TaxonType,
-    SynonymType,
-    Taxon,
-    TaxonSet,
-)
-from graflipy.ega.schema_1_5_0.sra_analysis import (
-    Analysis,
-    AnalysisSet,
-    AnalysisFileType,
-    AnalysisFileTypeChecksumMethod,
-    AnalysisFileTypeFiletype,
-    AnalysisSetType,
-    AnalysisType,
-    GenomeMapPlatform,
-    SequenceAssemblyMolType,
-    SequenceVariationExperimentType,
-)
-from graflipy.ega.schema_1_5_0.sra_common import (
-    AttributeType,
-    BasecallMatchEdge,
-    IdentifierType,
-    LinkType,
-    NameType,
-    PipelineType,
-    PlatformType,
-    ProcessingType,
-    QualifiedNameType,
-    ReadSpecReadClass,
-    ReadSpecReadType,
-    ReferenceAssemblyType,
-    ReferenceSequenceType,
-    SequencingDirectivesType,
-    SequencingDirectivesTypeSampleDemuxDirective,
-    SpotDescriptorType,
-    Urltype,
-    XrefType,
-    Type454Model,
-    TypeAbiSolidModel,
-    TypeCgmodel,
-    TypeCapillaryModel,
-    TypeHelicosModel,
-    TypeIlluminaModel,
-    TypeIontorrentModel,
-    TypeOxfordNanoporeModel,
-    TypePacBioModel,
-)
-from graflipy.ega.schema_1_5_0.sra_experiment import (
-    Experiment,
-    ExperimentSet,
-    ExperimentSetType,
-    ExperimentType,
-    LocusLocusName,
-    LibraryDescriptorType,
-    LibraryType,
-    PoolMemberType,
-    SampleDescriptorType,
-    TypeLibrarySelection,
-    TypeLibrarySource,
-    TypeLibraryStrategy,
-)
-from graflipy.ega.schema_1_5_0.sra_receipt import (
-    ExtIdType,
-    Id,
-    IdStatus,
-    Receipt,
-    ReceiptActions,
-)
-from graflipy.ega.schema_1_5_0.sra_run import (
-    FileAsciiOffset,
-    FileChecksumMethod,
-    FileFiletype,
-    FileQualityEncoding,
-    FileQualityScoringSystem,
-    Run,
-    RunSet,
-    RunSetType,
-    RunType,
-)
-from graflipy.ega.schema_1_5_0.sra_sample import (
-    Sample,
-    SampleSet,
-    SampleSetType,
-    SampleType,
-)
-from graflipy.ega.schema_1_5_0.sra_study import (
-    Study,
-    StudySet,
-    StudyTypeExistingStudyType,
-    StudySetType,
-    StudyType,
-)
-from graflipy.ega.schema_1_5_0.sra_submission import (
-    AddSchema,
-    ModifySchema,
-    Submission,
-    SubmissionSet,
-    SubmissionSetType,
-    SubmissionType,
-    ValidateSchema,
-)
+import importlib
 
+_SUBMODULE_NAMES = {
+    'ega_dac': (
+        'Dac',
+        'DacSet',
+        'DacSetType',
+        'DacType',
+    ),
+    'ega_dataset': (
+        'Dataset',
+        'Datasets',
+        'DatasetType',
+        'DatasetTypeDatasetType',
+        'DatasetsType',
+    ),
+    'ega_policy': (
+        'Policy',
+        'PolicySet',
+        'PolicySetType',
+        'PolicyType',
+    ),
+    'ena_assembly': (
+        'Assembly',
+        'AssemblySet',
+        'AssemblySetType',
+        'AssemblyType',
+        'AssemblyTypeAssemblyLevel',
+        'AssemblyTypeGenomeRepresentation',
+        'ChromosomeType',
+    ),
+    'ena_checklist': (
+        'Checklist',
+        'ChecklistSet',
+        'ChecklistSetType',
+        'ChecklistType',
+        'ChecklistTypeChecklistType',
+        'FieldGroupRestrictionType',
+        'FieldMandatory',
+        'FieldMultiplicity',
+        'TaxonFieldRestrictionType',
+    ),
+    'ena_embl': (
+        'EntryType',
+        'EntryTypeTopology',
+        'XrefType',
+        'Entry',
+        'EntrySet',
+        'ReferenceType',
+    ),
+    'ena_project': (
+        'OrganismType',
+        'Project',
+        'ProjectSet',
+        'ProjectSetType',
+        'ProjectType',
+        'PublicationType',
+    ),
+    'ena_root': (
+        'EntrySetType',
+        'Root',
+        'RootType',
+        'TaxonSetType',
+    ),
+    'ena_sample_group': (
+        'SampleGroup',
+        'SampleGroupSet',
+        'SampleGroupSetType',
+        'SampleGroupType',
+    ),
+    'ena_taxonomy': (
+        'ChildTaxonType',
+        'ParentTaxonType',
+        'TaxonType',
+        'SynonymType',
+        'Taxon',
+        'TaxonSet',
+    ),
+    'sra_analysis': (
+        'Analysis',
+        'AnalysisSet',
+        'AnalysisFileType',
+        'AnalysisFileTypeChecksumMethod',
+        'AnalysisFileTypeFiletype',
+        'AnalysisSetType',
+        'AnalysisType',
+        'GenomeMapPlatform',
+        'SequenceAssemblyMolType',
+        'SequenceVariationExperimentType',
+    ),
+    'sra_common': (
+        'AttributeType',
+        'BasecallMatchEdge',
+        'IdentifierType',
+        'LinkType',
+        'NameType',
+        'PipelineType',
+        'PlatformType',
+        'ProcessingType',
+        'QualifiedNameType',
+        'ReadSpecReadClass',
+        'ReadSpecReadType',
+        'ReferenceAssemblyType',
+        'ReferenceSequenceType',
+        'SequencingDirectivesType',
+        'SequencingDirectivesTypeSampleDemuxDirective',
+        'SpotDescriptorType',
+        'Urltype',
+        'XrefType',
+        'Type454Model',
+        'TypeAbiSolidModel',
+        'TypeCgmodel',
+        'TypeCapillaryModel',
+        'TypeHelicosModel',
+        'TypeIlluminaModel',
+        'TypeIontorrentModel',
+        'TypeOxfordNanoporeModel',
+        'TypePacBioModel',
+    ),
+    'sra_experiment': (
+        'Experiment',
+        'ExperimentSet',
+        'ExperimentSetType',
+        'ExperimentType',
+        'LocusLocusName',
+        'LibraryDescriptorType',
+        'LibraryType',
+        'PoolMemberType',
+        'SampleDescriptorType',
+        'TypeLibrarySelection',
+        'TypeLibrarySource',
+        'TypeLibraryStrategy',
+    ),
+    'sra_receipt': (
+        'ExtIdType',
+        'Id',
+        'IdStatus',
+        'Receipt',
+        'ReceiptActions',
+    ),
+    'sra_run': (
+        'FileAsciiOffset',
+        'FileChecksumMethod',
+        'FileFiletype',
+        'FileQualityEncoding',
+        'FileQualityScoringSystem',
+        'Run',
+        'RunSet',
+        'RunSetType',
+        'RunType',
+    ),
+    'sra_sample': (
+        'Sample',
+        'SampleSet',
+        'SampleSetType',
+        'SampleType',
+    ),
+    'sra_study': (
+        'Study',
+        'StudySet',
+        'StudyTypeExistingStudyType',
+        'StudySetType',
+        'StudyType',
+    ),
+    'sra_submission': (
+        'AddSchema',
+        'ModifySchema',
+        'Submission',
+        'SubmissionSet',
+        'SubmissionSetType',
+        'SubmissionType',
+        'ValidateSchema',
+    ),
+}
 # below here added manually
 
+# The generated `from .submodule import (...)` statements are rewritten as
+# the _SUBMODULE_NAMES table above so that submodules are only imported on
+# first access of one of their names, rather than all of them on import of
+# this package.
+_NAME_SUBMODULE = {
+    name: submodule
+    for submodule, names in _SUBMODULE_NAMES.items()
+    for name in names
+}
+
+def __getattr__(name):
+    """
+    Import the submodule defining `name` on first access (PEP 562)
+    """
+    try:
+        submodule = _NAME_SUBMODULE[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(importlib.import_module(f'.{submodule}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAME_SUBMODULE))
+
+
 XSI = 'http://www.w3.org/2001/XMLSchema-instance'
 ANALYSISXSD = 'ftp://ftp.sra.ebi.ac.uk/meta/xsd/sra_1_5/SRA.analysis.xsd'
 DATASETXSD = 'ftp://ftp.sra.ebi.ac.uk/meta/xsd/sra_1_5/EGA.dataset.xsd'
 SAMPLEXSD = 'ftp://ftp.sra.ebi.ac.uk/meta/xsd/sra_1_5/SRA.sample.xsd'
 SUBMISSIONXSD = 'ftp://ftp.sra.ebi.ac.uk/meta/xsd/sra_1_5/SRA.submission.xsd'
+
+__all__ = sorted(_NAME_SUBMODULE) + [
+    'ANALYSISXSD', 'DATASETXSD', 'SAMPLEXSD', 'SUBMISSIONXSD', 'XSI']
@@ -7,7 +7,7 @@ from graflipy.ega.schema_1_5_0.sra_common import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class DacType:
     """
     Describes an object that contains data access comittee  information
@@ -102,7 +102,7 @@ class DacType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Contacts:
         contact: List["DacType.Contacts.Contact"] = field(
             default_factory=list,
@@ -114,7 +114,7 @@ class DacType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Contact:
             """
             :ivar name: Name of contact person for this DAC.
@@ -158,7 +158,7 @@ class DacType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class DacLinks:
         dac_link: List[LinkType] = field(
             default_factory=list,
@@ -170,7 +170,7 @@ class DacType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class DacAttributes:
         dac_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -183,13 +183,13 @@ class DacType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Dac(DacType):
     class Meta:
         name = "DAC"
 
 
-@dataclass
+@dataclass(slots=True)
 class DacSetType:
     dac: List[Dac] = field(
         default_factory=list,
@@ -201,7 +201,7 @@ class DacSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DacSet(DacSetType):
     """
     Container for a set of data access policies.
@@ -25,7 +25,7 @@ class DatasetTypeDatasetType(Enum):
     CHIP_SEQ = "Chip-Seq"
 
 
-@dataclass
+@dataclass(slots=True)
 class DatasetType:
     """
     Describes an object that contains the samples in the data set.
@@ -159,7 +159,7 @@ class DatasetType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class RunRef:
         """
         :ivar identifiers:
@@ -200,7 +200,7 @@ class DatasetType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class AnalysisRef:
         """
         :ivar identifiers:
@@ -241,7 +241,7 @@ class DatasetType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class PolicyRef:
         """
         :ivar identifiers:
@@ -282,7 +282,7 @@ class DatasetType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class DatasetLinks:
         dataset_link: List[LinkType] = field(
             default_factory=list,
@@ -294,7 +294,7 @@ class DatasetType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class DatasetAttributes:
         dataset_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -307,13 +307,13 @@ class DatasetType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Dataset(DatasetType):
     class Meta:
         name = "DATASET"
 
 
-@dataclass
+@dataclass(slots=True)
 class DatasetsType:
     dataset: List[Dataset] = field(
         default_factory=list,
@@ -325,7 +325,7 @@ class DatasetsType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class Datasets(DatasetsType):
     """
     Container for a set of data sets.
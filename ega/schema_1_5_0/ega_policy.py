@@ -7,7 +7,7 @@ from graflipy.ega.schema_1_5_0.sra_common import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicyType:
     """
     Describes an object that contains data access policy information.
@@ -121,7 +121,7 @@ class PolicyType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class DacRef:
         """
         :ivar identifiers:
@@ -162,7 +162,7 @@ class PolicyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class PolicyLinks:
         policy_link: List[LinkType] = field(
             default_factory=list,
@@ -174,7 +174,7 @@ class PolicyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class PolicyAttributes:
         policy_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -187,7 +187,7 @@ class PolicyType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Policy(PolicyType):
     """
     Data access policy.
@@ -196,7 +196,7 @@ class Policy(PolicyType):
         name = "POLICY"
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicySetType:
     policy: List[Policy] = field(
         default_factory=list,
@@ -208,7 +208,7 @@ class PolicySetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicySet(PolicySetType):
     """
     Container for a set of data access policies.
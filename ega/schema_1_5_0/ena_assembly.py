@@ -45,7 +45,7 @@ class ChromosomeType(Enum):
     CYANELLE = "Cyanelle"
 
 
-@dataclass
+@dataclass(slots=True)
 class AssemblyType:
     """
     :ivar identifiers:
@@ -210,7 +210,7 @@ class AssemblyType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Taxon:
         taxon_id: Optional[int] = field(
             default=None,
@@ -246,7 +246,7 @@ class AssemblyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class SampleRef:
         """
         :ivar identifiers:
@@ -287,7 +287,7 @@ class AssemblyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class StudyRef:
         """
         :ivar identifiers:
@@ -328,7 +328,7 @@ class AssemblyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class WgsSet:
         prefix: Optional[str] = field(
             default=None,
@@ -349,7 +349,7 @@ class AssemblyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Chromosomes:
         chromosome: List["AssemblyType.Chromosomes.Chromosome"] = field(
             default_factory=list,
@@ -361,7 +361,7 @@ class AssemblyType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Chromosome:
             name: Optional[str] = field(
                 default=None,
@@ -387,7 +387,7 @@ class AssemblyType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class AssemblyLinks:
         assembly_link: List[LinkType] = field(
             default_factory=list,
@@ -399,7 +399,7 @@ class AssemblyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class AssemblyAttributes:
         assembly_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -412,13 +412,13 @@ class AssemblyType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Assembly(AssemblyType):
     class Meta:
         name = "ASSEMBLY"
 
 
-@dataclass
+@dataclass(slots=True)
 class AssemblySetType:
     assembly: List[Assembly] = field(
         default_factory=list,
@@ -430,7 +430,7 @@ class AssemblySetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class AssemblySet(AssemblySetType):
     """
     A container of assembly objects.
@@ -37,7 +37,7 @@ class TaxonFieldRestrictionType(Enum):
     NOT_PERMITTED_TAXA = "Not permitted taxa"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChecklistType:
     """
     :ivar identifiers:
@@ -106,7 +106,7 @@ class ChecklistType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Descriptor:
         """
         :ivar label: A unique immutable label for the checklist used for
@@ -170,7 +170,7 @@ class ChecklistType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class FieldGroup:
             """
             :ivar name: The name of the checklist group for display
@@ -214,7 +214,7 @@ class ChecklistType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class FieldType:
                 """
                 :ivar label: A unique immutable label for the field for
@@ -301,7 +301,7 @@ class ChecklistType:
                     }
                 )
 
-                @dataclass
+                @dataclass(slots=True)
                 class Units:
                     unit: List[str] = field(
                         default_factory=list,
@@ -313,7 +313,7 @@ class ChecklistType:
                         }
                     )
 
-                @dataclass
+                @dataclass(slots=True)
                 class FieldType:
                     """
                     :ivar text_field: A single-line text field.
@@ -373,7 +373,7 @@ class ChecklistType:
                         }
                     )
 
-                    @dataclass
+                    @dataclass(slots=True)
                     class TextField:
                         """
                         :ivar min_length: Minimum string length.
@@ -405,7 +405,7 @@ class ChecklistType:
                             }
                         )
 
-                    @dataclass
+                    @dataclass(slots=True)
                     class TextAreaField:
                         """
                         :ivar min_length: Minimum string length.
@@ -428,7 +428,7 @@ class ChecklistType:
                             }
                         )
 
-                    @dataclass
+                    @dataclass(slots=True)
                     class TextChoiceField:
                         text_value: List["ChecklistType.Descriptor.FieldGroup.FieldType.FieldType.TextChoiceField.TextValue"] = field(
                             default_factory=list,
@@ -440,7 +440,7 @@ class ChecklistType:
                             }
                         )
 
-                        @dataclass
+                        @dataclass(slots=True)
                         class TextValue:
                             """
                             :ivar value: Allowed text value.
@@ -465,7 +465,7 @@ class ChecklistType:
                                 }
                             )
 
-                    @dataclass
+                    @dataclass(slots=True)
                     class TaxonField:
                         """
                         :ivar taxon: Taxid.
@@ -487,7 +487,7 @@ class ChecklistType:
                             }
                         )
 
-                    @dataclass
+                    @dataclass(slots=True)
                     class OntologyField:
                         """
                         :ivar label: A unique immutable label for the
@@ -524,7 +524,7 @@ class ChecklistType:
                             }
                         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Condition:
             """
             :ivar label: A unique immutable label for referencing
@@ -581,13 +581,13 @@ class ChecklistType:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class Checklist(ChecklistType):
     class Meta:
         name = "CHECKLIST"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChecklistSetType:
     checklist: List[ChecklistType] = field(
         default_factory=list,
@@ -600,7 +600,7 @@ class ChecklistSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ChecklistSet(ChecklistSetType):
     class Meta:
         name = "CHECKLIST_SET"
@@ -9,7 +9,7 @@ class EntryTypeTopology(Enum):
     LINEAR = "linear"
 
 
-@dataclass
+@dataclass(slots=True)
 class XrefType:
     """
     Database cross-reference.
@@ -46,7 +46,7 @@ class ReferenceType(Enum):
     UNPUBLISHED = "unpublished"
 
 
-@dataclass
+@dataclass(slots=True)
 class EntryType:
     """
     :ivar secondary_accession:
@@ -231,7 +231,7 @@ class EntryType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Reference:
         """
         :ivar title:
@@ -368,7 +368,7 @@ class EntryType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Feature:
         """
         :ivar taxon:
@@ -410,7 +410,7 @@ class EntryType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Taxon:
             lineage: Optional["EntryType.Feature.Taxon.Lineage"] = field(
                 default=None,
@@ -441,7 +441,7 @@ class EntryType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class Lineage:
                 taxon: List["EntryType.Feature.Taxon.Lineage.Taxon"] = field(
                     default_factory=list,
@@ -451,7 +451,7 @@ class EntryType:
                     }
                 )
 
-                @dataclass
+                @dataclass(slots=True)
                 class Taxon:
                     scientific_name: Optional[str] = field(
                         default=None,
@@ -462,7 +462,7 @@ class EntryType:
                         }
                     )
 
-        @dataclass
+        @dataclass(slots=True)
         class Qualifier:
             value: Optional[str] = field(
                 default=None,
@@ -478,7 +478,7 @@ class EntryType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class Assembly:
         range: List["EntryType.Assembly.Range"] = field(
             default_factory=list,
@@ -488,7 +488,7 @@ class EntryType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Range:
             begin: Optional[int] = field(
                 default=None,
@@ -539,7 +539,7 @@ class EntryType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class Contig:
         range: List["EntryType.Contig.Range"] = field(
             default_factory=list,
@@ -556,7 +556,7 @@ class EntryType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Range:
             begin: Optional[int] = field(
                 default=None,
@@ -607,7 +607,7 @@ class EntryType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class Gap:
             begin: Optional[int] = field(
                 default=None,
@@ -639,13 +639,13 @@ class EntryType:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class Entry(EntryType):
     class Meta:
         name = "entry"
 
 
-@dataclass
+@dataclass(slots=True)
 class EntrySet:
     class Meta:
         name = "entrySet"
@@ -9,7 +9,7 @@ from graflipy.ega.schema_1_5_0.sra_common import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class OrganismType:
     taxon_id: Optional[int] = field(
         default=None,
@@ -71,7 +71,7 @@ class OrganismType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class PublicationType:
     unstructured_citation: Optional[str] = field(
         default=None,
@@ -98,7 +98,7 @@ class PublicationType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class StructuredCitation:
         title: Optional[str] = field(
             default=None,
@@ -167,7 +167,7 @@ class PublicationType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Authors:
             author: List[str] = field(
                 default_factory=list,
@@ -186,7 +186,7 @@ class PublicationType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class PublicationLinks:
         publication_link: List["PublicationType.PublicationLinks.PublicationLink"] = field(
             default_factory=list,
@@ -198,7 +198,7 @@ class PublicationType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class PublicationLink:
             xref_link: Optional[XrefType] = field(
                 default=None,
@@ -210,7 +210,7 @@ class PublicationType:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectType:
     """
     :ivar identifiers:
@@ -361,7 +361,7 @@ class ProjectType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Publications:
         publication: List[PublicationType] = field(
             default_factory=list,
@@ -373,7 +373,7 @@ class ProjectType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Collaborators:
         collaborator: List[str] = field(
             default_factory=list,
@@ -385,7 +385,7 @@ class ProjectType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class RelatedProjects:
         related_project: List["ProjectType.RelatedProjects.RelatedProject"] = field(
             default_factory=list,
@@ -397,7 +397,7 @@ class ProjectType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class RelatedProject:
             parent_project: Optional["ProjectType.RelatedProjects.RelatedProject.ParentProject"] = field(
                 default=None,
@@ -424,7 +424,7 @@ class ProjectType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class ParentProject:
                 """
                 :ivar accession: Identifies the project using
@@ -438,7 +438,7 @@ class ProjectType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class ChildProject:
                 """
                 :ivar accession: Identifies the project using
@@ -452,7 +452,7 @@ class ProjectType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class PeerProject:
                 """
                 :ivar accession: Identifies the project using
@@ -466,7 +466,7 @@ class ProjectType:
                     }
                 )
 
-    @dataclass
+    @dataclass(slots=True)
     class ProjectLinks:
         project_link: List["ProjectType.ProjectLinks.ProjectLink"] = field(
             default_factory=list,
@@ -478,7 +478,7 @@ class ProjectType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class ProjectLink:
             xref_link: Optional[XrefType] = field(
                 default=None,
@@ -497,7 +497,7 @@ class ProjectType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class ProjectAttributes:
         project_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -509,7 +509,7 @@ class ProjectType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class SubmissionProject:
         sequencing_project: Optional["ProjectType.SubmissionProject.SequencingProject"] = field(
             default=None,
@@ -528,7 +528,7 @@ class ProjectType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class SequencingProject:
             locus_tag_prefix: List[str] = field(
                 default_factory=list,
@@ -539,7 +539,7 @@ class ProjectType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class UmbrellaProject:
         organism: Optional[OrganismType] = field(
             default=None,
@@ -551,13 +551,13 @@ class ProjectType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Project(ProjectType):
     class Meta:
         name = "PROJECT"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectSetType:
     project: List[ProjectType] = field(
         default_factory=list,
@@ -570,7 +570,7 @@ class ProjectSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectSet(ProjectSetType):
     class Meta:
         name = "PROJECT_SET"
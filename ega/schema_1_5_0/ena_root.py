@@ -32,7 +32,7 @@ from graflipy.ega.schema_1_5_0.sra_submission import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class EntrySetType:
     entry: List[EntryType] = field(
         default_factory=list,
@@ -44,7 +44,7 @@ class EntrySetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxonSetType:
     taxon: List[TaxonType] = field(
         default_factory=list,
@@ -56,7 +56,7 @@ class TaxonSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RootType:
     """
     A container for any combination of ENA objects.
@@ -229,7 +229,7 @@ class RootType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class Root(RootType):
     class Meta:
         name = "ROOT"
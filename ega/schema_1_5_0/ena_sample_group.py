@@ -3,7 +3,7 @@ from typing import List, Optional
 from graflipy.ega.schema_1_5_0.sra_common import IdentifierType
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleGroupType:
     """
     :ivar identifiers:
@@ -83,7 +83,7 @@ class SampleGroupType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Descriptor:
         """
         :ivar checklist_ref: The checklist.
@@ -127,7 +127,7 @@ class SampleGroupType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class ChecklistRef:
             """
             :ivar identifiers:
@@ -179,7 +179,7 @@ class SampleGroupType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class ChecklistAttribute:
             """
             :ivar tag: Name of the attribute.
@@ -203,7 +203,7 @@ class SampleGroupType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class StudyRef:
             """
             :ivar identifiers:
@@ -244,7 +244,7 @@ class SampleGroupType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class SampleRef:
             """
             :ivar identifiers:
@@ -286,13 +286,13 @@ class SampleGroupType:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleGroup(SampleGroupType):
     class Meta:
         name = "SAMPLE_GROUP"
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleGroupSetType:
     sample_group: List[SampleGroupType] = field(
         default_factory=list,
@@ -305,7 +305,7 @@ class SampleGroupSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleGroupSet(SampleGroupSetType):
     class Meta:
         name = "SAMPLE_GROUP_SET"
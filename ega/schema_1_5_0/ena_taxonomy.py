@@ -3,7 +3,7 @@ from enum import Enum
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ChildTaxonType:
     children: Optional["ChildTaxonType.Children"] = field(
         default=None,
@@ -41,7 +41,7 @@ class ChildTaxonType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Children:
         taxon: List["ChildTaxonType"] = field(
             default_factory=list,
@@ -63,7 +63,7 @@ class SynonymType(Enum):
     IS_PART = "is-part"
 
 
-@dataclass
+@dataclass(slots=True)
 class ParentTaxonType:
     """
     :ivar children: A list of child taxons.
@@ -116,7 +116,7 @@ class ParentTaxonType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Children:
         taxon: List[ChildTaxonType] = field(
             default_factory=list,
@@ -127,7 +127,7 @@ class ParentTaxonType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxonType:
     """
     :ivar lineage: The taxonomic lineage.
@@ -229,7 +229,7 @@ class TaxonType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Lineage:
         taxon: List[ParentTaxonType] = field(
             default_factory=list,
@@ -239,7 +239,7 @@ class TaxonType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Children:
         taxon: List[ChildTaxonType] = field(
             default_factory=list,
@@ -249,7 +249,7 @@ class TaxonType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Synonym:
         """
         :ivar type: The name type.
@@ -271,13 +271,13 @@ class TaxonType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Taxon(TaxonType):
     class Meta:
         name = "taxon"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxonSet:
     class Meta:
         name = "taxonSet"
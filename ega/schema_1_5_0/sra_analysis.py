@@ -109,7 +109,7 @@ class SequenceVariationExperimentType(Enum):
     CURATION = "Curation"
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisFileType:
     """
     :ivar filename: The file name.
@@ -162,7 +162,7 @@ class AnalysisFileType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisType:
     """
     A SRA analysis object captures sequence analysis results including sequence
@@ -342,7 +342,7 @@ class AnalysisType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class StudyRef:
         """
         :ivar identifiers:
@@ -383,7 +383,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class SampleRef:
         """
         :ivar identifiers:
@@ -432,7 +432,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class ExperimentRef:
         """
         :ivar identifiers:
@@ -473,7 +473,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class RunRef:
         """
         :ivar identifiers:
@@ -521,7 +521,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class AnalysisRef:
         """
         :ivar identifiers:
@@ -569,7 +569,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class AnalysisType:
         reference_alignment: Optional[ReferenceSequenceType] = field(
             default=None,
@@ -636,7 +636,7 @@ class AnalysisType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class SequenceVariation(ReferenceSequenceType):
             experiment_type: List[SequenceVariationExperimentType] = field(
                 default_factory=list,
@@ -671,7 +671,7 @@ class AnalysisType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class SequenceAssembly:
             name: Optional[str] = field(
                 default=None,
@@ -735,15 +735,15 @@ class AnalysisType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class SequenceAnnotation:
             pass
 
-        @dataclass
+        @dataclass(slots=True)
         class SamplePhenotype:
             pass
 
-        @dataclass
+        @dataclass(slots=True)
         class GenomeMap:
             program: Optional[str] = field(
                 default=None,
@@ -772,7 +772,7 @@ class AnalysisType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class AnalysisLinks:
         analysis_link: List[LinkType] = field(
             default_factory=list,
@@ -784,7 +784,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class AnalysisAttributes:
         analysis_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -796,7 +796,7 @@ class AnalysisType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Files:
         file: List[AnalysisFileType] = field(
             default_factory=list,
@@ -809,13 +809,13 @@ class AnalysisType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Analysis(AnalysisType):
     class Meta:
         name = "ANALYSIS"
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisSetType:
     analysis: List[AnalysisType] = field(
         default_factory=list,
@@ -828,7 +828,7 @@ class AnalysisSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisSet(AnalysisSetType):
     """
     A container of analysis objects.
@@ -5,7 +5,7 @@ from typing import List, Optional
 __NAMESPACE__ = "SRA.common"
 
 
-@dataclass
+@dataclass(slots=True)
 class AttributeType:
     """
     Reusable attributes to encode tag-value pairs with optional units.
@@ -56,7 +56,7 @@ class BasecallMatchEdge(Enum):
     END = "end"
 
 
-@dataclass
+@dataclass(slots=True)
 class NameType:
     """
     :ivar value:
@@ -77,7 +77,7 @@ class NameType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineType:
     """
     The PipelineType identifies the sequence or tree of actions to process the
@@ -93,7 +93,7 @@ class PipelineType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class PipeSection:
         """
         :ivar step_index: Lexically ordered  value that allows for the
@@ -179,7 +179,7 @@ class ReadSpecReadType(Enum):
     OTHER = "Other"
 
 
-@dataclass
+@dataclass(slots=True)
 class ReferenceAssemblyType:
     """
     Reference assembly details.
@@ -204,7 +204,7 @@ class ReferenceAssemblyType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Standard:
         """
         :ivar refname: A recognized name for the genome assembly.
@@ -224,7 +224,7 @@ class ReferenceAssemblyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Custom:
         """
         :ivar description: Description of the genome
@@ -250,7 +250,7 @@ class ReferenceAssemblyType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class UrlLink:
             """
             :ivar label: Text label to display for the
@@ -289,7 +289,7 @@ class SequencingDirectivesTypeSampleDemuxDirective(Enum):
     SUBMITTER_DEMULTIPLEXED = "submitter_demultiplexed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Urltype:
     """
     :ivar label: Text label to display for the link.
@@ -318,7 +318,7 @@ class Urltype:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class XrefType:
     """
     :ivar db: INSDC controlled vocabulary of permitted cross references.
@@ -454,7 +454,7 @@ class TypePacBioModel(Enum):
     UNSPECIFIED = "unspecified"
 
 
-@dataclass
+@dataclass(slots=True)
 class LinkType:
     """
     Reusable external links type to encode URL links, Entrez links, and db_xref
@@ -485,7 +485,7 @@ class LinkType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class UrlLink:
         """
         :ivar label: Text label to display for the link.
@@ -510,7 +510,7 @@ class LinkType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class EntrezLink:
         """
         :ivar db: NCBI controlled vocabulary of permitted cross
@@ -557,7 +557,7 @@ class LinkType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PlatformType:
     """The PLATFORM record selects which sequencing platform and platform-
     specific runtime parameters.
@@ -656,7 +656,7 @@ class PlatformType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Ls454:
         instrument_model: Optional[Type454Model] = field(
             default=None,
@@ -668,7 +668,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Illumina:
         instrument_model: Optional[TypeIlluminaModel] = field(
             default=None,
@@ -680,7 +680,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Helicos:
         instrument_model: Optional[TypeHelicosModel] = field(
             default=None,
@@ -692,7 +692,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class AbiSolid:
         instrument_model: Optional[TypeAbiSolidModel] = field(
             default=None,
@@ -704,7 +704,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class CompleteGenomics:
         instrument_model: Optional[TypeCgmodel] = field(
             default=None,
@@ -716,7 +716,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class OxfordNanopore:
         instrument_model: Optional[TypeOxfordNanoporeModel] = field(
             default=None,
@@ -728,7 +728,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class PacbioSmrt:
         instrument_model: Optional[TypePacBioModel] = field(
             default=None,
@@ -740,7 +740,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class IonTorrent:
         instrument_model: Optional[TypeIontorrentModel] = field(
             default=None,
@@ -752,7 +752,7 @@ class PlatformType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class Capillary:
         instrument_model: Optional[TypeCapillaryModel] = field(
             default=None,
@@ -765,7 +765,7 @@ class PlatformType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class QualifiedNameType(NameType):
     """
     :ivar namespace: A string value that constrains the domain of named
@@ -780,7 +780,7 @@ class QualifiedNameType(NameType):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReferenceSequenceType:
     """
     Reference assembly and sequence details.
@@ -805,7 +805,7 @@ class ReferenceSequenceType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Sequence:
         """
         :ivar refname: A recognized name for the
@@ -836,7 +836,7 @@ class ReferenceSequenceType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SequencingDirectivesType:
     """
     :ivar sample_demux_directive: Tells the Archive who will execute the
@@ -852,7 +852,7 @@ class SequencingDirectivesType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class SpotDescriptorType:
     """The SPOT_DESCRIPTOR specifies how to decode the individual reads of
     interest from the monolithic spot sequence.
@@ -871,7 +871,7 @@ class SpotDescriptorType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class SpotDecodeSpec:
         """
         :ivar spot_length: Number of base/color calls, cycles, or flows
@@ -903,7 +903,7 @@ class SpotDescriptorType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class ReadSpec:
             """
             :ivar read_index: READ_INDEX starts at 0 and is
@@ -983,7 +983,7 @@ class SpotDescriptorType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class RelativeOrder:
                 """
                 :ivar follows_read_index: Specify the read index that
@@ -1004,7 +1004,7 @@ class SpotDescriptorType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class ExpectedBasecallTable:
                 """
                 :ivar basecall: Element's body contains a basecall,
@@ -1038,7 +1038,7 @@ class SpotDescriptorType:
                     }
                 )
 
-                @dataclass
+                @dataclass(slots=True)
                 class Basecall:
                     """
                     :ivar value:
@@ -1083,7 +1083,7 @@ class SpotDescriptorType:
                     )
 
 
-@dataclass
+@dataclass(slots=True)
 class IdentifierType:
     """
     Set of record identifiers.
@@ -1137,7 +1137,7 @@ class IdentifierType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingType:
     """
     :ivar pipeline: Generic processing pipeline specification.
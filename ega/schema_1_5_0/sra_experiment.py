@@ -288,7 +288,7 @@ class TypeLibraryStrategy(Enum):
     OTHER = "OTHER"
 
 
-@dataclass
+@dataclass(slots=True)
 class LibraryDescriptorType:
     """The LIBRARY_DESCRIPTOR specifies the origin of the material being
     sequenced and any treatments that the material might have undergone that
@@ -381,7 +381,7 @@ class LibraryDescriptorType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class LibraryLayout:
         single: Optional["LibraryDescriptorType.LibraryLayout.Single"] = field(
             default=None,
@@ -400,13 +400,13 @@ class LibraryDescriptorType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Single:
             """
             Reads are unpaired (usual case).
             """
 
-        @dataclass
+        @dataclass(slots=True)
         class Paired:
             nominal_length: Optional[int] = field(
                 default=None,
@@ -423,7 +423,7 @@ class LibraryDescriptorType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class TargetedLoci:
         """
         Names the gene(s) or locus(loci) or other genomic feature(s) targeted
@@ -439,7 +439,7 @@ class LibraryDescriptorType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Locus:
             """
             :ivar probe_set: Reference to an archived primer or
@@ -471,7 +471,7 @@ class LibraryDescriptorType:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class PoolMemberType:
     """
     Impementation of lookup table between Sample Pool member and identified
@@ -541,7 +541,7 @@ class PoolMemberType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class ReadLabel:
         """
         :ivar value:
@@ -562,7 +562,7 @@ class PoolMemberType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleDescriptorType:
     """The SAMPLE_DESCRIPTOR specifies how to decode the individual reads of
     interest from the monolithic spot sequence.
@@ -626,7 +626,7 @@ class SampleDescriptorType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Pool:
         """
         :ivar default_member: Reference to the sample that is used when
@@ -660,7 +660,7 @@ class SampleDescriptorType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LibraryType:
     """
     :ivar design_description: Goal and setup of the individual library
@@ -722,7 +722,7 @@ class LibraryType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperimentType:
     """An Experiment specifies of what will be sequenced and how the sequencing
     will be performed.
@@ -858,7 +858,7 @@ class ExperimentType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class StudyRef:
         """
         :ivar identifiers: Set of reference IDs to parent study record.
@@ -901,7 +901,7 @@ class ExperimentType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class ExperimentLinks:
         experiment_link: List[LinkType] = field(
             default_factory=list,
@@ -913,7 +913,7 @@ class ExperimentType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class ExperimentAttributes:
         experiment_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -926,13 +926,13 @@ class ExperimentType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Experiment(ExperimentType):
     class Meta:
         name = "EXPERIMENT"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperimentSetType:
     experiment: List[ExperimentType] = field(
         default_factory=list,
@@ -945,7 +945,7 @@ class ExperimentSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperimentSet(ExperimentSetType):
     """
     An EXPERMENT_SET is a container for a set of experiments and a common
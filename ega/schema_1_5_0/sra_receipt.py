@@ -40,7 +40,7 @@ class ReceiptActions(Enum):
     ROLLBACK = "ROLLBACK"
 
 
-@dataclass
+@dataclass(slots=True)
 class Id:
     """
     :ivar ext_id: The REF identifies the reference of that object .
@@ -88,7 +88,7 @@ class Id:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class ExtId:
         accession: Optional[str] = field(
             default=None,
@@ -106,7 +106,7 @@ class Id:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Receipt:
     class Meta:
         name = "RECEIPT"
@@ -249,7 +249,7 @@ class Receipt:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Messages:
         error: List[str] = field(
             default_factory=list,
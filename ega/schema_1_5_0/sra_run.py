@@ -181,7 +181,7 @@ class FileQualityScoringSystem(Enum):
     LOG_ODDS = "log-odds"
 
 
-@dataclass
+@dataclass(slots=True)
 class RunType:
     """
     A run contains a group of reads generated for a particular experiment.
@@ -340,7 +340,7 @@ class RunType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class ExperimentRef:
         """
         :ivar identifiers:
@@ -381,7 +381,7 @@ class RunType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class RunType:
         reference_alignment: Optional[ReferenceSequenceType] = field(
             default=None,
@@ -392,7 +392,7 @@ class RunType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class RunLinks:
         run_link: List[LinkType] = field(
             default_factory=list,
@@ -404,7 +404,7 @@ class RunType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class RunAttributes:
         run_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -416,7 +416,7 @@ class RunType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class DataBlock:
         """
         :ivar files: Data files associated with the run.
@@ -439,7 +439,7 @@ class RunType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Files:
             file: List["RunType.DataBlock.Files.File"] = field(
                 default_factory=list,
@@ -451,7 +451,7 @@ class RunType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class File:
                 """
                 :ivar read_label: The READ_LABEL can associate a certain
@@ -536,13 +536,13 @@ class RunType:
                 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Run(RunType):
     class Meta:
         name = "RUN"
 
 
-@dataclass
+@dataclass(slots=True)
 class RunSetType:
     run: List[RunType] = field(
         default_factory=list,
@@ -555,7 +555,7 @@ class RunSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RunSet(RunSetType):
     """
     RUN_SET serves as a container for a set of runs and a name space for
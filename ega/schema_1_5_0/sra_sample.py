@@ -7,7 +7,7 @@ from graflipy.ega.schema_1_5_0.sra_common import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleType:
     """A Sample defines an isolate of sequenceable material upon which
     sequencing experiments can be based.
@@ -116,7 +116,7 @@ class SampleType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class SampleName:
         """
         :ivar taxon_id: NCBI Taxonomy Identifier.  This is appropriate
@@ -176,7 +176,7 @@ class SampleType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class SampleLinks:
         sample_link: List[LinkType] = field(
             default_factory=list,
@@ -188,7 +188,7 @@ class SampleType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class SampleAttributes:
         sample_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -201,13 +201,13 @@ class SampleType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Sample(SampleType):
     class Meta:
         name = "SAMPLE"
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleSetType:
     sample: List[SampleType] = field(
         default_factory=list,
@@ -220,7 +220,7 @@ class SampleSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleSet(SampleSetType):
     """
     SAMPLE_SET serves as a container for a set of samples and a name space for
@@ -49,7 +49,7 @@ class StudyTypeExistingStudyType(Enum):
     OTHER = "Other"
 
 
-@dataclass
+@dataclass(slots=True)
 class StudyType:
     """A Study is a container for a sequencing investigation that may comprise
     multiple experiments.
@@ -139,7 +139,7 @@ class StudyType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Descriptor:
         """
         :ivar study_title: Title of the study as would be used in a
@@ -229,7 +229,7 @@ class StudyType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class StudyType:
             """
             :ivar existing_study_type:
@@ -250,7 +250,7 @@ class StudyType:
                 }
             )
 
-        @dataclass
+        @dataclass(slots=True)
         class RelatedStudies:
             related_study: List["StudyType.Descriptor.RelatedStudies.RelatedStudy"] = field(
                 default_factory=list,
@@ -262,7 +262,7 @@ class StudyType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class RelatedStudy:
                 """
                 :ivar related_link: Related study or project record from
@@ -292,7 +292,7 @@ class StudyType:
                     }
                 )
 
-    @dataclass
+    @dataclass(slots=True)
     class StudyLinks:
         study_link: List[LinkType] = field(
             default_factory=list,
@@ -304,7 +304,7 @@ class StudyType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class StudyAttributes:
         study_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -317,13 +317,13 @@ class StudyType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Study(StudyType):
     class Meta:
         name = "STUDY"
 
 
-@dataclass
+@dataclass(slots=True)
 class StudySetType:
     study: List[StudyType] = field(
         default_factory=list,
@@ -336,7 +336,7 @@ class StudySetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class StudySet(StudySetType):
     """
     An STUDY_SET is a container for a set of studies and a common namespace.
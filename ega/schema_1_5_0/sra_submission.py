@@ -51,7 +51,7 @@ class ValidateSchema(Enum):
     SAMPLE_GROUP = "sampleGroup"
 
 
-@dataclass
+@dataclass(slots=True)
 class SubmissionType:
     """
     A Submission type is used to describe an object that contains submission
@@ -175,7 +175,7 @@ class SubmissionType:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class Contacts:
         contact: List["SubmissionType.Contacts.Contact"] = field(
             default_factory=list,
@@ -187,7 +187,7 @@ class SubmissionType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Contact:
             """
             :ivar name: Name of contact person for this submission.
@@ -216,7 +216,7 @@ class SubmissionType:
                 }
             )
 
-    @dataclass
+    @dataclass(slots=True)
     class Actions:
         """
         :ivar action: Action to be executed by the archive.
@@ -231,7 +231,7 @@ class SubmissionType:
             }
         )
 
-        @dataclass
+        @dataclass(slots=True)
         class Action:
             """
             :ivar add: Add an object to the archive.
@@ -325,7 +325,7 @@ class SubmissionType:
                 }
             )
 
-            @dataclass
+            @dataclass(slots=True)
             class Add:
                 """
                 :ivar source: Filename or relative path to the XML file
@@ -347,7 +347,7 @@ class SubmissionType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class Modify:
                 """
                 :ivar source: Filename or relative path to the XML file
@@ -369,7 +369,7 @@ class SubmissionType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class Cancel:
                 """
                 :ivar target: Accession or refname of the object that is
@@ -383,7 +383,7 @@ class SubmissionType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class Suppress:
                 """
                 :ivar target: Accession or refname of the object that is
@@ -397,7 +397,7 @@ class SubmissionType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class Hold:
                 """
                 :ivar target: Accession or refname of the object that is
@@ -421,7 +421,7 @@ class SubmissionType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class Release:
                 """
                 :ivar target: Accession or refname of the object that is
@@ -435,15 +435,15 @@ class SubmissionType:
                     }
                 )
 
-            @dataclass
+            @dataclass(slots=True)
             class Protect:
                 pass
 
-            @dataclass
+            @dataclass(slots=True)
             class Rollback:
                 pass
 
-            @dataclass
+            @dataclass(slots=True)
             class Validate:
                 """
                 :ivar source: Filename or relative path to the XML file
@@ -465,7 +465,7 @@ class SubmissionType:
                     }
                 )
 
-    @dataclass
+    @dataclass(slots=True)
     class SubmissionLinks:
         submission_link: List[LinkType] = field(
             default_factory=list,
@@ -477,7 +477,7 @@ class SubmissionType:
             }
         )
 
-    @dataclass
+    @dataclass(slots=True)
     class SubmissionAttributes:
         submission_attribute: List[AttributeType] = field(
             default_factory=list,
@@ -490,13 +490,13 @@ class SubmissionType:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Submission(SubmissionType):
     class Meta:
         name = "SUBMISSION"
 
 
-@dataclass
+@dataclass(slots=True)
 class SubmissionSetType:
     submission: List[SubmissionType] = field(
         default_factory=list,
@@ -509,7 +509,7 @@ class SubmissionSetType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class SubmissionSet(SubmissionSetType):
     """
     An SUBMISSION_SET is a container for a set of studies and a common
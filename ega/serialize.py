@@ -0,0 +1,496 @@
+"""
+Serialization helpers for graflipy.ega.schema_1_5_0 dataclasses
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import uuid
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import fields
+from enum import Enum
+from pathlib import Path
+from xml.etree.ElementTree import QName
+
+from lxml import etree
+from xsdata.formats.converter import converter
+from xsdata.formats.dataclass.serializers import XmlSerializer
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+from xsdata.models.enums import Namespace, QNames
+
+from graflipy.ega.instrument import count
+from graflipy.ega.xmlcontext import schema_context
+
+ERR_NOT_SET = '%s is not a container with a single list field'
+ERR_UNSUPPORTED = '%s: %s'
+# max number of rendered fragments kept by a FragmentCache
+FRAGMENT_CACHE_SIZE = 64
+# processing instruction standing in for a fragment until it's spliced in
+FRAGMENT_PI = 'graflipy-fragment'
+RE_FRAGMENT_PI = re.compile(rf'<\?{FRAGMENT_PI} (\d+)\?>')
+LOGGER = logging.getLogger(__name__)
+MSG_GENERATED = 'generated writers for %s classes from %s'
+MSG_UNSUPPORTED = 'no generated writer for %s, using xsdata'
+
+# generated fill functions, by class
+_FILLERS = {}
+_FILLERS_LOCK = threading.Lock()
+
+
+class _Fallback(Exception):
+    """
+    Raised by generated writers for values only xsdata can render
+    """
+
+
+class _Unsupported(Exception):
+    """
+    Raised while generating a writer for a class that uses xsdata features
+    the generator doesn't handle
+    """
+
+
+def _encode(value, fmt):
+    """
+    Returns `value` converted to str as xsdata would, or None
+
+    Raises:
+        _Fallback for values that need namespace prefixes or are lists
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, Enum):
+        return _encode(value.value, fmt)
+    if isinstance(value, (QName, list, tuple, set)):
+        raise _Fallback
+    return converter.serialize(value, format=fmt)
+
+
+_NAMESPACE = {
+    'Fallback': _Fallback,
+    'SubElement': etree.SubElement,
+    'encode': _encode,
+}
+
+
+def _fill_name(clazz):
+    """
+    Returns str name of the generated fill function of `clazz`
+    """
+    module = clazz.__module__.rpartition('.')[2]
+    return f'fill_{module}_{clazz.__qualname__}'.replace('.', '_')
+
+
+def _text(value, var):
+    """
+    Returns str expression encoding `value` for field `var`
+    """
+    return f'{value} if {value}.__class__ is str else encode({value}, ' \
+        f'{var.format!r})'
+
+
+def _item_lines(var, value, context, sources, indent):
+    """
+    Returns list of source lines writing one element of field `var`
+    """
+    pad = ' ' * indent
+    clazz = var.clazz
+    if clazz is not None:
+        if len(var.types) != 1:
+            raise _Unsupported(ERR_UNSUPPORTED % (var.name, 'choice of types'))
+        _generate(clazz, context, sources)
+        name = _fill_name(clazz)
+        _NAMESPACE[f'cls_{name}'] = clazz
+        # xsdata writes an xsi:type for subclasses
+        return [f'{pad}if {value}.__class__ is not cls_{name}:',
+                f'{pad}    raise Fallback',
+                f'{pad}if fragments and cls_{name} in fragments.classes:',
+                f'{pad}    fragments.add(el, {var.qname!r}, {value})',
+                f'{pad}else:',
+                f'{pad}    {name}(SubElement(el, {var.qname!r}), {value}, '
+                'fragments)']
+    return [f'{pad}text = {_text(value, var)}',
+            f'{pad}child = SubElement(el, {var.qname!r})',
+            f'{pad}if text:',
+            f'{pad}    child.text = text']
+
+
+def _class_lines(clazz, context, sources):
+    """
+    Returns list of source lines of the body of the fill function of
+    `clazz`, which adds the attributes and children of an instance to an
+    lxml element, in the same order xsdata's XmlSerializer would
+
+    Raises:
+        _Unsupported if the class uses features the generator doesn't handle
+    """
+    meta = context.build(clazz)
+    if meta.nillable:
+        raise _Unsupported(ERR_UNSUPPORTED % (clazz.__name__, 'nillable'))
+    lines = []
+    for var in meta.get_attribute_vars():
+        if not var.is_attribute or var.qname.startswith('{'):
+            raise _Unsupported(ERR_UNSUPPORTED % (var.name, 'attribute type'))
+        lines += [f'    value = obj.{var.name}',
+                  '    if value is not None:',
+                  f'        el.set({var.qname!r}, {_text("value", var)})']
+    for index, var in enumerate(meta.get_element_vars()):
+        if (var.sequence is not None or var.wrapper_qname or var.mixed or
+                var.tokens or var.is_elements or var.is_wildcard or
+                var.nillable or var.qname.startswith('{') or
+                (var.is_text and index)):
+            raise _Unsupported(ERR_UNSUPPORTED % (var.name, 'element type'))
+        lines += [f'    value = obj.{var.name}',
+                  '    if value is not None:']
+        if var.any_type:
+            lines.append('        raise Fallback')
+        elif var.is_text:
+            lines += [f'        text = {_text("value", var)}',
+                      '        if text:',
+                      '            el.text = text']
+        elif var.list_element:
+            lines += ['        if value.__class__ is not list:',
+                      '            raise Fallback',
+                      '        for item in value:']
+            lines += _item_lines(var, 'item', context, sources, 12)
+        else:
+            lines += _item_lines(var, 'value', context, sources, 8)
+    return lines or ['    pass']
+
+
+def _generate(clazz, context, sources):
+    """
+    Add the source of the fill function of `clazz`, and of every class it
+    refers to that has none yet, to `sources`. The function of a class
+    the generator doesn't handle always raises _Fallback.
+
+    Args:
+        clazz: schema dataclass
+        context: XmlContext
+        sources: dict of {class: list of source lines}
+    """
+    if clazz in _FILLERS or clazz in sources:
+        return
+    sources[clazz] = []
+    try:
+        body = _class_lines(clazz, context, sources)
+    except _Unsupported as err:
+        LOGGER.debug(MSG_UNSUPPORTED, err)
+        body = ['    raise Fallback']
+    sources[clazz] = [f'def {_fill_name(clazz)}(el, obj, fragments):',
+                      f'    # {clazz.__module__}.{clazz.__qualname__}',
+                      *body]
+
+
+def writer_source(clazz, context=None):
+    """
+    Returns str Python source of the fill functions of `clazz` and every
+    class it refers to that has no generated function yet
+    """
+    sources = {}
+    _generate(clazz, context or schema_context(), sources)
+    return '\n\n\n'.join('\n'.join(lines) for lines in sources.values())
+
+
+def filler(clazz):
+    """
+    Returns the generated function that adds the attributes and children
+    of an instance of `clazz` to an lxml element, generating and compiling
+    it, and those of the classes it refers to, on first use
+    """
+    with _FILLERS_LOCK:
+        if clazz not in _FILLERS:
+            sources = {}
+            _generate(clazz, schema_context(), sources)
+            source = '\n\n\n'.join(
+                '\n'.join(lines) for lines in sources.values())
+            exec(compile(  # pylint: disable=exec-used
+                source, f'<generated writers for {clazz.__qualname__}>',
+                'exec'), _NAMESPACE)
+            for generated in sources:
+                _FILLERS[generated] = _NAMESPACE[_fill_name(generated)]
+            LOGGER.debug(MSG_GENERATED, len(sources), clazz.__qualname__)
+        return _FILLERS[clazz]
+
+
+class FragmentCache:
+    """
+    Rendered XML of shared subtrees, e.g. the REFERENCE_ALIGNMENT that every
+    analysis aligned to the same reference assembly repeats, so that a
+    SchemaSerializer renders each once and splices the text into every
+    document that contains it.
+
+    Fragments are cached by the identity of the object, so only instances
+    shared between documents benefit, and they must not be modified once
+    rendered. Safe to share between serializers and threads.
+    """
+
+    def __init__(self, classes, maxsize=FRAGMENT_CACHE_SIZE):
+        """
+        Args:
+            classes: iterable of schema dataclasses whose instances are
+                rendered as fragments
+            maxsize: int max number of fragments kept
+        """
+        self.classes = frozenset(classes)
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        # {(id, tag, level, indent, encoding): (object, text)}
+        self.rendered = OrderedDict()
+
+    def text(self, obj, tag, level, config):
+        """
+        Returns str XML of `obj` as element `tag` at nesting `level` of a
+        document rendered with `config`, rendering it if it's not cached
+        """
+        key = (id(obj), tag, level, config.indent, config.encoding)
+        with self.lock:
+            cached = self.rendered.get(key)
+            # the id of a collected object can be reused
+            if cached and cached[0] is obj:
+                self.rendered.move_to_end(key)
+                count('fragment.hit')
+                return cached[1]
+        count('fragment.miss')
+        element = etree.Element(tag)
+        filler(type(obj))(element, obj, None)
+        if config.indent:
+            etree.indent(element, config.indent, level=level)
+        text = etree.tostring(element, encoding=config.encoding).decode(
+            config.encoding)
+        with self.lock:
+            self.rendered[key] = (obj, text)
+            while len(self.rendered) > self.maxsize:
+                self.rendered.popitem(last=False)
+        return text
+
+
+class _Splicer:
+    """
+    Placeholders for the fragments of one document
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.classes = cache.classes
+        # [(placeholder, tag, object)]
+        self.placeholders = []
+
+    def add(self, parent, tag, obj):
+        """
+        Append a placeholder for `obj` as element `tag` to `parent`
+        """
+        placeholder = etree.ProcessingInstruction(
+            FRAGMENT_PI, str(len(self.placeholders)))
+        parent.append(placeholder)
+        self.placeholders.append((placeholder, tag, obj))
+
+    def splice(self, xml, config):
+        """
+        Returns str `xml` with the placeholders replaced by the fragments.
+        Call only once the tree is indented, as the indent of each fragment
+        depends on its nesting level.
+        """
+        texts = [
+            self.cache.text(obj, tag,
+                            sum(1 for _ in placeholder.iterancestors()),
+                            config)
+            for placeholder, tag, obj in self.placeholders]
+        return RE_FRAGMENT_PI.sub(lambda match: texts[int(match[1])], xml)
+
+
+class SchemaSerializer:
+    """
+    Render schema dataclasses with writer functions generated from the
+    xsdata metadata of each class, instead of walking the metadata for
+    every node as XmlSerializer does. The output is identical to
+    XmlSerializer's: anything the generated writers don't handle, e.g.
+    xsi:type subclasses or nil elements, is rendered by XmlSerializer.
+    """
+
+    def __init__(self, config=None, context=None, fragments=None):
+        """
+        Args:
+            config: Optional[SerializerConfig]
+            context: Optional[XmlContext] used for metadata and by the
+                XmlSerializer fallback; default `schema_context()`
+            fragments: Optional[FragmentCache] of shared subtrees
+        """
+        self.config = config or SerializerConfig()
+        self.context = context or schema_context()
+        self.fragments = fragments
+        self.fallback = XmlSerializer(context=self.context,
+                                      config=self.config)
+
+    def render(self, obj):
+        """
+        Returns str XML of `obj`, as `XmlSerializer.render`
+        """
+        try:
+            return self._render(obj)
+        except _Fallback:
+            return self.fallback.render(obj)
+
+    def write(self, out, obj):
+        """
+        Write the XML of `obj` to text buffer `out`, as
+        `XmlSerializer.write`
+        """
+        out.write(self.render(obj))
+
+    def _render(self, obj):
+        """
+        Returns str XML of `obj` built with the generated writers
+
+        Raises:
+            _Fallback if only xsdata can render `obj`
+        """
+        config = self.config
+        if (config.ignore_default_attributes or config.globalns or
+                not self.context.class_type.is_model(obj) or
+                isinstance(obj, self.context.class_type.derived_element)):
+            raise _Fallback
+        meta = self.context.build(type(obj))
+        if meta.nillable or meta.qname.startswith('{'):
+            raise _Fallback
+        fill = filler(type(obj))
+        nsmap = ({'xsi': Namespace.XSI.uri} if (
+            config.schema_location or config.no_namespace_schema_location)
+            else None)
+        root = etree.Element(meta.qname, nsmap=nsmap)
+        if config.schema_location:
+            root.set(QNames.XSI_SCHEMA_LOCATION, config.schema_location)
+        if config.no_namespace_schema_location:
+            root.set(QNames.XSI_NO_NAMESPACE_SCHEMA_LOCATION,
+                     config.no_namespace_schema_location)
+        splicer = self.fragments and _Splicer(self.fragments)
+        fill(root, obj, splicer)
+        parts = []
+        if config.xml_declaration:
+            parts.append(f'<?xml version="{config.xml_version}" '
+                         f'encoding="{config.encoding}"?>\n')
+        if config.indent:
+            etree.indent(root, config.indent)
+        xml = etree.tostring(root, encoding=config.encoding,
+                             xml_declaration=False).decode(config.encoding)
+        parts.append(splicer.splice(xml, config)
+                     if splicer and splicer.placeholders else xml)
+        if config.indent:
+            parts.append('\n')
+        return ''.join(parts)
+
+
+class SetWriter:
+    """
+    Write a `*_SET` container element, e.g. `ANALYSIS_SET`, one child element
+    at a time so that the whole object tree never needs to be held in memory.
+
+    Output is identical to `XmlSerializer.write` of the complete set object,
+    because each child is rendered in a single-item set and only the child's
+    own markup is written. Use as a context manager:
+
+        with SetWriter(out, AnalysisSet, XMLCONF) as writer:
+            for analysis in analyses:
+                writer.write(analysis)
+
+    If the block exits with an exception the closing tag is not written, so
+    the output is unmistakably incomplete.
+    """
+
+    def __init__(self, output, set_class, config=None, fragments=None):
+        """
+        Args:
+            output: text buffer to write to
+            set_class: container dataclass with a single list field, e.g.
+                AnalysisSet or SampleSet
+            config: Optional[SerializerConfig]
+            fragments: Optional[FragmentCache] of subtrees shared between
+                children
+        """
+        setfields = fields(set_class)
+        if len(setfields) != 1:
+            raise ValueError(ERR_NOT_SET % set_class.__name__)
+        self.output = output
+        self.set_class = set_class
+        self.field = setfields[0].name
+        self.serializer = SchemaSerializer(config, fragments=fragments)
+        self.tail = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def split(self, item):
+        """
+        Render `item` in a single-item set and split the output into
+        (head, child, tail) where head is everything up to and including the
+        set start tag and any following newline. Concatenating head, any
+        number of children and tail gives the complete set.
+        """
+        text = self.serializer.render(self.set_class(**{self.field: [item]}))
+        start = text.index('?>') + 2 if text.startswith('<?xml') else 0
+        head_end = text.index('>', text.index('<', start)) + 1
+        if text[head_end] == '\n':
+            head_end += 1
+        tail_start = text.rindex('</')
+        return text[:head_end], text[head_end:tail_start], text[tail_start:]
+
+    def write(self, item):
+        """
+        Write a child element of the set and flush the output
+
+        Args:
+            item: dataclass instance of the set's item type
+        """
+        head, child, tail = self.split(item)
+        if self.tail is None:
+            self.output.write(head)
+            self.tail = tail
+        self.output.write(child)
+        self.output.flush()
+
+    def close(self):
+        """
+        Write the end of the set. If no items were written this is the
+        complete, empty set element.
+        """
+        if self.tail is None:
+            self.output.write(self.serializer.render(self.set_class()))
+        else:
+            self.output.write(self.tail)
+        self.output.flush()
+
+
+@contextmanager
+def atomic_output(path):
+    """
+    Open a text file to write in place of the file at `path`, which is only
+    replaced once the block completes. If the block exits with an exception
+    the new file is removed and any existing file is left as it was, so a
+    partial document, e.g. one left by a SetWriter, can't be mistaken for
+    output.
+
+        with atomic_output(path) as out, SetWriter(out, AnalysisSet) as writer:
+            ...
+
+    Args:
+        path: location of the output file, or '-' for stdout, which is
+            written directly
+    """
+    if str(path) == '-':
+        yield sys.stdout
+        return
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.tmp')
+    try:
+        with tmp.open('x') as out:
+            yield out
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
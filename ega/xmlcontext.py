@@ -0,0 +1,154 @@
+"""
+A process-wide xsdata `XmlContext` for `graflipy.ega.schema_1_5_0`, with the
+binding metadata of every schema class prebuilt and cached on disk, so that
+serializers and parsers don't each reflect over the nested dataclasses again.
+
+    XmlSerializer(context=schema_context(), config=XMLCONF)
+
+The cache is keyed by a digest of the schema package source and the xsdata
+and python versions, and is rebuilt when any of them change.
+"""
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+from pathlib import Path
+
+import xsdata
+
+from xsdata.formats.dataclass.context import XmlContext
+
+from graflipy.ega.headercache import CACHE_DIR
+
+DEFAULT_CONTEXT_CACHE = CACHE_DIR / 'xmlcontext.pickle'
+ERR_CACHE_WRITE = 'unable to write xsdata context cache %s: %s'
+LOGGER = logging.getLogger(__name__)
+MSG_CACHE_REBUILT = 'rebuilt xsdata context cache %s'
+MSG_CACHE_STALE = 'xsdata context cache %s is stale or unreadable: %s'
+SCHEMA_PACKAGE = 'graflipy.ega.schema_1_5_0'
+SCHEMA_DIR = Path(__file__).parent / 'schema_1_5_0'
+
+_CONTEXT = None
+_CONTEXT_LOCK = threading.Lock()
+
+
+class SchemaContext(XmlContext):
+    """
+    XmlContext that holds the cached metadata of each schema module pickled,
+    and unpickles a module's metadata the first time one of its classes is
+    needed. Only the modules actually used are loaded, and imported.
+    """
+    __slots__ = ('pending',)
+
+    def __init__(self, pending=None, **kwargs):
+        """
+        Args:
+            pending: Optional[dict] of {module name: pickled dict of
+                {class: XmlMeta}}
+        """
+        super().__init__(**kwargs)
+        self.pending = dict(pending or {})
+
+    def build(self, clazz, parent_ns=None, globalns=None):
+        if clazz not in self.cache:
+            data = self.pending.pop(clazz.__module__, None)
+            if data is not None:
+                self.cache.update(pickle.loads(data))
+        return super().build(clazz, parent_ns, globalns)
+
+
+def schema_digest():
+    """
+    Returns str hex digest of the schema package source files and the
+    xsdata and python versions, which together determine the metadata
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{xsdata.__version__} {sys.version_info[:2]}'.encode())
+    for path in sorted(SCHEMA_DIR.glob('*.py')):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build_modules():
+    """
+    Build the metadata of every class in the schema package, and every class
+    they refer to
+
+    Returns:
+        dict of {module name: pickled dict of {class: XmlMeta}}
+    """
+    # every schema module is imported here, which is what we want to avoid
+    # when the cache is current
+    schema = importlib.import_module(SCHEMA_PACKAGE)
+    context = XmlContext()
+    for name in schema.__all__:
+        clazz = getattr(schema, name)
+        if context.class_type.is_model(clazz):
+            context.build_recursive(clazz)
+    modules = {}
+    for clazz, meta in context.cache.items():
+        modules.setdefault(clazz.__module__, {})[clazz] = meta
+    return {module: pickle.dumps(metas, pickle.HIGHEST_PROTOCOL)
+            for module, metas in modules.items()}
+
+
+def _write_cache(path, cached):
+    """
+    Atomically replace the cache at `path`
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name,
+                                     delete=False) as tmp:
+        pickle.dump(cached, tmp, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp.name, path)
+
+
+def load_context(path=None):
+    """
+    Returns a SchemaContext from the cache at `path`, rebuilding the cache
+    first if it is missing, unreadable or stale. A cache that can't be
+    written is logged and the rebuilt metadata used anyway.
+
+    Args:
+        path: location of the cache file; default `DEFAULT_CONTEXT_CACHE`
+    """
+    path = Path(path or DEFAULT_CONTEXT_CACHE)
+    digest = schema_digest()
+    try:
+        with path.open('rb') as cachefile:
+            cached = pickle.load(cachefile)
+        if cached['digest'] == digest:
+            return SchemaContext(cached['modules'])
+        reason = 'digest mismatch'
+    except FileNotFoundError:
+        reason = None
+    except Exception as err:  # pylint: disable=broad-except
+        reason = err
+    if reason:
+        LOGGER.info(MSG_CACHE_STALE, path, reason)
+    cached = {'digest': digest, 'modules': build_modules()}
+    try:
+        _write_cache(path, cached)
+        LOGGER.info(MSG_CACHE_REBUILT, path)
+    except OSError as err:
+        LOGGER.warning(ERR_CACHE_WRITE, path, err)
+    return SchemaContext(cached['modules'])
+
+
+def schema_context():
+    """
+    Returns the process-wide SchemaContext, loading it on first use from
+    the cache at `DEFAULT_CONTEXT_CACHE`. Safe to share between serializers,
+    parsers and threads.
+    """
+    global _CONTEXT  # pylint: disable=global-statement
+    with _CONTEXT_LOCK:
+        if _CONTEXT is None:
+            _CONTEXT = load_context()
+        return _CONTEXT
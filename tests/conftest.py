@@ -0,0 +1,18 @@
+"""
+Shared fixtures of the graflipy.ega tests
+"""
+import pytest
+
+import graflipy.ega.xmlcontext
+
+
+@pytest.fixture(autouse=True, scope='session')
+def context_cache(tmp_path_factory):
+    """
+    Keep the xsdata context cache of the tests out of the user cache dir
+    """
+    path = tmp_path_factory.mktemp('cache') / 'xmlcontext.pickle'
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(graflipy.ega.xmlcontext, 'DEFAULT_CONTEXT_CACHE', path)
+        patch.setattr(graflipy.ega.xmlcontext, '_CONTEXT', None)
+        yield path
@@ -0,0 +1,109 @@
+"""
+Tests of graflipy.ega.update_accessions
+"""
+import io
+
+import pytest
+
+from rdflib import RDF, Graph, Literal, Namespace
+
+import graflipy.ega
+from graflipy import ALIGNEDREADGROUPSET, COLLECTEDSAMPLE
+from graflipy.ega import QUERY_CHUNK, AccessionUpdateError, update_accessions
+
+# the `:` prefix of the query templates
+ONTOLOGY = Namespace('http://graflipy.org/ontology#')
+
+
+class FakeDb:
+    """
+    `do_query` and `do_update` stand-ins that run the queries on an rdflib
+    Graph, counting them
+    """
+
+    def __init__(self):
+        self.graph = Graph()
+        self.queries = self.updates = 0
+
+    def do_query(self, query):
+        self.queries += 1
+        return self.graph.query(query)
+
+    def do_update(self, update):
+        self.updates += 1
+        self.graph.update(update)
+
+    def add(self, iri, cls, accession=None):
+        self.graph.add((iri, RDF.type, ONTOLOGY[cls]))
+        if accession:
+            self.graph.add((iri, ONTOLOGY.egaAccession, Literal(accession)))
+
+    def accession(self, iri):
+        return [str(value) for value in
+                self.graph.objects(iri, ONTOLOGY.egaAccession)]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDb()
+    monkeypatch.setattr(graflipy.ega, 'do_query', db.do_query)
+    monkeypatch.setattr(graflipy.ega, 'do_update', db.do_update)
+    return db
+
+
+def receipt(*elements):
+    """
+    Returns a receipt stream with (tag, alias, accession) `elements`
+    """
+    return io.BytesIO(
+        b'<RECEIPT success="true">' +
+        ''.join(f'<{tag} alias="{alias}" accession="{accession}"/>'
+                for tag, alias, accession in elements).encode() +
+        b'</RECEIPT>')
+
+
+def test_update_accessions(db):
+    db.add(COLLECTEDSAMPLE['s1'], 'CollectedSample')
+    db.add(COLLECTEDSAMPLE['s2'], 'CollectedSample', 'EGAN00000000002')
+    db.add(ALIGNEDREADGROUPSET['a1'], 'AlignedReadGroupSet')
+    # a foreign egaAccession predicate isn't an accession
+    db.graph.add((ALIGNEDREADGROUPSET['a1'],
+                  Namespace('http://example.org/')['egaAccession'],
+                  Literal('EGAZ99999999999')))
+    update_accessions(receipt(('SAMPLE', 's1', 'EGAN00000000001'),
+                              ('SAMPLE', 's2', 'EGAN00000000002'),
+                              ('ANALYSIS', 'a1', 'EGAZ00000000001')))
+    assert db.accession(COLLECTEDSAMPLE['s1']) == ['EGAN00000000001']
+    assert db.accession(COLLECTEDSAMPLE['s2']) == ['EGAN00000000002']
+    assert db.accession(ALIGNEDREADGROUPSET['a1']) == ['EGAZ00000000001']
+    assert (db.queries, db.updates) == (1, 1)
+
+
+def test_update_accessions_is_bulk(db):
+    aliases = [f's{serial}' for serial in range(QUERY_CHUNK + 1)]
+    for alias in aliases:
+        db.add(COLLECTEDSAMPLE[alias], 'CollectedSample')
+    update_accessions(receipt(*(
+        ('SAMPLE', alias, f'EGAN{serial:011d}')
+        for serial, alias in enumerate(aliases))))
+    assert db.accession(COLLECTEDSAMPLE[aliases[-1]]) == [
+        f'EGAN{len(aliases) - 1:011d}']
+    assert (db.queries, db.updates) == (2, 2)
+
+
+def test_update_accessions_errors_update_nothing(db):
+    db.add(COLLECTEDSAMPLE['s1'], 'CollectedSample')
+    db.add(COLLECTEDSAMPLE['s2'], 'CollectedSample', 'EGAN00000000002')
+    # an entity of another class isn't found
+    db.add(ALIGNEDREADGROUPSET['a1'], 'CollectedSample')
+    with pytest.raises(AccessionUpdateError) as raised:
+        update_accessions(receipt(('SAMPLE', 's1', 'EGAN00000000001'),
+                                  ('SAMPLE', 's2', 'EGAN00000000003'),
+                                  ('ANALYSIS', 'a1', 'EGAZ00000000001')))
+    assert str(raised.value).splitlines() == [
+        f'{COLLECTEDSAMPLE["s2"]} existing accession EGAN00000000002 '
+        'conflicts with new value EGAN00000000003',
+        f'ANALYSIS: a1 implied {ALIGNEDREADGROUPSET["a1"]} not found in db',
+    ]
+    assert db.accession(COLLECTEDSAMPLE['s1']) == []
+    assert db.updates == 0
@@ -0,0 +1,94 @@
+"""
+Tests of graflipy.ega.aioclient against the local EGA REST API stand-in
+"""
+import asyncio
+import time
+
+from graflipy.ega.aioclient import AsyncRESTClient, RateLimiter
+from graflipy.ega.client import RequestFailed
+from graflipy.ega.mockserver import MockEGAServer
+from graflipy.ega.schema_1_5_0 import AddSchema
+
+
+def retrieve_all(server, accessions, **kwargs):
+    """
+    Returns list of (accession, result) from `retrieve_many`, in the order
+    they were yielded, and the seconds it took
+    """
+    async def retrieve():
+        async with AsyncRESTClient('user', password='password',
+                                   endpoint=server.url, **kwargs) as client:
+            start = time.monotonic()
+            results = [item async for item in client.retrieve_many(
+                AddSchema.ANALYSIS, accessions)]
+            return results, time.monotonic() - start
+    return asyncio.run(retrieve())
+
+
+def test_retrieve_many_yields_each_accession_once():
+    with MockEGAServer(latency=0.01, jitter=0.02, seed=1) as server:
+        accessions = [server.register('ANALYSIS', f'bam-{serial}')
+                      for serial in range(20)]
+        results, _ = retrieve_all(server, accessions, concurrency=5)
+    assert sorted(acc for acc, _ in results) == sorted(accessions)
+    for accession, result in results:
+        assert result['response']['result'][0]['egaStableId'] == accession
+
+
+def test_retrieve_many_serial_keeps_input_order():
+    with MockEGAServer(latency=0.005, jitter=0.01, seed=2) as server:
+        accessions = [server.register('ANALYSIS', f'bam-{serial}')
+                      for serial in range(8)]
+        results, _ = retrieve_all(server, accessions, concurrency=1)
+    assert [acc for acc, _ in results] == accessions
+
+
+def test_retrieve_many_yields_errors_inline():
+    with MockEGAServer(latency=0.01) as server:
+        found = server.register('ANALYSIS', 'bam-0')
+        missing = 'EGAZ99999999999'
+        results = dict(retrieve_all(server, [found, missing],
+                                    concurrency=2)[0])
+    assert results[found]['response']['result'][0]['alias'] == 'bam-0'
+    assert isinstance(results[missing], RequestFailed)
+
+
+def test_retrieve_many_retries_injected_errors():
+    with MockEGAServer(latency=0.01, error_rate=1.0,
+                       error_routes={'lookup'}) as server:
+        accessions = [server.register('ANALYSIS', f'bam-{serial}')
+                      for serial in range(4)]
+        results, _ = retrieve_all(server, accessions, concurrency=4,
+                                  retries=2, backoff=0.001)
+        lookups = server.stats.requests['lookup']
+    assert len(results) == len(accessions)
+    assert all(isinstance(result, RequestFailed) for _, result in results)
+    # each lookup is tried once and retried twice
+    assert lookups == 3 * len(accessions)
+
+
+def test_retrieve_many_rate_limit():
+    rate = 50
+    with MockEGAServer() as server:
+        accessions = [server.register('ANALYSIS', f'bam-{serial}')
+                      for serial in range(20)]
+        results, seconds = retrieve_all(server, accessions, concurrency=10,
+                                        rate_limit=rate)
+    assert len(results) == len(accessions)
+    # the login request took the first slot, so each lookup waited for one
+    assert seconds >= len(accessions) / rate * 0.9
+
+
+def test_rate_limiter_spaces_calls():
+    async def times():
+        limiter = RateLimiter(100)
+        stamps = []
+        for _ in range(5):
+            await limiter.wait()
+            stamps.append(time.monotonic())
+        return stamps
+    stamps = asyncio.run(times())
+    # calls are released on a fixed schedule, so a late wakeup can shorten
+    # the next gap but no call comes before its slot
+    for i, stamp in enumerate(stamps):
+        assert stamp - stamps[0] >= i * 0.01 - 0.001
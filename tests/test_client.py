@@ -0,0 +1,158 @@
+"""
+Tests of graflipy.ega.client
+"""
+import io
+import mmap
+import time
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import graflipy.ega.client
+from graflipy.ega.client import (Add,
+                                 FileUpload,
+                                 MultipartEncoder,
+                                 RESTClient,
+                                 SubmissionFailed,
+                                 Validate)
+from graflipy.ega.mockserver import MockEGAServer
+from graflipy.ega.schema_1_5_0 import AddSchema
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    """
+    Returns FileUpload of a regular file, an empty file and a text stream
+    """
+    path, empty = tmp_path / 'ANALYSIS.xml', tmp_path / 'empty "1".xml'
+    path.write_text('<ANALYSIS_SET>é' + 'x' * 70000 + '</ANALYSIS_SET>\n')
+    empty.write_bytes(b'')
+    text = io.StringIO('<SAMPLE_SET>ü</SAMPLE_SET>\n')
+    text.name = 'SAMPLE.xml'
+    streams = [path.open(), empty.open(), text]
+    yield [FileUpload(schema, stream) for schema, stream in zip(
+        (AddSchema.ANALYSIS, AddSchema.DATASET, AddSchema.SAMPLE), streams)]
+    for stream in streams:
+        stream.close()
+
+
+def encoder(uploads):
+    """
+    Returns MultipartEncoder of `uploads` and a SUBMISSION part, as
+    `RESTClient.submit` builds it
+    """
+    return MultipartEncoder([
+        (upload.formname, upload.filename, upload.open())
+        for upload in uploads
+    ] + [('SUBMISSION', 'SUBMISSION', io.BytesIO(b'<SUBMISSION_SET/>'))])
+
+
+def requests_body(uploads, boundary):
+    """
+    Returns the body requests encodes for the same parts as `encoder`
+    """
+    files = [(upload.formname, (upload.filename, upload.data.encode(),
+                                'text/plain')) for upload in uploads]
+    files.append(('SUBMISSION', ('SUBMISSION', b'<SUBMISSION_SET/>',
+                                 'text/plain')))
+    request = requests.Request('POST', 'http://localhost/', files=files)
+    prepared = request.prepare()
+    theirs = prepared.headers['Content-Type'].split('boundary=')[1]
+    return prepared.body.replace(theirs.encode(), boundary.encode())
+
+
+def test_open_maps_regular_files_only(uploads):
+    assert isinstance(uploads[0].open(), mmap.mmap)
+    # an empty file can't be mapped
+    assert uploads[1].open().read() == b''
+    assert uploads[2].open().read() == '<SAMPLE_SET>ü</SAMPLE_SET>\n'.encode()
+
+
+def test_body_matches_requests_encoding(uploads):
+    with encoder(uploads) as body:
+        boundary = body.content_type.split('boundary=')[1]
+        expected = requests_body(uploads, boundary)
+        assert len(body) == len(expected)
+        assert body.read() == expected
+        assert body.read() == b''
+
+
+@pytest.mark.parametrize('size', [1, 7, 1000, 1 << 16])
+def test_reads_across_segments(uploads, size):
+    with encoder(uploads) as body:
+        expected = body.read()
+        body.rewind()
+        blocks = iter(lambda: body.read(size), b'')
+        assert b''.join(blocks) == expected
+        body.rewind()
+        assert b''.join(body) == expected
+
+
+def test_rewind_reproduces_body(uploads):
+    with encoder(uploads) as body:
+        expected = body.read()
+        body.rewind()
+        # part of the way into the file part
+        body.read(500)
+        body.rewind()
+        assert body.read() == expected
+        assert len(body) == len(expected)
+
+
+def analysis_upload():
+    """
+    Returns FileUpload of an ANALYSIS_SET of two analyses
+    """
+    stream = io.StringIO('<ANALYSIS_SET><ANALYSIS alias="bam-0"/>'
+                         '<ANALYSIS alias="bam-1"/></ANALYSIS_SET>')
+    stream.name = 'ANALYSIS.xml'
+    return FileUpload(AddSchema.ANALYSIS, stream)
+
+
+@pytest.fixture
+def server():
+    # only submissions fail, so the client can log in
+    with MockEGAServer(error_rate=1.0, error_routes={'submit'}) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = RESTClient('user', password='password', endpoint=server.url,
+                        timeout=5, retries=2, backoff=0.001)
+    yield client
+    # the server is stopped before the client is collected, so don't log out
+    client.login_token = None
+
+
+def test_add_is_not_retried(server, client):
+    with pytest.raises(SubmissionFailed):
+        client.submit([analysis_upload()], Add, 'submission')
+    assert server.stats.requests['submit'] == 1
+    assert client.stats.retries == 0
+
+
+def test_validate_is_retried(server, client):
+    with pytest.raises(SubmissionFailed):
+        client.submit([analysis_upload()], Validate, 'submission')
+    assert server.stats.requests['submit'] == 3
+    assert client.stats.retries == 2
+
+
+def test_validate_retry_resends_whole_body(server, client, monkeypatch):
+    def sleep(seconds):
+        # the server recovers during the first backoff
+        server.error_rate = 0.0
+    monkeypatch.setattr(graflipy.ega.client, 'time', SimpleNamespace(
+        monotonic=time.monotonic, sleep=sleep))
+    received = server.stats.bytes_received
+    _, summary = client.submit([analysis_upload()], Validate, 'submission')
+    assert server.stats.requests['submit'] == 2
+    assert summary.success
+    assert summary.accessions['ANALYSIS'] == {'bam-0': None, 'bam-1': None}
+    # both attempts sent the same complete body
+    sent = server.stats.bytes_received - received
+    assert sent % 2 == 0
+    assert sent // 2 > len(analysis_upload().data)
@@ -0,0 +1,107 @@
+"""
+Tests of graflipy.ega.headercache
+"""
+import os
+import sqlite3
+
+import pytest
+
+from graflipy.ega.headercache import HeaderCache, file_key, open_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HeaderCache(tmp_path / 'cache' / 'bam_headers.sqlite')
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def bam(tmp_path):
+    path = tmp_path / 'a.bam'
+    path.write_bytes(b'bam')
+    return path
+
+
+def test_get_returns_put_fields(cache, bam):
+    assert cache.get(bam) is None
+    cache.put(bam, ['rg1', 'rg2'], {'chr2', 'chr1'})
+    assert cache.get(bam) == (['rg1', 'rg2'], {'chr1', 'chr2'})
+
+
+def test_entries_persist_between_instances(tmp_path, bam):
+    path = tmp_path / 'bam_headers.sqlite'
+    cache = HeaderCache(path)
+    cache.put(bam, ['rg1'], {'chr1'})
+    cache.close()
+    cache = HeaderCache(path)
+    assert cache.get(bam) == (['rg1'], {'chr1'})
+    cache.close()
+
+
+def test_modified_file_invalidates_entry(cache, bam):
+    cache.put(bam, ['rg1'], {'chr1'})
+    stat = bam.stat()
+    os.utime(bam, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.get(bam) is None
+    # the stale entry is discarded, not just skipped
+    os.utime(bam, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.get(bam) is None
+
+
+def test_resized_file_invalidates_entry(cache, bam):
+    cache.put(bam, ['rg1'], {'chr1'})
+    stat = bam.stat()
+    bam.write_bytes(b'a longer bam')
+    os.utime(bam, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.get(bam) is None
+
+
+def test_replaced_file_invalidates_entry(cache, bam, tmp_path):
+    cache.put(bam, ['rg1'], {'chr1'})
+    stat = bam.stat()
+    replacement = tmp_path / 'b.bam'
+    replacement.write_bytes(b'bam')
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    # keep the old inode in use so the replacement gets a new one
+    keep = tmp_path / 'old.bam'
+    os.link(bam, keep)
+    os.replace(replacement, bam)
+    assert cache.get(bam) is None
+
+
+def test_missing_file(cache, bam):
+    cache.put(bam, ['rg1'], {'chr1'})
+    bam.unlink()
+    assert cache.get(bam) is None
+
+
+def test_put_with_key_taken_before_read(cache, bam):
+    key = file_key(bam)
+    # the bam changes while its header is read
+    stat = bam.stat()
+    os.utime(bam, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    cache.put(bam, ['rg1'], {'chr1'}, key)
+    assert cache.get(bam) is None
+
+
+def test_context_manager_closes(tmp_path, bam):
+    with HeaderCache(tmp_path / 'bam_headers.sqlite') as cache:
+        cache.put(bam, ['rg1'], {'chr1'})
+    with pytest.raises(sqlite3.ProgrammingError):
+        cache.get(bam)
+
+
+def test_open_cache(tmp_path, bam):
+    cache = open_cache(tmp_path / 'bam_headers.sqlite')
+    cache.put(bam, ['rg1'], {'chr1'})
+    assert cache.get(bam) == (['rg1'], {'chr1'})
+    cache.close()
+
+
+def test_open_cache_falls_back_to_none(tmp_path, caplog):
+    # the cache directory can't be created
+    blocker = tmp_path / 'file'
+    blocker.write_bytes(b'')
+    assert open_cache(blocker / 'cache' / 'bam_headers.sqlite') is None
+    assert 'unable to open bam header cache' in caplog.text
@@ -0,0 +1,178 @@
+"""
+Tests of the graflipy.ega.metadata bulk db queries
+"""
+import json
+import os
+import re
+
+from types import SimpleNamespace
+
+import pytest
+
+from rdflib import Literal
+
+import graflipy.ega.metadata
+from graflipy.ega import QUERY_CHUNK, MetadataConstructionError
+from graflipy.ega.headercache import HeaderCache
+from graflipy.ega.metadata import (BamHeader,
+                                   _cached_bam_header,
+                                   _single,
+                                   dbmeta_bams,
+                                   dbmeta_samples)
+from graflipy.reference import ReferenceAssembly
+
+RE_VALUES = re.compile(r'VALUES\s+\?(\w+)\s*\{([^}]*)\}')
+
+
+class FakeStore:
+    """
+    `do_query` stand-in that answers a bulk query with the rows of each
+    value in its VALUES block
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def do_query(self, query):
+        var, values = RE_VALUES.search(query).groups()
+        # the literals are quoted as in JSON
+        values = [Literal(json.loads(value)) for value in
+                  re.findall(r'"(?:[^"\\]|\\.)*"', values)]
+        self.queries.append(values)
+        # rows aren't in input order
+        return [SimpleNamespace(**{var: value}, **row)
+                for value in reversed(values)
+                for row in self.rows.get(str(value), [])]
+
+
+def bam_row(serial):
+    """
+    Returns the fields of an `ega_meta_bams.sparql` result row
+    """
+    return dict(type=Literal('WGS'), bamUuid=Literal(f'bam-{serial}'),
+                egaAccession=None, sampleUuid=Literal(f'sample-{serial}'),
+                libraryCaptureKit=Literal('kit'),
+                sequencingPlatform=Literal('ILLUMINA'),
+                reference=Literal('GRCh37'))
+
+
+def sample_row(uuid, **fields):
+    """
+    Returns the fields of an `ega_meta_samples.sparql` result row
+    """
+    return dict(dict(
+        sampleUuid=Literal(uuid), samplePublicationID=Literal(f'P-{uuid}'),
+        egaAccession=None, referenceSpecies=Literal('human'),
+        sampleType=Literal('tumour'), sampleMaterial=Literal('DNA'),
+        sampleTissue=Literal('blood'), donorUuid=Literal(f'donor-{uuid}'),
+        donorPublicationID=Literal(f'D-{uuid}'), donorSex=Literal('female')),
+                **fields)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeStore({})
+    monkeypatch.setattr(graflipy.ega.metadata, 'do_query', store.do_query)
+    return store
+
+
+def test_dbmeta_bams_in_input_order(store):
+    paths = [f'/bams/{serial}.bam' for serial in (3, 1, 2)]
+    store.rows = {path: [bam_row(serial)]
+                  for serial, path in zip((3, 1, 2), paths)}
+    assert list(dbmeta_bams(paths)) == paths
+    dbmeta = _single(paths[0], dbmeta_bams(paths)[paths[0]])
+    assert (dbmeta.bam_uuid, dbmeta.sample_uuid, dbmeta.ega_accession) == (
+        'bam-3', 'sample-3', None)
+    assert dbmeta.reference == ReferenceAssembly.fromstr('GRCh37')
+
+
+def test_dbmeta_bams_missing_and_duplicate_paths(store):
+    store.rows = {'/a.bam': [bam_row(1)], '/b.bam': [bam_row(2), bam_row(3)]}
+    dbmetas = dbmeta_bams(['/a.bam', '/b.bam', '/c.bam'])
+    assert [len(records) for records in dbmetas.values()] == [1, 2, 0]
+    with pytest.raises(MetadataConstructionError, match='multiple'):
+        _single('/b.bam', dbmetas['/b.bam'])
+    with pytest.raises(MetadataConstructionError, match='not found'):
+        _single('/c.bam', dbmetas['/c.bam'])
+
+
+def test_dbmeta_bams_quotes_paths(store):
+    path = '/bams/a "quoted" bam\\.bam'
+    store.rows = {path: [bam_row(1)]}
+    assert len(dbmeta_bams([path])[path]) == 1
+
+
+def test_dbmeta_bams_one_query_per_chunk(store):
+    paths = [f'/bams/{serial}.bam' for serial in range(2 * QUERY_CHUNK + 1)]
+    store.rows = {path: [bam_row(serial)] for serial, path in
+                  enumerate(paths)}
+    dbmetas = dbmeta_bams(paths)
+    assert [len(values) for values in store.queries] == [
+        QUERY_CHUNK, QUERY_CHUNK, 1]
+    assert [str(value) for values in store.queries
+            for value in values] == paths
+    assert [records[0].bam_uuid for records in dbmetas.values()] == [
+        f'bam-{serial}' for serial in range(len(paths))]
+
+
+def test_dbmeta_samples(store):
+    uuids = ['s3', 's1', 's2']
+    store.rows = {uuid: [sample_row(uuid)] for uuid in uuids}
+    dbmetas = dbmeta_samples(uuids)
+    assert list(dbmetas) == uuids
+    assert (str(dbmetas['s1'].donor_uuid), dbmetas['s1'].phenotype) == (
+        'donor-s1', 'blood|tumour')
+    assert len(store.queries) == 1
+
+
+def test_dbmeta_samples_accumulates_errors(store):
+    store.rows = {'ok': [sample_row('ok')],
+                  'twice': [sample_row('twice'), sample_row('twice')],
+                  'partial': [sample_row('partial', sampleTissue=None)]}
+    with pytest.raises(MetadataConstructionError) as raised:
+        dbmeta_samples(['ok', 'missing', 'twice', 'partial'])
+    assert str(raised.value).split('; ') == [
+        'db metadata not found for collectedsample:missing',
+        'multiple records for db metadata for collectedsample:twice',
+        'donor:donor-partial collectedsample:partial - missing db data for '
+        'sample_tissue',
+    ]
+
+
+def test_dbmeta_samples_one_query_per_chunk(store):
+    uuids = [f's{serial}' for serial in range(QUERY_CHUNK + 1)]
+    store.rows = {uuid: [sample_row(uuid)] for uuid in uuids}
+    assert list(dbmeta_samples(uuids)) == uuids
+    assert [len(values) for values in store.queries] == [QUERY_CHUNK, 1]
+
+
+def test_cached_bam_header(tmp_path, monkeypatch):
+    bam = tmp_path / 'a.bam'
+    bam.write_bytes(b'bam')
+    reads = []
+
+    def bam_header(path):
+        reads.append(path)
+        return BamHeader(['rg1'], {'chr1'})
+    monkeypatch.setattr(graflipy.ega.metadata, 'bam_header', bam_header)
+    with HeaderCache(tmp_path / 'bam_headers.sqlite') as cache:
+        assert _cached_bam_header(bam, cache) == BamHeader(['rg1'], {'chr1'})
+        assert _cached_bam_header(bam, cache) == BamHeader(['rg1'], {'chr1'})
+    assert reads == [bam]
+
+
+def test_cached_bam_header_modified_during_read(tmp_path, monkeypatch):
+    bam = tmp_path / 'a.bam'
+    bam.write_bytes(b'bam')
+
+    def bam_header(path):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        return BamHeader(['rg1'], {'chr1'})
+    monkeypatch.setattr(graflipy.ega.metadata, 'bam_header', bam_header)
+    with HeaderCache(tmp_path / 'bam_headers.sqlite') as cache:
+        _cached_bam_header(bam, cache)
+        # the entry was stored for the file as it was before the read
+        assert cache.get(bam) is None
@@ -0,0 +1,96 @@
+"""
+Tests of graflipy.ega.pipeline
+"""
+import random
+import threading
+import time
+
+import pytest
+
+from graflipy.ega.pipeline import Pipeline, Stage
+
+
+def test_run_yields_input_order_with_each_stage_result():
+    rng = random.Random(0)
+    delays = {item: rng.uniform(0, 0.005) for item in range(50)}
+
+    def slow_square(item):
+        time.sleep(delays[item])
+        return item * item
+
+    pipeline = Pipeline([Stage('square', slow_square, 8),
+                         Stage('negate', lambda item: -item, 2)])
+    results = [(item, square.result(), negated.result())
+               for item, (square, negated) in pipeline.run(range(50))]
+    assert results == [(item, item * item, -item) for item in range(50)]
+    summary = pipeline.summary()
+    assert summary['square']['items'] == summary['negate']['items'] == 50
+
+
+def test_batch_stage_calls_once_per_batch():
+    calls = []
+
+    def batched(items):
+        calls.append(list(items))
+        return [f'{item}!' for item in items]
+
+    pipeline = Pipeline([Stage('batched', batched, 2, batch=4)])
+    results = [future.result()
+               for _, (future,) in pipeline.run(range(10))]
+    assert results == [f'{item}!' for item in range(10)]
+    assert sorted(calls) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert pipeline.summary()['batched']['calls'] == 3
+
+
+def test_errors_resolve_only_the_failing_items():
+    def odd_fails(item):
+        if item % 2:
+            raise ValueError(item)
+        return item
+
+    def batch_fails(items):
+        raise KeyError(items[0])
+
+    pipeline = Pipeline([Stage('odd', odd_fails, 2),
+                         Stage('batch', batch_fails, 1, batch=3)])
+    for item, (odd, batch) in pipeline.run(range(6)):
+        if item % 2:
+            with pytest.raises(ValueError):
+                odd.result()
+        else:
+            assert odd.result() == item
+        with pytest.raises(KeyError):
+            batch.result()
+
+
+def test_stage_concurrency_limit():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def tracked(item):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.002)
+        with lock:
+            running[0] -= 1
+        return item
+
+    pipeline = Pipeline([Stage('tracked', tracked, 3)])
+    assert [future.result() for _, (future,) in pipeline.run(range(30))] == (
+        list(range(30)))
+    assert peak[0] <= 3
+
+
+def test_window_bounds_items_in_flight():
+    started = []
+
+    def record(item):
+        started.append(item)
+        return item
+
+    pipeline = Pipeline([Stage('record', record, 1)], window=4)
+    for item, (future,) in pipeline.run(range(20)):
+        future.result()
+        # items are submitted before they're yielded, at most `window` ahead
+        assert len(started) <= item + 4
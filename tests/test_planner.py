@@ -0,0 +1,167 @@
+"""
+Tests of graflipy.ega.planner
+"""
+import io
+
+import pytest
+import requests
+
+from lxml import etree
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+
+from graflipy.ega.client import Add, SubmissionFailed
+from graflipy.ega.planner import (iter_chunks,
+                                  iter_items,
+                                  merge_receipts,
+                                  plan_chunks,
+                                  submit_chunks)
+from graflipy.ega.receipt import ReceiptSummary
+from graflipy.ega.schema_1_5_0 import (ANALYSISXSD,
+                                       AddSchema,
+                                       AnalysisSet,
+                                       AnalysisType)
+from graflipy.ega.serialize import SchemaSerializer
+
+CONFIG = SerializerConfig(pretty_print=True,
+                          no_namespace_schema_location=ANALYSISXSD)
+
+
+def analyses(count, title='t'):
+    """
+    Returns list of `count` AnalysisType with distinct aliases
+    """
+    return [AnalysisType(alias=f'bam-{serial}', title=title)
+            for serial in range(count)]
+
+
+def aliases(data):
+    """
+    Returns the ANALYSIS aliases in ANALYSIS_SET XML `data`
+    """
+    return [element.get('alias')
+            for element in etree.fromstring(data.encode())]
+
+
+def test_plan_chunks_max_items():
+    assert plan_chunks(analyses(7), AnalysisSet, max_items=3,
+                       config=CONFIG) == [3, 3, 1]
+
+
+def test_plan_chunks_max_bytes():
+    items = analyses(20, title='x' * 100)
+    max_bytes = 1000
+    counts = plan_chunks(items, AnalysisSet, max_bytes=max_bytes,
+                         config=CONFIG)
+    assert sum(counts) == len(items)
+    assert len(counts) > 1
+    for chunk in iter_chunks(items, AnalysisSet, counts, 'set', 'A.xml',
+                             CONFIG):
+        assert len(chunk.data.encode()) <= max_bytes
+
+
+def test_plan_chunks_oversize_item_gets_own_chunk():
+    items = analyses(3)
+    items[1].title = 'x' * 2000
+    assert plan_chunks(items, AnalysisSet, max_bytes=1000,
+                       config=CONFIG) == [1, 1, 1]
+
+
+def test_plan_chunks_needs_a_limit():
+    with pytest.raises(ValueError):
+        plan_chunks(analyses(1), AnalysisSet)
+
+
+def test_iter_chunks_renders_every_item_once():
+    items = analyses(7)
+    counts = plan_chunks(items, AnalysisSet, max_items=3, config=CONFIG)
+    chunks = list(iter_chunks(iter(items), AnalysisSet, counts, 'set',
+                              'ANALYSIS.xml', CONFIG))
+    assert [(chunk.alias, chunk.filename, chunk.count)
+            for chunk in chunks] == [
+        ('set (part 1 of 3)', 'ANALYSIS.part1.xml', 3),
+        ('set (part 2 of 3)', 'ANALYSIS.part2.xml', 3),
+        ('set (part 3 of 3)', 'ANALYSIS.part3.xml', 1),
+    ]
+    assert [alias for chunk in chunks for alias in aliases(chunk.data)] == [
+        item.alias for item in items]
+    # a single chunk renders as the whole set does
+    whole = SchemaSerializer(CONFIG).render(AnalysisSet(analysis=items))
+    single = next(iter_chunks(items, AnalysisSet, [7], 'set', 'A.xml',
+                              CONFIG))
+    assert single.data == whole
+
+
+def test_iter_items_streams_set_children():
+    items = analyses(5)
+    data = SchemaSerializer(CONFIG).render(AnalysisSet(analysis=items))
+    assert list(iter_items(io.BytesIO(data.encode()), AnalysisSet)) == items
+
+
+def test_merge_receipts():
+    receipts = [etree.fromstring(xml) for xml in (
+        b'<RECEIPT success="true" receiptDate="1">'
+        b'<ANALYSIS alias="a" accession="EGAZ1"/>'
+        b'<SUBMISSION alias="s1"/>'
+        b'<MESSAGES><INFO>one</INFO></MESSAGES><ACTIONS>ADD</ACTIONS>'
+        b'</RECEIPT>',
+        b'<RECEIPT success="false" receiptDate="2">'
+        b'<ANALYSIS alias="b"/>'
+        b'<SUBMISSION alias="s2"/>'
+        b'<MESSAGES><ERROR>two</ERROR></MESSAGES><ACTIONS>ADD</ACTIONS>'
+        b'</RECEIPT>')]
+    merged = merge_receipts(receipts)
+    assert merged.get('success') == 'false'
+    assert merged.get('receiptDate') == '2'
+    assert [child.tag for child in merged] == [
+        'ANALYSIS', 'ANALYSIS', 'SUBMISSION', 'SUBMISSION', 'MESSAGES',
+        'ACTIONS']
+    assert [message.text for message in merged.find('MESSAGES')] == [
+        'one', 'two']
+
+
+class FailingClient:
+    """
+    RESTClient stand-in that accessions the first chunk and raises `error`
+    for the next
+    """
+
+    def __init__(self, error):
+        self.error = error
+        self.submitted = []
+
+    def submit(self, uploads, action, alias):
+        self.submitted.append(alias)
+        if len(self.submitted) > 1:
+            raise self.error
+        aliases_ = aliases(uploads[0].data)
+        receipt = (
+            '<RECEIPT success="true">' +
+            ''.join(f'<ANALYSIS alias="{alias_}" accession="EGAZ{i:011d}"/>'
+                    for i, alias_ in enumerate(aliases_, 1)) +
+            f'<SUBMISSION alias="{alias}" accession="EGAB00000000001"/>'
+            '<ACTIONS>ADD</ACTIONS></RECEIPT>')
+        return receipt, ReceiptSummary.parse(receipt.encode())
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.ReadTimeout('timed out'),
+    requests.exceptions.ConnectionError('reset'),
+    SubmissionFailed('500'),
+])
+def test_submit_chunks_writes_receipt_when_a_later_chunk_fails(error):
+    items = analyses(5)
+    counts = plan_chunks(items, AnalysisSet, max_items=2, config=CONFIG)
+    chunks = iter_chunks(items, AnalysisSet, counts, 'set', 'A.xml', CONFIG)
+    client = FailingClient(error)
+    out = io.StringIO()
+    with pytest.raises(SubmissionFailed) as raised:
+        submit_chunks(client, AddSchema.ANALYSIS, chunks, Add, out)
+    # no chunk was started after the failure
+    assert client.submitted == ['set (part 1 of 3)', 'set (part 2 of 3)']
+    if not isinstance(error, SubmissionFailed):
+        assert raised.value.__cause__ is error
+    receipt = etree.fromstring(out.getvalue().encode())
+    assert [(elem.get('alias'), elem.get('accession'))
+            for elem in receipt.iter('ANALYSIS')] == [
+        ('bam-0', 'EGAZ00000000001'), ('bam-1', 'EGAZ00000000002')]
+    assert receipt.find('SUBMISSION').get('accession') == 'EGAB00000000001'
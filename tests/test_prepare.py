@@ -0,0 +1,175 @@
+"""
+Tests of graflipy.ega.prepare
+"""
+import errno
+import json
+import os
+import subprocess
+
+import pytest
+
+import graflipy.ega.prepare
+from graflipy.ega.prepare import (ENCRYPTED,
+                                  HASHING,
+                                  VERIFIED,
+                                  Manifest,
+                                  PreparationError,
+                                  prepare_file)
+
+# stand-ins for `gpg --batch -r KEY -e`, reading stdin and writing stdout
+ROT13_GPG = 'exec tr a-zA-Z n-za-mN-ZA-M'
+FAILING_GPG = 'tr a-z A-Z; exit 2'
+EARLY_EXIT_GPG = 'head -c 100; exit 3'
+
+
+def verified(path, gpg_path, **fields):
+    """
+    Returns the fields of a VERIFIED record for `path`
+    """
+    stat = path.stat()
+    return dict(dict(size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                     md5='a' * 32, gpg_path=str(gpg_path),
+                     gpg_size=gpg_path.stat().st_size, gpg_md5='b' * 32),
+                **fields)
+
+
+def test_last_record_for_a_path_wins(tmp_path):
+    manifest = Manifest(tmp_path / 'manifest.jsonl')
+    manifest.update('a.bam', HASHING, size=3)
+    manifest.update('a.bam', ENCRYPTED, md5='c' * 32)
+    assert Manifest(tmp_path / 'manifest.jsonl').get('a.bam') == {
+        'path': 'a.bam', 'state': ENCRYPTED, 'size': 3, 'md5': 'c' * 32}
+
+
+def test_torn_last_line_is_ignored_and_terminated(tmp_path):
+    path = tmp_path / 'manifest.jsonl'
+    path.write_text(
+        json.dumps({'path': 'a.bam', 'state': HASHING}) + '\n' +
+        '{"path": "b.bam", "sta')
+    manifest = Manifest(path)
+    assert manifest.get('a.bam')['state'] == HASHING
+    assert manifest.get('b.bam') is None
+    manifest.update('b.bam', HASHING)
+    # the new record starts on a line of its own, so it isn't lost
+    reloaded = Manifest(path)
+    assert reloaded.get('a.bam')['state'] == HASHING
+    assert reloaded.get('b.bam')['state'] == HASHING
+    assert path.read_text().splitlines()[1] == '{"path": "b.bam", "sta'
+
+
+def test_is_complete(tmp_path):
+    bam, gpg = tmp_path / 'a.bam', tmp_path / 'a.bam.gpg'
+    bam.write_bytes(b'bam')
+    gpg.write_bytes(b'encrypted bam')
+    manifest = Manifest(tmp_path / 'manifest.jsonl')
+    manifest.update(bam, ENCRYPTED, **verified(bam, gpg))
+    assert not manifest.is_complete(bam)
+    manifest.update(bam, VERIFIED)
+    assert manifest.is_complete(bam)
+    bam.write_bytes(b'changed bam')
+    assert not manifest.is_complete(bam)
+
+
+def test_is_complete_needs_gpg_output(tmp_path):
+    bam, gpg = tmp_path / 'a.bam', tmp_path / 'a.bam.gpg'
+    bam.write_bytes(b'bam')
+    gpg.write_bytes(b'encrypted bam')
+    manifest = Manifest(tmp_path / 'manifest.jsonl')
+    manifest.update(bam, VERIFIED, **verified(bam, gpg))
+    gpg.unlink()
+    assert not manifest.is_complete(bam)
+
+
+def test_md5s_of_verified_records(tmp_path):
+    bam, gpg = tmp_path / 'a.bam', tmp_path / 'a.bam.gpg'
+    bam.write_bytes(b'bam')
+    gpg.write_bytes(b'encrypted bam')
+    manifest = Manifest(tmp_path / 'manifest.jsonl')
+    manifest.update(bam, VERIFIED, **verified(bam, gpg))
+    manifest.update(tmp_path / 'b.bam', HASHING)
+    assert manifest.md5s() == {'a.bam': 'a' * 32, 'a.bam.gpg': 'b' * 32}
+
+
+@pytest.fixture
+def fake_gpg(tmp_path, monkeypatch):
+    """
+    Returns function to install a `gpg` shell script on PATH
+    """
+    bindir = tmp_path / 'bin'
+    bindir.mkdir()
+    monkeypatch.setenv('PATH', f'{bindir}{os.pathsep}{os.environ["PATH"]}')
+
+    def install(script):
+        gpg = bindir / 'gpg'
+        gpg.write_text(f'#!/bin/sh\n{script}\n')
+        gpg.chmod(0o755)
+    return install
+
+
+@pytest.fixture
+def bam(tmp_path):
+    """
+    Returns path of an input larger than a pipe buffer
+    """
+    path = tmp_path / 'a.bam'
+    path.write_bytes(b'reads of a bam\n' * 300000)
+    return path
+
+
+@pytest.fixture
+def outputdir(tmp_path):
+    path = tmp_path / 'out'
+    path.mkdir()
+    return path
+
+
+def md5sum(path):
+    """
+    Returns `md5sum` output line for the file at `path`, by name
+    """
+    return subprocess.run(['md5sum', path.name], cwd=path.parent, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def test_prepare_file(fake_gpg, bam, outputdir):
+    fake_gpg(ROT13_GPG)
+    manifest = Manifest(outputdir / 'manifest.jsonl')
+    prepared = prepare_file(bam, outputdir, manifest=manifest)
+    gpg = outputdir / 'a.bam.gpg'
+    assert gpg.read_bytes() == bam.read_bytes().translate(bytes.maketrans(
+        b'abcdefghijklmnopqrstuvwxyz', b'nopqrstuvwxyzabcdefghijklm'))
+    assert (prepared.size, prepared.gpg_path, prepared.gpg_size) == (
+        bam.stat().st_size, gpg, gpg.stat().st_size)
+    assert (outputdir / 'a.bam.md5').read_text() == md5sum(bam)
+    assert (outputdir / 'a.bam.gpg.md5').read_text() == md5sum(gpg)
+    assert manifest.is_complete(bam)
+
+
+@pytest.mark.parametrize('script, status', [(FAILING_GPG, 2),
+                                            (EARLY_EXIT_GPG, 3)])
+def test_gpg_failure_leaves_no_output(fake_gpg, bam, outputdir, script,
+                                      status):
+    fake_gpg(script)
+    manifest = Manifest(outputdir / 'manifest.jsonl')
+    with pytest.raises(PreparationError,
+                       match=f'gpg exited with status {status}'):
+        prepare_file(bam, outputdir, manifest=manifest)
+    assert sorted(path.name for path in outputdir.iterdir()) == [
+        'manifest.jsonl']
+    assert manifest.get(bam)['state'] == HASHING
+
+
+def test_write_failure_kills_gpg(fake_gpg, bam, outputdir, monkeypatch):
+    fake_gpg('exec cat')
+    copy_hashed = graflipy.ega.prepare._copy_hashed
+
+    def disk_full(source, dest, digest):
+        if dest.name == str(outputdir / 'a.bam.gpg'):
+            dest.write(source.read(10))
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+        return copy_hashed(source, dest, digest)
+    monkeypatch.setattr(graflipy.ega.prepare, '_copy_hashed', disk_full)
+    # gpg is blocked writing, and the input writer too, until gpg is killed
+    with pytest.raises(PreparationError, match='No space left'):
+        prepare_file(bam, outputdir)
+    assert list(outputdir.iterdir()) == []
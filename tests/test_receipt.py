@@ -0,0 +1,134 @@
+"""
+Tests of the graflipy.ega.receipt streaming readers and ReceiptSummary
+"""
+import io
+
+from lxml import etree
+
+from graflipy.ega.planner import RECEIPT_ORDER
+from graflipy.ega.receipt import (RECEIPT_TAGS,
+                                  ReceiptSummary,
+                                  iter_ids,
+                                  tag_attribute)
+
+RECEIPT = b'''<?xml version="1.0" encoding="UTF-8"?>
+<RECEIPT receiptDate="2021-01-01T00:00:00.000Z" success="true">
+  <ANALYSIS accession="EGAZ00000000001" alias="a1" status="PRIVATE"/>
+  <SAMPLE accession="EGAN00000000001" alias="s1" status="PRIVATE"/>
+  <ANALYSIS accession="EGAZ00000000002" alias="a2" status="PRIVATE"/>
+  <SAMPLE alias="s2"/>
+  <SUBMISSION accession="EGAB00000000001" alias="submission"/>
+  <MESSAGES><INFO>added</INFO></MESSAGES>
+  <ACTIONS>ADD</ACTIONS>
+</RECEIPT>
+'''
+ANALYSIS_XML = b'''<ANALYSIS_SET>
+  <ANALYSIS alias="a1">
+    <SAMPLE_REF refname="s1" label="rg1"/>
+    <SAMPLE_REF refname="s2" label="rg2"/>
+  </ANALYSIS>
+  <ANALYSIS alias="a2">
+    <SAMPLE_REF refname="s1" label="rg3"/>
+    <SAMPLE_REF label="rg4"/>
+  </ANALYSIS>
+</ANALYSIS_SET>
+'''
+
+
+def test_iter_ids_in_document_order():
+    assert list(iter_ids(io.BytesIO(RECEIPT), ('SAMPLE', 'ANALYSIS'))) == [
+        ('ANALYSIS', 'a1', 'EGAZ00000000001'),
+        ('SAMPLE', 's1', 'EGAN00000000001'),
+        ('ANALYSIS', 'a2', 'EGAZ00000000002'),
+        ('SAMPLE', 's2', None),
+    ]
+
+
+def test_iter_ids_default_tags(tmp_path):
+    path = tmp_path / 'receipt.xml'
+    path.write_bytes(RECEIPT)
+    assert [tag for tag, _, _ in iter_ids(str(path))] == [
+        'ANALYSIS', 'SAMPLE', 'ANALYSIS', 'SAMPLE', 'SUBMISSION']
+
+
+def test_iter_ids_alias_attribute_of_nested_elements():
+    assert list(iter_ids(io.BytesIO(ANALYSIS_XML), ('SAMPLE_REF',),
+                         'refname')) == [
+        ('SAMPLE_REF', 's1', None),
+        ('SAMPLE_REF', 's2', None),
+        ('SAMPLE_REF', 's1', None),
+        ('SAMPLE_REF', None, None),
+    ]
+
+
+def test_iter_ids_matches_a_tree_search():
+    tree = etree.parse(io.BytesIO(ANALYSIS_XML))
+    assert [alias for _, alias, _ in iter_ids(
+        io.BytesIO(ANALYSIS_XML), ('ANALYSIS',))] == [
+        elem.get('alias') for elem in tree.iter('ANALYSIS')]
+
+
+def test_tag_attribute_distinct_values_in_order():
+    assert tag_attribute(io.BytesIO(ANALYSIS_XML), 'SAMPLE_REF',
+                         'refname') == ['s1', 's2']
+
+
+def test_summary_of_successful_receipt(tmp_path):
+    path = tmp_path / 'receipt.xml'
+    path.write_bytes(RECEIPT)
+    for source in (RECEIPT, io.BytesIO(RECEIPT), str(path)):
+        summary = ReceiptSummary.parse(source)
+        assert summary.success
+        assert summary.receipt_date == '2021-01-01T00:00:00.000Z'
+        assert summary.accessions == {
+            'ANALYSIS': {'a1': 'EGAZ00000000001', 'a2': 'EGAZ00000000002'},
+            'SAMPLE': {'s1': 'EGAN00000000001', 's2': None},
+            'SUBMISSION': {'submission': 'EGAB00000000001'},
+        }
+        assert summary.counts == {'ANALYSIS': 2, 'SAMPLE': 2, 'SUBMISSION': 1}
+        # only the elements with a status are counted
+        assert summary.statuses == {'PRIVATE': 3}
+        assert (summary.errors, summary.infos, summary.actions) == (
+            [], ['added'], ['ADD'])
+
+
+def test_summary_of_failed_receipt():
+    summary = ReceiptSummary.parse(b'''<RECEIPT success="false">
+  <ANALYSIS alias="a1" status="PRIVATE" accession="EGAZ00000000001"/>
+  <ANALYSIS alias="a2"/>
+  <SUBMISSION alias="submission"/>
+  <MESSAGES>
+    <ERROR>a2: invalid</ERROR>
+    <INFO>validated</INFO>
+    <ERROR>a2: no files</ERROR>
+  </MESSAGES>
+  <ACTIONS>VALIDATE</ACTIONS>
+  <ACTIONS>ADD</ACTIONS>
+</RECEIPT>''')
+    assert not summary.success
+    assert summary.receipt_date is None
+    assert summary.accessions['ANALYSIS'] == {
+        'a1': 'EGAZ00000000001', 'a2': None}
+    assert summary.statuses == {'PRIVATE': 1}
+    assert summary.errors == ['a2: invalid', 'a2: no files']
+    assert summary.infos == ['validated']
+    assert summary.actions == ['VALIDATE', 'ADD']
+
+
+def test_summary_without_success_attribute_is_a_failure():
+    assert not ReceiptSummary.parse(b'<RECEIPT/>').success
+
+
+def test_summary_of_every_identified_tag():
+    receipt = b''.join(
+        [b'<RECEIPT success="true">'] +
+        [f'<{tag} alias="{tag.lower()}" accession="EGA{i}" '
+         'status="PRIVATE"/>'.encode() for i, tag in enumerate(RECEIPT_TAGS)] +
+        [b'</RECEIPT>'])
+    summary = ReceiptSummary.parse(receipt)
+    assert summary.accessions == {
+        tag: {tag.lower(): f'EGA{i}'} for i, tag in enumerate(RECEIPT_TAGS)}
+    assert summary.statuses == {'PRIVATE': len(RECEIPT_TAGS)}
+    # every identifying child of a merged receipt is summarized
+    assert RECEIPT_ORDER[:len(RECEIPT_TAGS)] == RECEIPT_TAGS
+    assert {'SAMPLEGROUP', 'PROJECT', 'CHECKLIST'} <= set(RECEIPT_TAGS)
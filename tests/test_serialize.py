@@ -0,0 +1,218 @@
+"""
+Tests of graflipy.ega.serialize
+"""
+import io
+
+import pytest
+
+from xsdata.formats.dataclass.context import XmlContext
+from xsdata.formats.dataclass.serializers import XmlSerializer
+from xsdata.formats.dataclass.serializers.config import SerializerConfig
+
+from graflipy.ega.schema_1_5_0 import (ANALYSISXSD,
+                                       AddSchema,
+                                       AnalysisFileType,
+                                       AnalysisFileTypeChecksumMethod,
+                                       AnalysisFileTypeFiletype,
+                                       AnalysisSet,
+                                       AnalysisType,
+                                       AttributeType,
+                                       Dataset,
+                                       Datasets,
+                                       DatasetType,
+                                       LinkType,
+                                       ReferenceAssemblyType,
+                                       ReferenceSequenceType,
+                                       SampleSet,
+                                       SampleType,
+                                       Submission,
+                                       SubmissionType)
+from graflipy.ega.serialize import (FragmentCache,
+                                    SchemaSerializer,
+                                    SetWriter,
+                                    atomic_output)
+
+CONFIGS = [
+    SerializerConfig(),
+    SerializerConfig(indent='  ', no_namespace_schema_location=ANALYSISXSD),
+    SerializerConfig(indent='    ', xml_declaration=False),
+]
+
+
+def xmlserializer(config):
+    """
+    Returns XmlSerializer with a fresh context, so that the expected output
+    doesn't depend on the cached `schema_context()` under test
+    """
+    return XmlSerializer(context=XmlContext(), config=config)
+
+
+def reference_alignment(sequences):
+    """
+    Returns ReferenceSequenceType of `sequences` sequences
+    """
+    return ReferenceSequenceType(
+        assembly=ReferenceAssemblyType(
+            standard=ReferenceAssemblyType.Standard(
+                accession='GCA_000001405.1')),
+        sequence=[ReferenceSequenceType.Sequence(
+            accession=f'CM{663 + i:06d}.1', label=f'chr{i + 1}')
+                  for i in range(sequences)])
+
+
+def analysis(serial, refalign=None):
+    """
+    Returns AnalysisType shaped like those of `metadata.analysis_refalign`
+    """
+    return AnalysisType(
+        alias=f'bam-{serial}',
+        title=f'{serial}.bam',
+        description='aligned reads',
+        study_ref=AnalysisType.StudyRef(accession='EGAS00000000001'),
+        sample_ref=[AnalysisType.SampleRef(label='rg1,rg2',
+                                           refname=f'sample-{serial}')],
+        analysis_type=AnalysisType.AnalysisType(
+            reference_alignment=refalign or reference_alignment(3)),
+        files=AnalysisType.Files(file=[AnalysisFileType(
+            filename=f'dir/{serial}.bam.gpg',
+            filetype=AnalysisFileTypeFiletype.BAM,
+            checksum_method=AnalysisFileTypeChecksumMethod.MD5,
+            checksum='0' * 32, unencrypted_checksum='f' * 32)]),
+        analysis_attributes=AnalysisType.AnalysisAttributes(
+            analysis_attribute=[
+                AttributeType(tag='NOTE', value='Aligned & sorted <é>'),
+                AttributeType(tag='Reference', value='GRCh37')]))
+
+
+def dataset(clazz):
+    """
+    Returns an instance of DatasetType or its subclass `clazz`
+    """
+    return clazz(
+        alias='dataset',
+        title='title',
+        analysis_ref=[DatasetType.AnalysisRef(accession='EGAZ00000000001')],
+        policy_ref=DatasetType.PolicyRef(accession='EGAP00000000001'),
+        dataset_links=DatasetType.DatasetLinks(dataset_link=[LinkType(
+            url_link=LinkType.UrlLink(label='portal',
+                                      url='http://example.org/?a=1&b=2'))]))
+
+
+DOCUMENTS = {
+    'analysis set': AnalysisSet(analysis=[analysis(0), analysis(1)]),
+    'empty analysis set': AnalysisSet(),
+    'sample set': SampleSet(sample=[SampleType(
+        alias='sample-0',
+        sample_name=SampleType.SampleName(
+            taxon_id=9606, scientific_name='Homo sapiens',
+            common_name='human'),
+        description='blood "whole"',
+        sample_attributes=SampleType.SampleAttributes(sample_attribute=[
+            AttributeType(tag='gender', value='female')]))]),
+    'dataset': Datasets(dataset=[dataset(Dataset)]),
+    'submission': Submission(
+        alias='submission',
+        actions=SubmissionType.Actions(action=[
+            SubmissionType.Actions.Action(
+                add=SubmissionType.Actions.Action.Add(
+                    source='ANALYSIS.xml', schema=AddSchema.ANALYSIS)),
+            SubmissionType.Actions.Action(
+                validate=SubmissionType.Actions.Action.Validate(
+                    source='ANALYSIS.xml', schema=AddSchema.ANALYSIS))])),
+}
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+@pytest.mark.parametrize('name', DOCUMENTS)
+def test_render_matches_xmlserializer(name, config):
+    obj = DOCUMENTS[name]
+    expected = xmlserializer(config).render(obj)
+    serializer = SchemaSerializer(config)
+    # the generated writers render all of these without xsdata
+    serializer.fallback = None
+    assert serializer.render(obj) == expected
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+def test_render_falls_back_to_xmlserializer(config):
+    # a DATASET of the base type, as `metadata.dataset_analysisref` builds
+    # it, is one xsdata may give an xsi:type
+    obj = Datasets(dataset=[dataset(DatasetType)])
+    expected = xmlserializer(config).render(obj)
+    assert SchemaSerializer(config).render(obj) == expected
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+def test_fragments_match_xmlserializer(config):
+    refalign = reference_alignment(5)
+    obj = AnalysisSet(analysis=[analysis(serial, refalign)
+                                for serial in range(3)])
+    expected = xmlserializer(config).render(obj)
+    fragments = FragmentCache([ReferenceSequenceType])
+    assert SchemaSerializer(config, fragments=fragments).render(
+        obj) == expected
+    # the shared REFERENCE_ALIGNMENT was rendered once and reused
+    assert len(fragments.rendered) == 1
+
+
+def test_set_writer_with_fragments_matches_whole_set():
+    config = CONFIGS[1]
+    refalign = reference_alignment(5)
+    items = [analysis(serial, refalign) for serial in range(4)]
+    out = io.StringIO()
+    with SetWriter(out, AnalysisSet, config,
+                   FragmentCache([ReferenceSequenceType])) as writer:
+        for item in items:
+            writer.write(item)
+    assert out.getvalue() == xmlserializer(config).render(
+        AnalysisSet(analysis=items))
+
+
+def test_fragment_cache_keys_on_identity_and_level():
+    config = CONFIGS[1]
+    fragments = FragmentCache([ReferenceSequenceType], maxsize=2)
+    first, second = reference_alignment(2), reference_alignment(2)
+    text = fragments.text(first, 'REFERENCE_ALIGNMENT', 3, config)
+    assert fragments.text(first, 'REFERENCE_ALIGNMENT', 3, config) is text
+    # an equal but distinct object is rendered again, to the same text
+    assert fragments.text(second, 'REFERENCE_ALIGNMENT', 3, config) == text
+    # the indent depends on the nesting level
+    assert fragments.text(first, 'REFERENCE_ALIGNMENT', 1, config) != text
+    # the least recently used entry was evicted
+    assert len(fragments.rendered) == 2
+    assert fragments.text(first, 'REFERENCE_ALIGNMENT', 3, config) is not (
+        text)
+
+
+def test_atomic_output_replaces_file(tmp_path):
+    path = tmp_path / 'ANALYSIS.xml'
+    path.write_text('old')
+    with atomic_output(path) as out, SetWriter(out, AnalysisSet) as writer:
+        writer.write(analysis(0))
+        # nothing is replaced until the set is complete
+        assert path.read_text() == 'old'
+    assert path.read_text() == xmlserializer(SerializerConfig()).render(
+        AnalysisSet(analysis=[analysis(0)]))
+    assert [child.name for child in tmp_path.iterdir()] == ['ANALYSIS.xml']
+
+
+@pytest.mark.parametrize('existing', [True, False])
+def test_atomic_output_leaves_no_partial_file(tmp_path, existing):
+    path = tmp_path / 'ANALYSIS.xml'
+    if existing:
+        path.write_text('old')
+    with pytest.raises(ValueError):
+        with atomic_output(path) as out, SetWriter(out,
+                                                   AnalysisSet) as writer:
+            writer.write(analysis(0))
+            raise ValueError('no metadata for bam-1')
+    assert [child.name for child in tmp_path.iterdir()] == (
+        ['ANALYSIS.xml'] if existing else [])
+    if existing:
+        assert path.read_text() == 'old'
+
+
+def test_atomic_output_stdout(capsys):
+    with atomic_output('-') as out:
+        out.write('<ANALYSIS_SET/>')
+    assert capsys.readouterr().out == '<ANALYSIS_SET/>'
@@ -0,0 +1,109 @@
+"""
+Tests of graflipy.ega.xmlcontext
+"""
+import pickle
+import shutil
+
+from types import SimpleNamespace
+
+import pytest
+import xsdata
+
+from xsdata.formats.dataclass.context import XmlContext
+from xsdata.formats.dataclass.serializers import XmlSerializer
+
+import graflipy.ega.xmlcontext as xmlcontext
+from graflipy.ega.schema_1_5_0 import AnalysisSet, AnalysisType
+from graflipy.ega.xmlcontext import SchemaContext, load_context
+
+OBJ = AnalysisSet(analysis=[AnalysisType(
+    alias='bam-0', title='0.bam',
+    study_ref=AnalysisType.StudyRef(accession='EGAS00000000001'))])
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """
+    Returns list that has an item added each time the metadata is built
+    """
+    builds, build_modules = [], xmlcontext.build_modules
+
+    def counting_build_modules():
+        builds.append(1)
+        return build_modules()
+    monkeypatch.setattr(xmlcontext, 'build_modules', counting_build_modules)
+    return builds
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'cache' / 'xmlcontext.pickle'
+
+
+def render(context):
+    return XmlSerializer(context=context).render(OBJ)
+
+
+def test_cache_is_built_once_and_loaded(path, builds):
+    context = load_context(path)
+    assert builds == [1]
+    assert path.exists()
+    loaded = load_context(path)
+    assert builds == [1]
+    assert isinstance(loaded, SchemaContext)
+    # only the modules that are used are unpickled
+    assert loaded.pending and not loaded.cache
+    assert render(loaded) == render(context) == render(XmlContext())
+    assert 'graflipy.ega.schema_1_5_0.sra_analysis' not in loaded.pending
+
+
+def test_default_cache_path(path, builds, monkeypatch):
+    monkeypatch.setattr(xmlcontext, 'DEFAULT_CONTEXT_CACHE', path)
+    load_context()
+    assert path.exists()
+    assert builds == [1]
+
+
+def test_schema_source_change_invalidates(path, builds, tmp_path,
+                                          monkeypatch):
+    schema_dir = tmp_path / 'schema'
+    shutil.copytree(xmlcontext.SCHEMA_DIR, schema_dir)
+    monkeypatch.setattr(xmlcontext, 'SCHEMA_DIR', schema_dir)
+    load_context(path)
+    with (schema_dir / 'sra_analysis.py').open('a') as module:
+        module.write('\n# changed\n')
+    load_context(path)
+    load_context(path)
+    assert builds == [1, 1]
+
+
+def test_xsdata_version_change_invalidates(path, builds, monkeypatch):
+    load_context(path)
+    monkeypatch.setattr(xsdata, '__version__', xsdata.__version__ + '.1')
+    load_context(path)
+    assert builds == [1, 1]
+
+
+def test_python_version_change_invalidates(path, builds, monkeypatch):
+    load_context(path)
+    monkeypatch.setattr(xmlcontext, 'sys', SimpleNamespace(
+        version_info=(3, 99, 0, 'final', 0)))
+    load_context(path)
+    assert builds == [1, 1]
+
+
+def test_unreadable_cache_is_rebuilt(path, builds):
+    load_context(path)
+    path.write_bytes(b'not a pickle')
+    assert render(load_context(path)) == render(XmlContext())
+    assert builds == [1, 1]
+    with path.open('rb') as cachefile:
+        assert pickle.load(cachefile)['digest'] == xmlcontext.schema_digest()
+
+
+def test_unwritable_cache_is_used_anyway(tmp_path, builds):
+    blocker = tmp_path / 'file'
+    blocker.write_bytes(b'')
+    context = load_context(blocker / 'xmlcontext.pickle')
+    assert render(context) == render(XmlContext())
+    assert builds == [1]